@@ -0,0 +1,82 @@
+import contextlib
+import io
+import time
+
+from twisted.internet.address import IPv4Address
+
+from engine.engine import Engine
+from engine.network.server.factories import BroadcastServerFactory
+from engine.network.server.update_protocol import UpdateServerProtocol
+
+
+class UnscheduledEngine(Engine):
+
+    def schedule_interval(self, func, interval):
+        pass
+
+
+class NullTransport(object):
+
+    def __init__(self):
+        self.written = 0
+
+    def write(self, data):
+        self.written += len(data)
+
+    def writeSequence(self, data):
+        for chunk in data:
+            self.write(chunk)
+
+
+class PerClientFactory(BroadcastServerFactory):
+
+    def buildProtocol(self, addr):
+        p = super(PerClientFactory, self).buildProtocol(addr)
+        self.send_functions[p.uuid] = p.send
+        return p
+
+    def broadcast(self, frame, original_client_uuid):
+        for uuid, send in self.send_functions.items():
+            if uuid == original_client_uuid:
+                continue
+            send(frame)
+
+
+def setup(factory_class, n_clients, log_frames=False):
+    engine = UnscheduledEngine(None)
+    factory = factory_class(engine, UpdateServerProtocol(engine))
+    protocols = []
+    for i in range(n_clients + 1):
+        protocol = factory.buildProtocol(IPv4Address('TCP', "10.0.{}.{}".format(i // 250, i % 250), 5000 + i))
+        protocol.log_frames = log_frames
+        protocol.transport = NullTransport()
+        protocols.append(protocol)
+    frames = [{"command": "spawn", "model": protocols[0].spawn_schema.describe(engine.amf.manufacture((i, 0, 0)))}
+              for i in range(20)]
+    return factory, protocols, frames
+
+
+def run(factory, protocols, frames, rounds=25):
+    origin = protocols[0].uuid
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(rounds):
+            for frame in frames:
+                factory.broadcast(frame, origin)
+    elapsed = time.perf_counter() - start
+    return rounds * len(frames), elapsed, sum(protocol.transport.written for protocol in protocols)
+
+
+def report(name, n_clients, broadcasts, elapsed, written):
+    print("{:<28} clients {:>3}  {:>8.0f} broadcasts/s  {:>7.1f} us/broadcast  {:>8.1f} MB/s".format(
+        name, n_clients, broadcasts / elapsed, elapsed / broadcasts * 1e6, written / elapsed / 1e6))
+
+
+if __name__ == '__main__':
+    for n_clients in (1, 4, 16, 32, 64):
+        for name, factory_class, log_frames in (("per client, printing", PerClientFactory, True),
+                                                ("per client", PerClientFactory, False),
+                                                ("serialize once", BroadcastServerFactory, False)):
+            factory, protocols, frames = setup(factory_class, n_clients, log_frames=log_frames)
+            report(name, n_clients, *run(factory, protocols, frames))
+        print()
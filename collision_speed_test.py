@@ -1,8 +1,9 @@
-from itertools import combinations
-from math import pi
+from itertools import combinations, product
+from math import pi, atan2, degrees, hypot, sin, cos, radians
 from random import normalvariate, random
 
-from engine.physics.polygon import MultiPolygon, PolygonPart
+from engine.models.factories import ShipModelFactory, AsteroidModelFactory
+from engine.physics.polygon import MultiPolygon, PolygonPart, BasePolygon, cached_convex_hull
 
 
 def make_multipolygon(x, y, r):
@@ -25,13 +26,123 @@ def statement(polygons):
         p1.intersected_polygons(p2)
 
 
+def gift_wrapping_hull(points):
+    """The convex hull BasePolygon used before the monotone chain, kept as the baseline."""
+    points = list(set(points))
+    if len(points) <= 3:
+        return points
+    y_es = [p[1] for p in points]
+    starting_point = points[y_es.index(min(y_es))]
+    point_string = []
+    last_angle = 0
+    min_angle_point = starting_point
+    while min_angle_point not in point_string:
+        point_string.append(min_angle_point)
+        last_point = point_string[-1]
+        eval_points = list(points)
+        eval_points.remove(last_point)
+        angles = [degrees(atan2(y - last_point[1], x - last_point[0])) for x, y in eval_points]
+        delta_angles = [BasePolygon.delta_angle(a, last_angle) % 360 for a in angles]
+        min_angle = min(delta_angles)
+        if delta_angles.count(min_angle) == 1:
+            min_angle_point = eval_points[delta_angles.index(min_angle)]
+        else:
+            straight_points = [p for i, p in enumerate(eval_points) if delta_angles[i] == min_angle]
+            straight_points.sort(key=lambda p: -hypot(last_point[0] - p[0], last_point[1] - p[1]))
+            min_angle_point = straight_points[0]
+        last_angle += min_angle
+    hull = point_string[point_string.index(min_angle_point):]
+    hull.reverse()
+    return hull
+
+
+def hull_setup():
+    asteroid = [(-sin(radians(d)) * abs(normalvariate(25, 5)), cos(radians(d)) * abs(normalvariate(25, 5)))
+                for d in range(0, 360, 18)]
+    ship = [(x + dx, y + dy) for x in range(-3, 4) for y in range(-2, 3) for dx, dy in
+            [(-.5, -.5), (.5, -.5), (.5, .5), (-.5, .5)]]
+    return [asteroid, ship]
+
+
+def hull_statement(hull_function, point_sets):
+    for points in point_sets:
+        hull_function(points)
+
+
+def moving_statement(polygon):
+    for r in range(36):
+        polygon.set_position_rotation(r, r, r * 10)
+        polygon.moving_segments
+
+
+def ship_setup():
+    ship = ShipModelFactory().manufacture('ship')
+    other_ship = ShipModelFactory().manufacture('ship', position=(2, 0, 1))
+    asteroid = AsteroidModelFactory().manufacture((27, 0, 0))
+    return ship.bounding_box, [other_ship.bounding_box, asteroid.bounding_box]
+
+
+def ship_statement(ship_bbox, other_bboxes):
+    for other_bbox in other_bboxes:
+        ship_bbox.intersected_polygons(other_bbox)
+
+
+def grid_ship_bbox(width, height, x=0, y=0, r=0):
+    square = [(-.5, -.5), (.5, -.5), (.5, .5), (-.5, .5)]
+    parts = set()
+    for px in range(width):
+        for py in range(height):
+            part = PolygonPart.manufacture(square, x=px, y=py)
+            part.freeze()
+            parts.add(part)
+    target = MultiPolygon(parts)
+    target.freeze()
+    target.set_position_rotation(x, y, r)
+    target.clear_movement()
+    target.set_position_rotation(x + .5, y + .5, r + 1)
+    return target
+
+
+def flat_part_statement(bbox, other_bbox):
+    for p1, p2 in product(bbox, other_bbox):
+        p1.intersects(p2)
+
+
+def report(name, results):
+    print(name)
+    print("  AVG:", sum(results) / len(results))
+    nineteyfive_five = list(results)
+    nineteyfive_five.remove(max(results))
+    nineteyfive_five.remove(min(results))
+    print("  95-5:", sum(nineteyfive_five) / len(nineteyfive_five))
+
+
 if __name__ == '__main__':
     import timeit
     t = timeit.Timer("statement(polygons)", setup="from __main__ import setup, statement; polygons=setup()")
-    results = t.repeat(number=100, repeat=10)
-    print("\n".join(str(f) for f in results))
-    print("AVG:", sum(results) / len(results))
-    nineteyfive_five = set(results)
-    nineteyfive_five.remove(max(results))
-    nineteyfive_five.remove(min(results))
-    print("95-5:", sum(nineteyfive_five) / len(nineteyfive_five))
+    report("MultiPolygon.intersected_polygons", t.repeat(number=100, repeat=10))
+
+    point_sets = hull_setup()
+    frozen_point_sets = [frozenset(points) for points in point_sets]
+    report("Before: gift wrapping hull",
+           timeit.repeat(lambda: hull_statement(gift_wrapping_hull, point_sets), number=100, repeat=10))
+    report("After: monotone chain hull",
+           timeit.repeat(lambda: hull_statement(BasePolygon.convex_hull, point_sets), number=100, repeat=10))
+    report("After: cached hull of frozen shape",
+           timeit.repeat(lambda: hull_statement(cached_convex_hull, frozen_point_sets), number=100, repeat=10))
+
+    ship_bbox, other_bboxes = ship_setup()
+    report("Ship parts against overlapping ship and asteroid parts",
+           timeit.repeat(lambda: ship_statement(ship_bbox, other_bboxes), number=10, repeat=10))
+
+    for size in (5, 10, 20):
+        large_bbox = grid_ship_bbox(size, size)
+        other_large_bbox = grid_ship_bbox(size, size, x=size - 2, y=size - 2, r=30)
+        report(f"{size}x{size} part ships overlapping at a corner, every part pair",
+               timeit.repeat(lambda: flat_part_statement(large_bbox, other_large_bbox), number=1, repeat=5))
+        report(f"{size}x{size} part ships overlapping at a corner, part tree",
+               timeit.repeat(lambda: large_bbox.intersected_polygons(other_large_bbox), number=1, repeat=5))
+
+    moving_polygon = MultiPolygon.manufacture(point_sets[0])
+    report("Moving an unchanged asteroid 36 times and sweeping its hull",
+           timeit.repeat(lambda: moving_statement(moving_polygon), number=100, repeat=10))
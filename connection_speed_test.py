@@ -0,0 +1,38 @@
+from timeit import timeit
+
+from engine.models.factories import ShipModelFactory, ShipPartModelFactory
+
+
+def grid_ship(width=10, height=6, spacing=1.5):
+    factory = ShipPartModelFactory()
+    names = ["generator", "fuel tank", "engine", "shield"]
+    parts = {factory.manufacture(names[(i * 7 + j) % len(names)], position=(i * spacing, 0, j * spacing))
+             for i in range(width) for j in range(height)}
+    ship = ShipModelFactory().manufacture("ship")
+    ship.set_parts(parts)
+    return ship
+
+
+def rebuild_connections(repeats=5):
+    ship = grid_ship()
+    return timeit(ship.rebuild_connections, number=repeats) / repeats
+
+
+def drag(repeats=20):
+    ship = grid_ship()
+    part = max(ship.parts, key=lambda part: (part.x, part.z))
+    x, _, z = part.position
+
+    def statement():
+        part.set_position(x + 0.3, 0, z)
+        part.set_position(x, 0, z)
+    return timeit(statement, number=repeats) / repeats
+
+
+def report(name, seconds):
+    print("{:<28} {:>10.3f} ms".format(name, seconds * 1e3))
+
+
+if __name__ == '__main__':
+    report("60 part rebuild_connections", rebuild_connections())
+    report("drag one part and back", drag())
@@ -16,5 +16,8 @@ class BaseController(object):
     def is_alive(self):
         return self._model.is_alive
 
+    def update(self, dt):
+        pass
+
     def add_sub_controller(self, sub_controller):
         self._sub_controllers.add(sub_controller)
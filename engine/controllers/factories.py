@@ -7,10 +7,10 @@ from engine.models.factories import ProjectileModelSpawnFunctionFactory
 
 class ControllerFactory(object):
 
-    def __init__(self):
+    def __init__(self, spawn_projectiles=True):
         self.dummy_input_handler = None
         self.model_controller_map = {
-            ShipModel: ShipControllerFactory().manufacture,
+            ShipModel: ShipControllerFactory(spawn_projectiles=spawn_projectiles).manufacture,
             ShipPartModel: ShipPartControllerFactory().manufacture,
             PlasmaModel: BaseFactory().manufacture,
             AsteroidModel: BaseFactory().manufacture,
@@ -42,14 +42,15 @@ class ShipPartControllerFactory(object):
 
 class ShipControllerFactory(object):
 
-    def __init__(self, sub_controller_factory_class=ShipPartControllerFactory):
+    def __init__(self, sub_controller_factory_class=ShipPartControllerFactory, spawn_projectiles=True):
         self.sub_controller_factory = sub_controller_factory_class()
+        self.spawn_projectiles = spawn_projectiles
         self.projectile_model_spawn_func_factory = ProjectileModelSpawnFunctionFactory()
 
     def manufacture(self, model, gamepad):
         controller = ShipController(model, gamepad)
         for sub_model in model.parts:
-            if sub_model.name == "plasma gun":
+            if sub_model.name == "plasma gun" and self.spawn_projectiles:
                 spawn_func = self.projectile_model_spawn_func_factory.manufacture("plasma", model, sub_model)
             else:
                 spawn_func = self._no_spawn
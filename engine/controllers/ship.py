@@ -10,6 +10,7 @@ class ShipController(BaseController):
     def __init__(self, model: ShipModel, gamepad: "InputHandler"):
         super().__init__(model, gamepad)
         self._model = model
+        self.triggered = set()
         self._button_config = {
             3: self.select_next_target,
             2: self.reset,
@@ -50,3 +51,9 @@ class ShipController(BaseController):
                     self._button_config[button]()
                     buttons_done.add(button)
             self._gamepad.buttons -= buttons_done
+            self.triggered |= buttons_done
+
+    def take_triggered(self) -> set:
+        triggered = self.triggered
+        self.triggered = set()
+        return triggered
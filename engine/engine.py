@@ -6,8 +6,9 @@ from twisted.internet.task import LoopingCall
 
 from engine.models.base_model import BaseModel
 from engine.models.factories import ShipModelFactory, AsteroidModelFactory
-from engine.models.observable import Observable
-from engine.physics.spacial_index import SpacialIndex
+from engine.models.observable import Observable, EventBatch
+from engine.physics.broad_phase import SweepAndPrune
+from engine.physics.pair_cache import CollisionPairCache
 
 
 class Engine(Observable):
@@ -16,7 +17,13 @@ class Engine(Observable):
 
     version = (1, 0, 0)
 
-    def __init__(self, event_loop):
+    spacial_index_class = SweepAndPrune
+    pair_cache_class = CollisionPairCache
+    rigid_body_store_class = None
+    batched_actions = ("move",)
+    phase_timer: Callable = None
+
+    def __init__(self, event_loop, spacial_index=None, pair_cache=None, rigid_bodies=None):
         Observable.__init__(self)
         self._event_loop = event_loop
         self.smf = ShipModelFactory()
@@ -30,7 +37,24 @@ class Engine(Observable):
         self._scheduled_taks = {}
         self._players = {}
         self._collision_check_models = set()
-        self._spacial_index = SpacialIndex()
+        self._controllers = {}
+        if spacial_index is None:
+            spacial_index = self.spacial_index_class()
+        self._spacial_index = spacial_index
+        if pair_cache is None:
+            pair_cache = self.pair_cache_class()
+        self._pair_cache = pair_cache
+        if rigid_bodies is None and self.rigid_body_store_class is not None:
+            rigid_bodies = self.rigid_body_store_class()
+        self._rigid_bodies = rigid_bodies
+
+    @property
+    def pair_cache(self):
+        return self._pair_cache
+
+    @property
+    def rigid_bodies(self):
+        return self._rigid_bodies
 
     def register_player(self, callsign, ship_uuid):
         self._players[ship_uuid] = callsign
@@ -53,12 +77,22 @@ class Engine(Observable):
 
     def _call_with_time_since(self, func: Callable):
         func_name = func.__name__
-        last_time = self._scheduled_taks.get(func_name, time.time())
-        now = time.time()
+        last_time = self._scheduled_taks.get(func_name, time.monotonic())
+        now = time.monotonic()
         dt = now - last_time
         func(dt)
         self._scheduled_taks[func_name] = now
 
+    def set_controller(self, uuid, controller):
+        self._controllers[uuid] = controller
+
+    def remove_controller(self, uuid):
+        self._controllers.pop(uuid, None)
+
+    def update_controllers(self, dt):
+        for controller in self._controllers.values():
+            controller.update(dt)
+
     def update_model(self, frames):
         for frame in frames:
             try:
@@ -131,6 +165,8 @@ class Engine(Observable):
         bbox = model.bounding_box
         bbox.observe(lambda: self._spacial_index.reindex_spacial_position(model), "quadrants")
         self._spacial_index.init_model_into_2d_space_index(model)
+        if self._rigid_bodies is not None and self._rigid_bodies.accepts(model):
+            self._rigid_bodies.add(model)
 
     def _add_to_collision_checks(self, model: BaseModel):
         self._collision_check_models.add(model)
@@ -140,6 +176,10 @@ class Engine(Observable):
         model.set_alive(False)
         self.remove_model_by_uuid(uuid)
         self._spacial_index.clear_model_from_2d_space_index(model)
+        self._pair_cache.evict(model)
+        if self._rigid_bodies is not None:
+            self._rigid_bodies.remove(model)
+        self.remove_controller(uuid)
         if model in self._collision_check_models:
             self._collision_check_models.remove(model)
 
@@ -154,17 +194,51 @@ class Engine(Observable):
         self._dead_model_callback(model)
 
     def update(self, dt):
+        with self.event_batch() as batch:
+            self.timed("controllers", self.update_controllers, dt)
+            spawns, decays = self.timed("models", self.update_models, dt, batch)
+        self.timed("decay", self.decay_models, decays)
+        self.timed("collisions", self.register_collisions)
+        self.timed("spawns", self.spawn_models, spawns)
+
+    def timed(self, phase, func, *args):
+        if self.phase_timer is None:
+            return func(*args)
+        start = time.perf_counter()
+        result = func(*args)
+        self.phase_timer(phase, time.perf_counter() - start)
+        return result
+
+    def update_models(self, dt, batch: EventBatch):
+        spawns, decays = self.run_models(dt)
+        batch.flush()
+        return spawns, decays
+
+    def event_batch(self):
+        return EventBatch(self.batched_actions)
+
+    def run_models(self, dt):
         spawns = []
         decays = []
+        rigid_bodies = self._rigid_bodies
+        if rigid_bodies is not None:
+            rigid_bodies.integrate(dt)
         for model in self.models.values():
-            model.run(dt)
+            if rigid_bodies is not None and model in rigid_bodies:
+                model.timers(dt)
+            else:
+                model.run(dt)
             new_spawns = model.spawns
             spawns += new_spawns
             if not model.is_alive:
                 decays.append(model)
+        return spawns, decays
+
+    def decay_models(self, decays):
         for decaying_model in decays:
             self.decay_with_callback(decaying_model)
-        self.register_collisions()
+
+    def spawn_models(self, spawns):
         for model in spawns:
             self.spawn_with_callback(model)
 
@@ -173,8 +247,11 @@ class Engine(Observable):
         for m1, m2 in pairs:
             assert isinstance(m1, BaseModel)
             assert isinstance(m2, BaseModel)
+            if self._pair_cache.is_separated(m1, m2):
+                continue
             m1_intersection_parts, m2_intersection_parts = m1.polygons_in_order_of_collision(m2)
             if not m1_intersection_parts and not m2_intersection_parts:
+                self._pair_cache.record_separation(m1, m2)
                 continue
             intersects, x, y = m1.intersection_point(m2)
             if not intersects:
@@ -0,0 +1,112 @@
+import time
+from collections import OrderedDict
+from math import log, floor
+
+from engine.engine import Engine
+
+
+class PhaseHistogram(object):
+
+    def __init__(self, resolution=1e-6, growth=1.05):
+        self.resolution = resolution
+        self.growth = growth
+        self._log_growth = log(growth)
+        self._buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def bucket(self, seconds) -> int:
+        if seconds <= self.resolution:
+            return 0
+        return int(floor(log(seconds / self.resolution) / self._log_growth)) + 1
+
+    def upper_bound(self, bucket) -> float:
+        return self.resolution * self.growth ** bucket
+
+    def record(self, seconds):
+        bucket = self.bucket(seconds)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(self.upper_bound(bucket), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class TickRecorder(object):
+    phases = ("controllers", "models", "decay", "collisions", "spawns", "tick")
+    percentiles = (50, 95, 99)
+
+    def __init__(self):
+        self.histograms = OrderedDict((phase, PhaseHistogram()) for phase in self.phases)
+
+    def record(self, phase, seconds):
+        self.histograms[phase].record(seconds)
+
+    def summary(self) -> OrderedDict:
+        summary = OrderedDict()
+        for phase, histogram in self.histograms.items():
+            row = OrderedDict(("p{}".format(p), histogram.percentile(p)) for p in self.percentiles)
+            row['mean'] = histogram.mean
+            row['max'] = histogram.max
+            row['count'] = histogram.count
+            summary[phase] = row
+        return summary
+
+    def report(self) -> str:
+        header = "{:<12}".format("phase") + "".join("{:>11}".format("p{} ms".format(p)) for p in self.percentiles)
+        header += "{:>11}{:>11}".format("mean ms", "max ms")
+        lines = [header]
+        for phase, row in self.summary().items():
+            values = [row["p{}".format(p)] for p in self.percentiles] + [row['mean'], row['max']]
+            lines.append("{:<12}".format(phase) + "".join("{:>11.3f}".format(value * 1000) for value in values))
+        return "\n".join(lines)
+
+
+class HeadlessRunner(object):
+    recorder_class = TickRecorder
+
+    def __init__(self, engine: Engine, dt=1 / 60, recorder: TickRecorder=None):
+        self.engine = engine
+        self.dt = dt
+        self.recorder = self.recorder_class() if recorder is None else recorder
+        engine.phase_timer = self.recorder.record
+        self.ticks = 0
+        self.overruns = 0
+
+    def step(self):
+        start = time.perf_counter()
+        self.engine.update(self.dt)
+        self.recorder.record("tick", time.perf_counter() - start)
+        self.ticks += 1
+
+    def run(self, ticks, paced=False):
+        if not paced:
+            for _ in range(ticks):
+                self.step()
+            return
+        deadline = time.monotonic()
+        for _ in range(ticks):
+            self.step()
+            deadline += self.dt
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            else:
+                self.overruns += 1
+                deadline = time.monotonic()
@@ -214,14 +214,17 @@ class BaseModel(AnimationModel):
 
     def run(self, dt):
         super(BaseModel, self).run(dt)
-        half_of_acceleration = self.acceleration * dt / 2
-        half_of_torque = self.torque * dt / 2
-        self.movement.translate(half_of_acceleration)
-        self.spin.translate(half_of_torque)
-        self.translate(*(self.movement * dt))
-        self.rotate(*(self.spin * dt))
-        self.movement.translate(half_of_acceleration)
-        self.spin.translate(half_of_torque)
+        half_dt = dt / 2
+        acceleration = self.acceleration
+        torque = self.torque
+        self._movement.iadd_scaled(acceleration, half_dt)
+        self._spin.iadd_scaled(torque, half_dt)
+        moved = self._position.iadd_scaled(self._movement, dt)
+        turned = self._rotation.iadd_scaled(self._spin, dt)
+        if moved or turned:
+            self.update()
+        self._movement.iadd_scaled(acceleration, half_dt)
+        self._spin.iadd_scaled(torque, half_dt)
         if self.bounding_box_update_needed:
             self.update_bounding_box()
 
@@ -1,6 +1,6 @@
 from functools import partial
-from itertools import combinations, chain
-from typing import Set, Dict
+from itertools import chain
+from typing import Set, Dict, FrozenSet
 from uuid import UUID
 
 from engine.models.base_model import BaseModel
@@ -8,15 +8,23 @@ from engine.models.observable import RemoveCallbackException
 from engine.models.part_connection import PartConnectionModel, ShieldConnectionModel, PartConnectionError
 from engine.models.ship_part import ShipPartModel
 from engine.physics.force import MutableOffsets, MutableDegrees, MutableUnboundDegrees
+from engine.physics.part_index import PartIndex, polygon_bounds
 from engine.physics.polygon import MultiPolygon
 
 
 class CompositeModel(BaseModel):
+    part_index_class = PartIndex
+
     def __init__(self, parts: Set[ShipPartModel], position: MutableOffsets,
                  rotation: MutableDegrees, movement: MutableOffsets, spin: MutableUnboundDegrees,
                  acceleration: MutableOffsets, torque: MutableUnboundDegrees, center_of_mass: MutableOffsets):
+        self._rebuild_needed = False
+        self._parts_mass = None
         self._center_of_mass = center_of_mass
         self._part_by_uuid = {part.uuid: part for part in parts}
+        self._part_index = self.part_index_class()
+        for part in parts:
+            self._part_index.add(part)
         self._connections: Set[PartConnectionModel] = set()
         self._connection_by_uuid: Dict[UUID: ShieldConnectionModel] = {}
         self._all_by_uuid = {}
@@ -40,6 +48,7 @@ class CompositeModel(BaseModel):
         self._all_by_uuid.update(self._part_by_uuid)
 
     def run(self, dt):
+        self.rebuild_if_needed()
         super(CompositeModel, self).run(dt)
         for part in self.parts:
             part.run(dt)
@@ -85,6 +94,7 @@ class CompositeModel(BaseModel):
             removed_part.disconnect_all()
             removed_part.remove_all_observers()
         self._part_by_uuid.clear()
+        self._part_index = self.part_index_class()
         for part in parts:
             self._add_part(part)
         self.rebuild()
@@ -92,11 +102,20 @@ class CompositeModel(BaseModel):
 
     def add_part(self, part: ShipPartModel):
         self._add_part(part)
-        self.rebuild()
+        if self._rebuild_needed or not len(self._bounding_box):
+            self.rebuild()
+            return
+        if part.is_alive and not part.is_exploding:
+            self._bounding_box.add_polygons({self._part_polygon(part)})
+            self._mass += part.mass
+        self._shift_center_of_mass(part, part.mass)
+        self._calculate_inertia()
+        self._callback("rebuild")
 
     def _add_part(self, part):
         self._part_by_uuid[part.uuid] = part
         self._all_by_uuid[part.uuid] = part
+        self._part_index.add(part)
         part._center_of_mass = self._center_of_mass
         part.observe(self._eject_part_callback, "explode")
         part.observe(self.rebuild, "move")
@@ -104,14 +123,17 @@ class CompositeModel(BaseModel):
         self._callback("add_part", added=part)
 
     def remove_part(self, part: ShipPartModel):
+        removed = set()
         if part.uuid in self._part_by_uuid:
             del self._part_by_uuid[part.uuid]
             del self._all_by_uuid[part.uuid]
+            self._part_index.remove(part)
             part.unobserve(self._eject_part_callback, "explode")
             part.unobserve(self.rebuild, "move")
             part.unobserve(self.rebuild_connections_for, "move")
             self._callback("remove_part", removed=part)
-        self.prune_dead_parts_from_bounding_box()
+            removed.add(part)
+        self.prune_dead_parts_from_bounding_box(removed)
         if not self.parts:
             self.set_alive(False)
 
@@ -128,6 +150,14 @@ class CompositeModel(BaseModel):
         self.add_own_spawn(part)
 
     def rebuild(self):
+        self._rebuild_needed = True
+
+    def rebuild_if_needed(self):
+        if self._rebuild_needed:
+            self._rebuild_needed = False
+            self._rebuild()
+
+    def _rebuild(self):
         if len(self.parts_of_bbox) > 0:
             self._bounding_box = self._build_bounding_box(self.parts_of_bbox)
             self._calculate_mass()
@@ -137,35 +167,76 @@ class CompositeModel(BaseModel):
         else:
             self.set_alive(False)
 
+    @property
+    def bounding_box(self):
+        self.rebuild_if_needed()
+        return self._bounding_box
+
+    @property
+    def mass(self):
+        self.rebuild_if_needed()
+        return self._mass
+
+    @property
+    def inertia(self):
+        self.rebuild_if_needed()
+        return self._inertia
+
+    @inertia.setter
+    def inertia(self, inertia):
+        self._inertia = inertia
+
     def update_center_of_mass(self):
         weights = [part.mass for part in self.parts]
         sum_weights = sum(weights)
         centroids = [part.position for part in self.parts]
         x = sum(x * weight for (x, _, _), weight in zip(centroids, weights)) / sum_weights
         z = sum(z * weight for (_, _, z), weight in zip(centroids, weights)) / sum_weights
+        self._parts_mass = sum_weights
         self._center_of_mass.set(x, 0, z)
 
+    def _shift_center_of_mass(self, part: ShipPartModel, mass):
+        if self._parts_mass is None:
+            self.update_center_of_mass()
+            return
+        parts_mass = self._parts_mass + mass
+        if not parts_mass:
+            return
+        x, _, z = self._center_of_mass
+        self._center_of_mass.set((x * self._parts_mass + part.x * mass) / parts_mass, 0,
+                                 (z * self._parts_mass + part.z * mass) / parts_mass)
+        self._parts_mass = parts_mass
+
+    @staticmethod
+    def _part_polygon(part):
+        bbox = part.bounding_box.__copy__()
+        bbox.part_id = part.uuid
+        bbox.set_position_rotation(part.x, part.z, part.yaw)
+        bbox.freeze()
+        bbox.clear_movement()
+        return bbox
+
     def _build_bounding_box(self, ship_parts: list) -> MultiPolygon:
-        bboxes = set()
-        for part in chain(ship_parts, self._connections):
-            bbox = part.bounding_box.__copy__()
-            bbox.part_id = part.uuid
-            bbox.set_position_rotation(part.x, part.z, part.yaw)
-            bbox.freeze()
-            bbox.clear_movement()
-            bboxes.add(bbox)
+        bboxes = {self._part_polygon(part) for part in chain(ship_parts, self._connections)}
         bounding_box = MultiPolygon(bboxes)
         bounding_box.freeze()
         bounding_box.set_position_rotation(self.position.x, self.position.z, self.rotation.yaw)
         bounding_box.clear_movement()
         return bounding_box
 
-    def prune_dead_parts_from_bounding_box(self):
+    def prune_dead_parts_from_bounding_box(self, removed_parts=()):
         if len(self.parts_of_bbox) > 0:
-            part_uuids = {part.uuid for part in self.parts if not part.is_alive or part.is_exploding}
-            self.bounding_box.remove_polygons(part_uuids)
+            if self._rebuild_needed:
+                return
+            dead_parts = [part for part in self.parts if not part.is_alive or part.is_exploding]
+            for part in dead_parts:
+                self._part_index.invalidate(part)
+            part_uuids = {part.uuid for part in dead_parts}
+            part_uuids.update(part.uuid for part in removed_parts)
+            self._bounding_box.remove_polygons(part_uuids)
             self._calculate_mass()
-            self.update_center_of_mass()
+            for part in removed_parts:
+                self._shift_center_of_mass(part, -part.mass)
             self._calculate_inertia()
             self._callback("rebuild")
         else:
@@ -184,7 +255,10 @@ class CompositeModel(BaseModel):
         for connection in self._connections.copy():
             connection.disconnect_all()
         self._connections.clear()
-        for part1, part2 in combinations(self.parts, 2):
+        parts = self.parts
+        for part in parts:
+            self._part_index.move(part)
+        for part1, part2 in self._part_index.pairs(parts):
             self._try_to_connect(part1, part2)
         outwards_parts = list(self.parts)
         outwards_parts.sort(key=lambda part: part.position.distance)
@@ -194,7 +268,8 @@ class CompositeModel(BaseModel):
     def rebuild_connections_for(self, caller: ShipPartModel):
         if not self.is_alive or not caller.is_alive:
             raise RemoveCallbackException()
-        for part in self.parts:
+        self._part_index.move(caller)
+        for part in self._part_index.neighbours(caller, caller.connection_reach):
             if part not in caller.connected_parts:
                 self._try_to_connect(caller, part)
 
@@ -243,7 +318,7 @@ class CompositeModel(BaseModel):
         class_map = {"ShieldConnection": ShieldConnectionModel}
         config = part1.connection_configs.get(part2.name, {})
         connection_class = class_map.get(config.get('connection_class'), PartConnectionModel)
-        func = partial(self._validation_function, {part1, part2})
+        func = partial(self._validation_function, frozenset((part1, part2)))
         connection = connection_class(part1, part2,
                                       validate_connection_function=func,
                                       max_distance=config.get('distance', 1.7))
@@ -252,16 +327,25 @@ class CompositeModel(BaseModel):
             raise PartConnectionError("Too far")
         return connection
 
-    def _validation_function(self, ignored_parts: Set[ShipPartModel], local_polygon: "Polygon"):
+    def _validation_function(self, ignored_parts: FrozenSet[ShipPartModel], local_polygon: "Polygon"):
         if not local_polygon:
             return False
-        global_polygon = local_polygon.copy_to(self.bounding_box.x, self.bounding_box.y, self.bounding_box.rotation)
-        _, intersected_bboxes = global_polygon.intersected_polygons(self.bounding_box)
-        ignored_uuids = {part.uuid for part in ignored_parts}
-        intersected_uuids = {bbox.part_id for bbox in intersected_bboxes
-                             if bbox.part_id != global_polygon.part_id and bbox.part_id in self._part_by_uuid}
-        intersected_uuids -= ignored_uuids
-        return len(intersected_uuids) == 0
+        valid = self._part_index.validation(ignored_parts, local_polygon)
+        if valid is None:
+            valid = self._validate_connection(ignored_parts, local_polygon)
+            self._part_index.store_validation(ignored_parts, local_polygon, valid)
+        return valid
+
+    def _validate_connection(self, ignored_parts: FrozenSet[ShipPartModel], local_polygon: "Polygon"):
+        if not local_polygon.lines:
+            return True
+        polygon = local_polygon.copy_to(0, 0, 0)
+        for part in self._part_index.overlapping(polygon_bounds(local_polygon)):
+            if part in ignored_parts or not part.is_alive or part.is_exploding:
+                continue
+            if polygon.intersects(self._part_polygon(part)):
+                return False
+        return True
 
     @property
     def parts_of_bbox(self):
@@ -20,7 +20,12 @@ class ShipModelFactory(object):
 
     def manufacture(self, name, position=None, rotation=None, movement=None, spin=None,
                     acceleration=None, torque=None) -> ShipModel:
-        config = deepcopy(self.ships[name])
+        return self.assemble(self.ships[name], position=position, rotation=rotation, movement=movement, spin=spin,
+                             acceleration=acceleration, torque=torque)
+
+    def assemble(self, config, position=None, rotation=None, movement=None, spin=None,
+                 acceleration=None, torque=None) -> ShipModel:
+        config = deepcopy(config)
         center_of_mass = MutableOffsets(0, 0, 0)
         parts = self.ship_part_model_factory.manufacture_all(config['parts'], center_of_mass)
 
@@ -201,7 +206,7 @@ class AsteroidModelFactory(object):
         pass
 
     @staticmethod
-    def manufacture(position, rotation=None):
+    def manufacture(position, rotation=None, radii=None):
         position = MutableOffsets(*position)
         rotation = rotation or (0, 0, 0)
         rotation = MutableDegrees(*rotation)
@@ -210,7 +215,9 @@ class AsteroidModelFactory(object):
         acceleration = MutableOffsets(0, 0, 0)
         torque = MutableDegrees(0, 0, 0)
         coords = [(-sin(radians(d)), cos(radians(d))) for d in range(0, 360, 18)]
-        distances = [abs(normalvariate(25, 5)) for _ in coords]
-        coords = [(x * d, y * d) for (x, y), d in zip(coords, distances)]
+        radii = radii or [round(abs(normalvariate(25, 5)), 2) for _ in coords]
+        coords = [(x * d, y * d) for (x, y), d in zip(coords, radii)]
         bounding_box = MultiPolygon.manufacture(coords=coords, x=position.x, y=position.z, rotation=rotation.yaw)
-        return AsteroidModel(position, rotation, movement, spin, acceleration, torque, bounding_box)
+        asteroid = AsteroidModel(position, rotation, movement, spin, acceleration, torque, bounding_box)
+        asteroid.radii = list(radii)
+        return asteroid
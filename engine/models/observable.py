@@ -1,5 +1,4 @@
 import inspect
-from collections import defaultdict
 from typing import Callable
 
 
@@ -7,65 +6,110 @@ class RemoveCallbackException(Exception):
     pass
 
 
-class Observer:
+_takes_caller_by_code = {}
 
-    def __init__(self, callback: Callable):
-        self._callback = callback
-        self.__eq__ = callback.__eq__
-        self.__hash__ = callback.__hash__
 
-    def __call__(self, *args, **kwargs):
-        self._callback(**kwargs)
+class NoObservers(dict):
 
+    def __setitem__(self, key, value):
+        raise TypeError("observers are added through Observable.observe")
 
-class SelfObserver(Observer):
+    def __reduce__(self):
+        return "_no_observers"
 
-    def __init__(self, callback, observable):
-        super(SelfObserver, self).__init__(callback)
-        self._observable = observable
 
-    def __call__(self, *args, **kwargs):
-        self._callback(caller=self._observable, **kwargs)
+_no_observers = NoObservers()
+
+
+def takes_caller(callback: Callable) -> bool:
+    code = getattr(getattr(callback, '__func__', callback), '__code__', None)
+    if code is None:
+        return 'caller' in inspect.signature(callback).parameters
+    try:
+        return _takes_caller_by_code[code]
+    except KeyError:
+        takes = 'caller' in inspect.signature(callback).parameters
+        _takes_caller_by_code[code] = takes
+        return takes
+
+
+class EventBatch(object):
+
+    def __init__(self, actions=("move",)):
+        self.actions = frozenset(actions)
+        self._pending = {}
+        self._previous = None
+
+    def defer(self, observable: "Observable", action, kwargs):
+        self._pending[(id(observable), action)] = (observable, action, kwargs)
+
+    def __enter__(self):
+        self._previous = Observable._batch
+        Observable._batch = self
+        return self
+
+    def __exit__(self, *exc_info):
+        Observable._batch = self._previous
+        self._previous = None
+        self.flush()
+
+    def flush(self):
+        error = None
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            for observable, action, kwargs in pending.values():
+                try:
+                    observable._dispatch(action, kwargs)
+                except Exception as e:
+                    error = error or e
+        if error is not None:
+            raise error
+
+    def __len__(self):
+        return len(self._pending)
 
 
 class Observable:
+    __slots__ = ()
 
-    def __init__(self):
-        self._new_observers = defaultdict(set)
-        self._observers = defaultdict(set)
-        self._removed_observers = defaultdict(set)
+    _batch: EventBatch = None
 
-    def _make_observer(self, callback: Callable):
-        if 'caller' in inspect.signature(callback).parameters:
-            return SelfObserver(callback, self)
-        else:
-            return Observer(callback)
+    def __init__(self):
+        self._observers = _no_observers
 
     def observe(self, callback: Callable, action):
-        self._new_observers[action].add(self._make_observer(callback))
+        observers = self._observers.get(action, ())
+        if all(callback != observer for observer, _ in observers):
+            if self._observers is _no_observers:
+                self._observers = {}
+            self._observers[action] = observers + ((callback, takes_caller(callback)),)
 
     def unobserve(self, callback: Callable, action):
-        self._removed_observers[action].add(self._make_observer(callback))
+        observers = self._observers.get(action)
+        if observers:
+            self._observers[action] = tuple(entry for entry in observers if entry[0] != callback)
 
     def _callback(self, action, **kwargs):
-        self._prune_removed_observers(action)
-        self._introduce_new_observers(action)
-        for callback in self._observers[action]:
+        if not self._observers.get(action):
+            return
+        batch = Observable._batch
+        if batch is not None and action in batch.actions:
+            batch.defer(self, action, kwargs)
+        else:
+            self._dispatch(action, kwargs)
+
+    def _dispatch(self, action, kwargs):
+        for callback, with_caller in self._observers.get(action, ()):
             try:
-                callback(**kwargs)
+                if with_caller:
+                    callback(caller=self, **kwargs)
+                else:
+                    callback(**kwargs)
             except RemoveCallbackException:
                 self.unobserve(callback, action)
 
     def remove_all_observers(self):
-        self._removed_observers = self._observers
-
-    def _introduce_new_observers(self, action):
-        self._observers[action] |= self._new_observers[action]
-        self._new_observers[action].clear()
-
-    def _prune_removed_observers(self, action):
-        self._observers[action] -= self._removed_observers[action]
-        self._removed_observers[action].clear()
+        self._observers = _no_observers
 
 
-__all__ = [Observable]
+__all__ = [Observable, EventBatch]
@@ -82,6 +82,10 @@ class ShipPartModel(BaseModel):
         names_of_connected_parts = set(part.name for part in self.connected_parts if part.working)
         return (self.needs_connection_to & names_of_connected_parts) - self.needs_connection_to
 
+    @property
+    def connection_reach(self):
+        return max([1.7] + [config.get('distance', 1.7) for config in self._connectability])
+
     def can_connect_to(self, other_part: "ShipPartModel"):
         return self._can_connect_to(other_part) and other_part._can_connect_to(self)
 
@@ -0,0 +1,158 @@
+import asyncio
+
+from twisted.internet.address import IPv4Address
+from twisted.internet.protocol import connectionDone
+
+from engine.server import ServerEngine
+
+
+class RepeatingCall(object):
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, func, interval):
+        self.loop = loop
+        self.func = func
+        self.interval = interval
+        self.deadline = loop.time()
+        self.handle = loop.call_soon(self._run)
+
+    def _run(self):
+        self.func()
+        self.deadline += self.interval
+        now = self.loop.time()
+        if self.deadline < now:
+            self.deadline = now
+        self.handle = self.loop.call_at(self.deadline, self._run)
+
+    def stop(self):
+        self.handle.cancel()
+
+
+class AsyncioScheduling(object):
+
+    def schedule_interval(self, func, interval):
+        return RepeatingCall(self._event_loop, lambda: self._call_with_time_since(func), interval)
+
+
+class AsyncioServerEngine(AsyncioScheduling, ServerEngine):
+    pass
+
+
+def peer_address(transport, kind="TCP"):
+    host, port = transport.get_extra_info('peername')[:2]
+    return IPv4Address(kind, host, port)
+
+
+class StreamTransport(object):
+
+    def __init__(self, transport: asyncio.Transport):
+        self.transport = transport
+
+    def write(self, data):
+        self.transport.write(data)
+
+    def writeSequence(self, data):
+        self.transport.writelines(data)
+
+    def loseConnection(self):
+        self.transport.close()
+
+    def getPeer(self):
+        return peer_address(self.transport)
+
+    def getHost(self):
+        host, port = self.transport.get_extra_info('sockname')[:2]
+        return IPv4Address("TCP", host, port)
+
+
+class StreamBridge(asyncio.Protocol):
+
+    def __init__(self, factory, network: "AsyncioNetwork"):
+        self.factory = factory
+        self.network = network
+        self.protocol = None
+
+    def connection_made(self, transport):
+        self.protocol = self.factory.buildProtocol(peer_address(transport))
+        self.protocol.makeConnection(StreamTransport(transport))
+
+    def data_received(self, data):
+        self.network.received += 1
+        self.protocol.dataReceived(data)
+
+    def connection_lost(self, exc):
+        if self.protocol is not None:
+            self.protocol.connectionLost(connectionDone)
+
+
+class DatagramTransport(object):
+
+    def __init__(self, transport: asyncio.DatagramTransport):
+        self.transport = transport
+        self.address = None
+
+    def connect(self, host, port):
+        self.address = (host, port)
+
+    def write(self, data, address=None):
+        self.transport.sendto(data, address or self.address)
+
+    def getHost(self):
+        host, port = self.transport.get_extra_info('sockname')[:2]
+        return IPv4Address("UDP", host, port)
+
+    def stopListening(self):
+        self.transport.close()
+
+
+class DatagramBridge(asyncio.DatagramProtocol):
+
+    def __init__(self, protocol, network: "AsyncioNetwork"):
+        self.protocol = protocol
+        self.network = network
+
+    def connection_made(self, transport):
+        self.protocol.makeConnection(DatagramTransport(transport))
+
+    def datagram_received(self, data, addr):
+        self.network.received += 1
+        self.protocol.datagramReceived(data, addr[:2])
+
+    def connection_lost(self, exc):
+        self.protocol.doStop()
+
+
+class AsyncioNetwork(object):
+
+    max_drain_passes = 1000
+
+    def __init__(self, loop: asyncio.AbstractEventLoop=None):
+        self.loop = asyncio.new_event_loop() if loop is None else loop
+        self.received = 0
+
+    def listen_tcp(self, port, factory, interface="0.0.0.0"):
+        return self.loop.run_until_complete(
+            self.loop.create_server(lambda: StreamBridge(factory, self), interface, port))
+
+    def connect_tcp(self, host, port, factory):
+        transport, _ = self.loop.run_until_complete(
+            self.loop.create_connection(lambda: StreamBridge(factory, self), host, port))
+        return transport
+
+    def listen_udp(self, port, protocol, interface="0.0.0.0"):
+        self.loop.run_until_complete(
+            self.loop.create_datagram_endpoint(lambda: DatagramBridge(protocol, self), local_addr=(interface, port)))
+        return protocol.transport
+
+    def drain(self, _=None):
+        for _ in range(self.max_drain_passes):
+            received = self.received
+            self.loop.stop()
+            self.loop.run_forever()
+            if self.received == received:
+                return
+
+    def run(self):
+        self.loop.run_forever()
+
+    def stop(self):
+        self.loop.stop()
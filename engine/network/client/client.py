@@ -1,4 +1,5 @@
 from engine.client import ClientEngine
+from engine.network.asyncio_transport import AsyncioNetwork
 from engine.network.client.update_protocol import UpdateClientProtocol
 from engine.network.client.factories import EventClientFactory
 from engine.pigtwisted import install
@@ -28,3 +29,27 @@ class NetworkClient(object):
         self.connection.disconnect()
         self.listener.stopListening()
         print("Disconnected")
+
+
+class AsyncioNetworkClient(object):
+
+    def __init__(self, engine: ClientEngine):
+        self.network = AsyncioNetwork()
+        self.connection = None
+        self.listener = None
+        self.engine = engine
+        self.engine.bind_connect(self.connect)
+        self.engine.bind_stop(self.engine.exit)
+        self.engine.schedule(self.network.drain)
+        self.engine._event_loop.run()
+
+    def connect(self, host, port=8000):
+        update_protocol = UpdateClientProtocol(self.engine, host, port+1)
+        factory = EventClientFactory(self.engine, update_protocol)
+        self.connection = self.network.connect_tcp(host, port, factory)
+        self.listener = self.network.listen_udp(port + 2, update_protocol)
+
+    def disconnect(self):
+        self.connection.close()
+        self.listener.stopListening()
+        print("Disconnected")
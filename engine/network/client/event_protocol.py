@@ -4,10 +4,8 @@ from engine.client import ClientEngine
 
 class ClientProtocol(EventProtocol):
 
-    version = (1, 0, 0)
-
-    def __init__(self, engine: ClientEngine):
-        super().__init__(engine)
+    def __init__(self, engine: ClientEngine, update_protocol=None):
+        super().__init__(engine, update_protocol=update_protocol)
         self.engine = engine
         self._server_info = {}
         self.commands.update(
@@ -26,6 +24,30 @@ class ClientProtocol(EventProtocol):
         self.send_login(self.engine.callsign)
         self.register_own_ship(self.engine.my_model)
 
+    def handshake(self, frame):
+        super(ClientProtocol, self).handshake(frame)
+        if self.update_protocol and 'codec' in frame:
+            self.update_protocol.use_codec(frame['codec'])
+
+    def spawn_model(self, frame):
+        uuid = frame['model']['uuid']
+        if self.update_protocol and 'index' in frame:
+            self.update_protocol.model_indices.register(frame['index'], uuid)
+        if uuid in self.engine.models:
+            return self.engine.models[uuid]
+        return super(ClientProtocol, self).spawn_model(frame)
+
+    def pong(self, frame):
+        super(ClientProtocol, self).pong(frame)
+        if self.update_protocol:
+            self.update_protocol.latency = self.get_latency()
+
+    def decay_model(self, frame):
+        super(ClientProtocol, self).decay_model(frame)
+        if self.update_protocol:
+            self.update_protocol.snapshots.forget(frame['model_uuid'])
+            self.update_protocol.model_indices.forget(frame['model_uuid'])
+
     def engine_callback_new_model(self, model):
         self.send_spawn_model(model)
 
@@ -36,7 +58,7 @@ class ClientProtocol(EventProtocol):
         self.send({"command": "login", "username": username})
 
     def register_own_ship(self, model):
-        self.send({"command": "register_own_ship", "model": model})
+        self.send({"command": "register_own_ship", "model": self.spawn_schema.describe(model)})
 
     def server_info(self, frame):
         self._server_info = frame['server_info']
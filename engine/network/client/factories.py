@@ -22,7 +22,7 @@ class EventClientFactory(ClientFactory):
         print("Failed to connect! {}".format(reason))
 
     def buildProtocol(self, addr):
-        p =  self.protocol(self.engine)
+        p = self.protocol(self.engine, update_protocol=self.update_protocol)
         self.update_protocol.start()
         return p
 
@@ -0,0 +1,137 @@
+from collections import deque
+
+import numpy as np
+
+from engine.models import BaseModel
+
+
+def angle_difference(a, b):
+    return (a - b + 180.) % 360. - 180.
+
+
+def lerp(a, b, fraction):
+    return [x + (y - x) * fraction for x, y in zip(a, b)]
+
+
+def interpolate_frame(older: dict, newer: dict, fraction) -> dict:
+    return {"uuid": newer['uuid'],
+            "position": lerp(older['position'], newer['position'], fraction),
+            "rotation": older['rotation'] + angle_difference(newer['rotation'], older['rotation']) * fraction,
+            "movement": lerp(older['movement'], newer['movement'], fraction),
+            "spin": older['spin'] + (newer['spin'] - older['spin']) * fraction,
+            "acceleration": newer['acceleration'], "torque": newer['torque']}
+
+
+class SnapshotBuffer(object):
+
+    def __init__(self, delay_snapshots=2., interval=1 / 20, size=32, max_gap=1., smoothing=0.1):
+        self.delay_snapshots = delay_snapshots
+        self.interval = interval
+        self.size = size
+        self.max_gap = max_gap
+        self.smoothing = smoothing
+        self.samples = {}
+        self.last_push = None
+
+    def __contains__(self, uuid):
+        return uuid in self.samples
+
+    @property
+    def delay(self):
+        return self.delay_snapshots * self.interval
+
+    def push(self, t, frames: list):
+        if self.last_push is not None and t - self.last_push > self.interval / 4:
+            self.interval += (min(t - self.last_push, self.max_gap) - self.interval) * self.smoothing
+        self.last_push = t
+        for frame in frames:
+            samples = self.samples.get(frame['uuid'])
+            if samples is None or t - samples[-1][0] > self.max_gap:
+                samples = self.samples[frame['uuid']] = deque(maxlen=self.size)
+            samples.append((t, frame))
+
+    def forget(self, uuid):
+        self.samples.pop(uuid, None)
+
+    def sample(self, uuid, t):
+        samples = self.samples[uuid]
+        while len(samples) > 2 and samples[1][0] <= t:
+            samples.popleft()
+        older_t, older = samples[0]
+        if t <= older_t:
+            return older
+        if len(samples) == 1 or samples[1][0] < t:
+            return None
+        newer_t, newer = samples[1]
+        return interpolate_frame(older, newer, (t - older_t) / (newer_t - older_t))
+
+    def frames(self, t) -> list:
+        render_time = t - self.delay
+        frames = []
+        for uuid in list(self.samples):
+            if render_time - self.samples[uuid][-1][0] > self.max_gap:
+                del self.samples[uuid]
+                continue
+            frame = self.sample(uuid, render_time)
+            if frame is not None:
+                frames.append(frame)
+        return frames
+
+
+class Reconciler(object):
+
+    position_fields = slice(0, 4)
+    velocity_fields = slice(4, 8)
+
+    def __init__(self, history=120, snap_distance=25., correction_time=0.25):
+        self.snap_distance = snap_distance
+        self.correction_time = correction_time
+        self.times = np.full(history, -np.inf)
+        self.states = np.zeros((history, 8))
+        self.cursor = 0
+        self.pending = np.zeros(4)
+
+    @staticmethod
+    def state(model: BaseModel):
+        return model.x, model.y, model.z, model.yaw, *model.movement.xyz, model.spin.yaw
+
+    @staticmethod
+    def frame_state(frame: dict):
+        return (*frame['position'], frame['rotation'], *frame['movement'], frame['spin'])
+
+    def record(self, t, model: BaseModel):
+        self.times[self.cursor] = t
+        self.states[self.cursor] = self.state(model)
+        self.cursor = (self.cursor + 1) % len(self.times)
+
+    def predicted(self, t):
+        if np.isneginf(self.times).all():
+            return None
+        return self.states[np.argmin(np.abs(self.times - t))]
+
+    def reconcile(self, t, frame: dict, model: BaseModel):
+        predicted = self.predicted(t)
+        if predicted is None:
+            model.set_data(frame)
+            return
+        error = np.subtract(self.frame_state(frame), predicted)
+        error[3] = angle_difference(error[3], 0.)
+        error[7] = angle_difference(error[7], 0.)
+        velocity_error = error[self.velocity_fields]
+        model.add_movement(*velocity_error[:3])
+        model.add_spin(0, velocity_error[3], 0)
+        self.states[:, self.velocity_fields] += velocity_error
+        self.pending = error[self.position_fields]
+        if np.linalg.norm(self.pending[:3]) > self.snap_distance:
+            self.apply(model, self.pending)
+
+    def correct(self, model: BaseModel, dt):
+        if not self.pending.any():
+            return
+        self.apply(model, self.pending * min(1., dt / self.correction_time))
+
+    def apply(self, model: BaseModel, correction: np.ndarray):
+        model.translate(*correction[:3])
+        model.rotate(0, correction[3], 0)
+        self.states[:, self.position_fields] += correction
+        self.pending = self.pending - correction
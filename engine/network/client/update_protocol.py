@@ -1,22 +1,61 @@
+import time
+
 from engine.client import ClientEngine
+from engine.network.client.interpolation import SnapshotBuffer, Reconciler
+from engine.network.delta_codec import DeltaSnapshotCodec
+from engine.network.input_codec import InputCommandCodec
 from engine.network.update_protocol import UpdateProtocol
 
 
 class UpdateClientProtocol(UpdateProtocol):
 
+    input_interval = 1 / 30
+    snapshot_buffer_class = SnapshotBuffer
+    reconciler_class = Reconciler
+
     def __init__(self, engine: ClientEngine, host, port):
         super().__init__(engine)
         self.host = host
         self.port = port
+        self.input_sequence = 0
+        self.latency = 0
+        self.snapshots = self.snapshot_buffer_class()
+        self.reconciler = self.reconciler_class()
 
     def startProtocol(self):
         self.transport.connect(self.host, self.port)
 
     def start(self):
-        self.engine.my_model.observe(self.client_movement)
+        self.engine.schedule_interval(self.send_input, interval=self.input_interval)
+        self.engine.schedule(self.present)
+
+    def datagramReceived(self, datagram, addr):
+        now = time.monotonic()
+        own_uuid = self.engine.my_model.uuid
+        frames = []
+        for frame in self.deserialize(datagram):
+            if frame['uuid'] == own_uuid:
+                self.reconciler.reconcile(now - self.latency, frame, self.engine.my_model)
+            else:
+                frames.append(frame)
+        self.snapshots.push(now, frames)
+        ack = self.codecs[DeltaSnapshotCodec.name].take_ack()
+        if ack:
+            self.transport.write(ack)
+
+    def present(self, dt):
+        now = time.monotonic()
+        self.reconciler.correct(self.engine.my_model, dt)
+        self.reconciler.record(now, self.engine.my_model)
+        self.engine.update_model(self.snapshots.frames(now))
 
-    def client_movement(self):
-        self.send([self.engine.my_model.data_dict])
+    def send_input(self, _):
+        input_handler = self.engine.input_handler
+        buttons = set(input_handler.buttons)
+        if self.engine.my_controller:
+            buttons |= self.engine.my_controller.take_triggered()
+        self.input_sequence += 1
+        self.transport.write(InputCommandCodec.encode(self.input_sequence, buttons, input_handler.axis))
 
     def send(self, data):
         ser = self.serialize(data)
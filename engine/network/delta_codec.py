@@ -0,0 +1,217 @@
+import struct
+
+import numpy as np
+
+from engine.network.snapshot_codec import ModelIndexTable, BinarySnapshotCodec
+
+
+class SnapshotRing(object):
+
+    def __init__(self, size=32):
+        self.size = size
+        self._snapshots = [None] * size
+        self._sequences = [0] * size
+        self.latest = 0
+
+    def push(self, records: np.ndarray) -> int:
+        sequence = self.latest + 1
+        self.store(sequence, records)
+        return sequence
+
+    def store(self, sequence: int, records: np.ndarray):
+        slot = sequence % self.size
+        self._snapshots[slot] = records
+        self._sequences[slot] = sequence
+        self.latest = max(self.latest, sequence)
+
+    def get(self, sequence):
+        if not sequence:
+            return None
+        slot = sequence % self.size
+        if self._sequences[slot] != sequence:
+            return None
+        return self._snapshots[slot]
+
+
+def baseline_rows(baseline: np.ndarray, indices: np.ndarray):
+    if not len(baseline):
+        return np.zeros(len(indices), dtype=np.intp), np.zeros(len(indices), dtype=bool)
+    rows = np.minimum(np.searchsorted(baseline['index'], indices), len(baseline) - 1)
+    return rows, baseline['index'][rows] == indices
+
+
+class DeltaSnapshotCodec(BinarySnapshotCodec):
+
+    name = "delta"
+    magic = b'MD'
+    ack_magic = b'MA'
+    version = 2
+    header = struct.Struct("<2sBIIHHHH")
+    ack = struct.Struct("<2sI")
+    fields = BinarySnapshotCodec.record.names[1:]
+    field_sizes = [BinarySnapshotCodec.record.fields[field][0].itemsize for field in fields]
+    all_fields = (1 << len(fields)) - 1
+    ring_size = 32
+
+    def __init__(self, model_indices: ModelIndexTable):
+        super().__init__(model_indices)
+        self.snapshots = SnapshotRing(self.ring_size)
+        self._pending_ack = None
+        self._partial = {}
+
+    @classmethod
+    def is_ack(cls, data: bytes) -> bool:
+        return data[:2] == cls.ack_magic
+
+    @classmethod
+    def read_ack(cls, data: bytes) -> int:
+        return cls.ack.unpack(data)[1]
+
+    def take_ack(self):
+        pending_ack, self._pending_ack = self._pending_ack, None
+        if pending_ack is None:
+            return None
+        return self.ack.pack(self.ack_magic, pending_ack)
+
+    def records(self, frames: list) -> np.ndarray:
+        records = super().records(frames)
+        records.sort(order="index")
+        return records
+
+    def encode(self, frames: list, sequence=0) -> bytes:
+        records = self.records(frames)
+        return self._pack(0, 0, 0, 1, records, np.full(len(records), self.all_fields, dtype=np.uint8))
+
+    def encode_packets(self, frames: list, sequence=0) -> list:
+        return self.delta_packets(0, self.records(frames))
+
+    def changes(self, records: np.ndarray, baseline: np.ndarray=None):
+        if baseline is None:
+            return records, np.full(len(records), self.all_fields, dtype=np.uint8), np.empty(0, dtype="<u4")
+        rows, known = baseline_rows(baseline, records['index'])
+        masks = np.where(known, 0, self.all_fields).astype(np.uint8)
+        for bit, field in enumerate(self.fields):
+            changed = records[field] != baseline[field][rows]
+            if changed.ndim > 1:
+                changed = changed.any(axis=1)
+            masks[changed] |= 1 << bit
+        removed = np.setdiff1d(baseline['index'], records['index'], assume_unique=True).astype("<u4")
+        changed_rows = masks != 0
+        return records[changed_rows], masks[changed_rows], removed
+
+    def delta_packets(self, sequence: int, records: np.ndarray, baseline_sequence=0,
+                      baseline: np.ndarray=None) -> list:
+        if baseline is None:
+            baseline_sequence = 0
+        records, masks, removed = self.changes(records, baseline)
+        sizes = np.full(len(records), 5)
+        for bit, field_size in enumerate(self.field_sizes):
+            sizes += (masks >> bit & 1) * field_size
+        budget = self.max_packet_size - self.header.size
+        bounds = []
+        start = used = 0
+        for i, size in enumerate([4] * len(removed) + sizes.tolist()):
+            if used + size > budget and i > start:
+                bounds.append((start, i))
+                start, used = i, 0
+            used += size
+        bounds.append((start, len(removed) + len(records)))
+        removed_count = len(removed)
+        packets = []
+        for part, (first, last) in enumerate(bounds):
+            record_slice = slice(max(first - removed_count, 0), max(last - removed_count, 0))
+            packets.append(self._pack(sequence, baseline_sequence, part, len(bounds), records[record_slice],
+                                      masks[record_slice], removed[min(first, removed_count):min(last, removed_count)]))
+        return packets
+
+    def _pack(self, sequence, baseline_sequence, part, parts, records, masks, removed=()) -> bytes:
+        removed = np.asarray(removed, dtype="<u4")
+        packed = [self.header.pack(self.magic, self.version, sequence, baseline_sequence, part, parts, len(records),
+                                   len(removed)),
+                  records['index'].tobytes(), masks.tobytes(), removed.tobytes()]
+        for bit, field in enumerate(self.fields):
+            packed.append(records[field][masks & (1 << bit) != 0].tobytes())
+        return b"".join(packed)
+
+    def _unpack(self, data: bytes):
+        magic, version, sequence, baseline_sequence, part, parts, count, removed_count = \
+            self.header.unpack_from(data)
+        assert magic == self.magic and version == self.version
+        offset = self.header.size
+        records = np.zeros(count, dtype=self.record)
+        records['index'] = np.frombuffer(data, dtype="<u4", count=count, offset=offset)
+        offset += 4 * count
+        masks = np.frombuffer(data, dtype=np.uint8, count=count, offset=offset)
+        offset += count
+        removed = np.frombuffer(data, dtype="<u4", count=removed_count, offset=offset)
+        offset += 4 * removed_count
+        for bit, field in enumerate(self.fields):
+            present = masks & (1 << bit) != 0
+            field_type = self.record.fields[field][0]
+            shape = (int(present.sum()),) + field_type.shape
+            values = np.frombuffer(data, dtype=field_type.base, count=int(np.prod(shape)), offset=offset)
+            offset += values.nbytes
+            records[field][present] = values.reshape(shape)
+        return sequence, baseline_sequence, part, parts, records, masks, removed
+
+    def decode(self, data: bytes) -> list:
+        sequence, baseline_sequence, part, parts, records, masks, removed = self._unpack(data)
+        if not sequence:
+            return self.frames(records)
+        if sequence <= self.snapshots.latest:
+            return []
+        if baseline_sequence:
+            baseline = self.snapshots.get(baseline_sequence)
+            if baseline is None:
+                return self.frames(records[masks == self.all_fields])
+        else:
+            baseline = np.zeros(0, dtype=self.record)
+        rows, known = baseline_rows(baseline, records['index'])
+        for bit, field in enumerate(self.fields):
+            kept = known & (masks & (1 << bit) == 0)
+            records[field][kept] = baseline[field][rows[kept]]
+        self._assemble(sequence, baseline, part, parts, records, removed)
+        return self.frames(records)
+
+    def _assemble(self, sequence, baseline, part, parts, records, removed):
+        pieces = self._partial.setdefault(sequence, {})
+        pieces[part] = (records, removed)
+        if len(pieces) < parts:
+            if len(self._partial) > self.ring_size:
+                del self._partial[min(self._partial)]
+            return
+        for partial_sequence in [s for s in self._partial if s <= sequence]:
+            del self._partial[partial_sequence]
+        records = np.concatenate([piece[0] for piece in pieces.values()])
+        removed = np.concatenate([piece[1] for piece in pieces.values()])
+        unchanged = baseline[~np.isin(baseline['index'], removed) & ~np.isin(baseline['index'], records['index'])]
+        snapshot = np.concatenate((unchanged, records))
+        snapshot.sort(order="index")
+        self.snapshots.store(sequence, snapshot)
+        self._pending_ack = sequence
+
+
+class DeltaSession(object):
+
+    def __init__(self, codec: DeltaSnapshotCodec):
+        self.codec = codec
+        self.views = SnapshotRing(codec.ring_size)
+        self.acked = 0
+
+    def acknowledge(self, sequence: int):
+        self.acked = max(self.acked, sequence)
+
+    @property
+    def latest_view(self):
+        return self.views.get(self.views.latest)
+
+    def encode_packets(self, sequence: int, view: np.ndarray, encoded: dict=None) -> list:
+        baseline = self.views.get(self.acked)
+        self.views.store(sequence, view)
+        if encoded is None:
+            return self.codec.delta_packets(sequence, view, self.acked, baseline)
+        key = (sequence, id(view), id(baseline))
+        packets = encoded.get(key)
+        if packets is None:
+            packets = encoded[key] = self.codec.delta_packets(sequence, view, self.acked, baseline)
+        return packets
@@ -1,16 +1,21 @@
 from twisted.internet.protocol import connectionDone
 from twisted.protocols.basic import Int32StringReceiver
-import pickle
+import json
 from datetime import datetime
 from uuid import uuid4
 
+from engine.network.spawn_schema import SpawnSchema, encode_value, decode_object
+
 
 class EventProtocol(Int32StringReceiver):
 
-    version = (1, 0, 0)
+    version = (1, 1, 0)
+    log_frames = False
 
-    def __init__(self, engine):
+    def __init__(self, engine, update_protocol=None):
         self.engine = engine
+        self.update_protocol = update_protocol
+        self.spawn_schema = SpawnSchema(engine.smf, engine.amf)
         self.username = None
         self._latency = 0
         self.commands = {
@@ -26,41 +31,53 @@ class EventProtocol(Int32StringReceiver):
         return self._latency
 
     def connectionMade(self):
-        self.send({"command": "handshake", "versions": {"protocol": self.version}})
+        self.send(self.handshake_frame())
         self.initiate_ping(None)
 
+    def handshake_frame(self) -> dict:
+        frame = {"command": "handshake", "versions": {"protocol": self.version}}
+        if self.update_protocol:
+            frame["codecs"] = self.update_protocol.codec_names
+        return frame
+
     @staticmethod
     def serialize(d: dict) -> bytes:
-        ser = pickle.dumps(d, protocol=-1)
-        return ser
+        return json.dumps(d, default=encode_value, separators=(',', ':')).encode()
 
     @staticmethod
     def deserialize(m: bytes) -> dict:
-        return pickle.loads(m)
+        return json.loads(m.decode(), object_hook=decode_object)
 
     def send(self, frame: dict):
-        ser = self.serialize(frame)
-        print("<< {} {}".format(len(ser), frame))
-        self.sendString(ser)
+        self.send_serialized(self.serialize(frame), frame)
+
+    def send_serialized(self, data: bytes, frame: dict=None):
+        if self.log_frames:
+            print("<< {} {}".format(len(data), frame))
+        self.sendString(data)
 
     def send_spawn_model(self, model):
-        self.send({"command": "spawn", "model": model})
+        self.send({"command": "spawn", "model": self.spawn_schema.describe(model)})
 
     def send_decay_model(self, model):
         self.send({"command": "decay", "model_uuid": model.uuid})
 
     def spawn_model(self, frame):
-        self.engine.spawn(frame['model'])
+        model = self.spawn_schema.build(frame['model'])
+        self.engine.spawn(model)
+        return model
 
     def decay_model(self, frame):
-        self.engine.decay(frame['model_uuid'])
+        if frame['model_uuid'] in self.engine.models:
+            self.engine.decay(frame['model_uuid'])
 
     def connectionLost(self, reason=connectionDone):
         pass
 
     def stringReceived(self, data):
         frame = self.deserialize(data)
-        print(">> {} {}".format(len(data), frame))
+        if self.log_frames:
+            print(">> {} {}".format(len(data), frame))
         self.commands.get(frame['command'], self.print_frame)(frame)
 
     def print_frame(self, frame):
@@ -71,7 +88,7 @@ class EventProtocol(Int32StringReceiver):
 
     def handshake(self, frame):
         versions = frame['versions']
-        assert self.version == versions['protocol']
+        assert self.version == tuple(versions['protocol'])
 
     def ping(self, frame):
         self.send({"command": "pong", "ts": frame['ts']})
@@ -79,4 +96,5 @@ class EventProtocol(Int32StringReceiver):
     def pong(self, frame):
         latency = datetime.now().timestamp() - frame['ts']
         self._latency = latency
-        print(latency, "latency")
+        if self.log_frames:
+            print(latency, "latency")
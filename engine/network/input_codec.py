@@ -0,0 +1,76 @@
+import struct
+
+
+class RemoteInput(object):
+
+    axis_names = ('x', 'y', 'z', 'rz', '-x', '-y', '-z', '-rz')
+
+    def __init__(self):
+        self.axis = {name: 0 for name in self.axis_names}
+        self.buttons = set()
+        self.held = set()
+        self.sequence = 0
+
+    def apply(self, sequence, buttons: set, axis: dict) -> bool:
+        if sequence <= self.sequence:
+            return False
+        self.sequence = sequence
+        self.buttons = (self.buttons & buttons) | (buttons - self.held)
+        self.held = buttons
+        self.axis.update(axis)
+        return True
+
+    def push_handlers(self, target):
+        pass
+
+    def remove_handlers(self, target):
+        pass
+
+
+class InputCommandCodec(object):
+
+    magic = b'MI'
+    version = 1
+    header = struct.Struct("<2sBIB")
+    axis_names = RemoteInput.axis_names
+    axes = struct.Struct("<{}B".format(len(RemoteInput.axis_names)))
+    int_button = struct.Struct("<BH")
+    str_button = struct.Struct("<BB")
+
+    @classmethod
+    def accepts(cls, data: bytes) -> bool:
+        return data[:2] == cls.magic
+
+    @classmethod
+    def encode(cls, sequence, buttons, axis: dict) -> bytes:
+        chunks = [cls.header.pack(cls.magic, cls.version, sequence, len(buttons)),
+                  cls.axes.pack(*(int(round(min(1., max(0., axis.get(name, 0.))) * 255)) for name in cls.axis_names))]
+        for button in buttons:
+            if isinstance(button, int):
+                chunks.append(cls.int_button.pack(0, button))
+            else:
+                name = str(button).encode()
+                chunks.append(cls.str_button.pack(1, len(name)) + name)
+        return b''.join(chunks)
+
+    @classmethod
+    def decode(cls, data: bytes):
+        magic, version, sequence, n_buttons = cls.header.unpack_from(data)
+        if version != cls.version:
+            raise ValueError("Unsupported input command version {}".format(version))
+        offset = cls.header.size
+        axis = {name: value / 255 for name, value in zip(cls.axis_names, cls.axes.unpack_from(data, offset))}
+        offset += cls.axes.size
+        buttons = set()
+        for _ in range(n_buttons):
+            kind = data[offset]
+            if kind == 0:
+                _, button = cls.int_button.unpack_from(data, offset)
+                offset += cls.int_button.size
+            else:
+                _, length = cls.str_button.unpack_from(data, offset)
+                offset += cls.str_button.size
+                button = data[offset:offset + length].decode()
+                offset += length
+            buttons.add(button)
+        return sequence, buttons, axis
@@ -1,13 +1,18 @@
+from twisted.internet.protocol import connectionDone
+
 from engine.network.event_protocol import EventProtocol
 
 
 class BroadcastProtocol(EventProtocol):
 
-    def __init__(self, engine, broadcast_func):
-        super().__init__(engine)
+    def __init__(self, engine, broadcast_func, update_protocol=None, update_address=None):
+        super().__init__(engine, update_protocol=update_protocol)
+        self.update_address = update_address
         self.username = None
         self.broadcast_func = broadcast_func
         self.own_model = None
+        self.spawned_by_client = set()
+        self.decayed_by_client = set()
         self.commands.update(
             {
                 "login": self.login,
@@ -17,8 +22,53 @@ class BroadcastProtocol(EventProtocol):
         self.engine.observe(self.send_player_list, "players")
 
     def spawn_model(self, frame):
-        super(BroadcastProtocol, self).spawn_model(frame)
+        known = frame['model']['uuid'] in self.engine.models
+        model = super(BroadcastProtocol, self).spawn_model(frame)
+        if not known:
+            self.spawned_by_client.add(model.uuid)
+        if self.update_protocol:
+            frame["index"] = self.update_protocol.model_indices.assign(model.uuid)
         self.broadcast(frame)
+        return model
+
+    def decay_model(self, frame):
+        if frame['model_uuid'] not in self.spawned_by_client:
+            return
+        self.spawned_by_client.remove(frame['model_uuid'])
+        model = self.engine.models.get(frame['model_uuid'])
+        focus = self.focus
+        if model is not None and focus and model in focus.models():
+            self.decayed_by_client.add(model.uuid)
+        super(BroadcastProtocol, self).decay_model(frame)
+        if model is not None and self.update_protocol:
+            self.update_protocol.forget_model(model)
+
+    @property
+    def focus(self):
+        if self.update_protocol and self.update_address:
+            return self.update_protocol.interest.get(self.update_address)
+
+    def send_spawn_model(self, model):
+        frame = {"command": "spawn", "model": self.spawn_schema.describe(model)}
+        if self.update_protocol:
+            frame["index"] = self.update_protocol.model_indices.assign(model.uuid)
+        self.send(frame)
+
+    def send_leave(self, model):
+        if model.uuid in self.decayed_by_client:
+            self.decayed_by_client.remove(model.uuid)
+        else:
+            self.send_decay_model(model)
+
+    def handshake(self, frame):
+        super(BroadcastProtocol, self).handshake(frame)
+        if not self.update_protocol:
+            return
+        codec = self.update_protocol.negotiate(frame.get('codecs', ()))
+        if self.update_address:
+            self.update_protocol.use_codec_for(self.update_address, codec)
+        reply = {"command": "handshake", "versions": {"protocol": self.version}, "codec": codec}
+        self.send(reply)
 
     def broadcast(self, frame):
         self.broadcast_func(frame, self.uuid)
@@ -26,16 +76,27 @@ class BroadcastProtocol(EventProtocol):
     def connectionMade(self):
         pass
 
+    def connectionLost(self, reason=connectionDone):
+        if self.factory:
+            self.factory.forget(self.uuid)
+        if self.update_protocol and self.update_address:
+            self.update_protocol.interest.unfocus(self.update_address)
+            self.update_protocol.release_input(self.update_address)
+
     def login(self, frame):
         if not self.username:
             self.username = frame['username']
 
     def register_own_ship(self, frame):
         self.send_player_list()
-        self.own_model = frame['model']
-        self.spawn_model({"command": "spawn", "model": frame["model"]})
+        self.own_model = self.spawn_model({"command": "spawn", "model": frame["model"]})
         self.engine.register_player(self.username, self.own_model.uuid)
-        self.send_spawn_all_models()
+        if self.update_protocol and self.update_address:
+            self.update_protocol.bind_input(self.update_address, self.own_model)
+            self.update_protocol.interest.focus(self.update_address, self.own_model,
+                                                on_enter=self.send_spawn_model, on_leave=self.send_leave)
+        else:
+            self.send_spawn_all_models()
         self.send_enter()
 
     def send_spawn_all_models(self):
@@ -23,13 +23,20 @@ class BroadcastServerFactory(ServerFactory):
         host = addr.host
         port = addr.port
         self.update_protocol.register_address(host, 8002)
-        p = self.protocol(self.engine, self.broadcast)
+        p = self.protocol(self.engine, self.broadcast, update_protocol=self.update_protocol,
+                          update_address=(host, 8002))
+        p.factory = self
         self.addresses[p.uuid] = addr
-        self.send_functions[p.uuid] = p.send
+        self.send_functions[p.uuid] = p.send_serialized
         return p
 
+    def forget(self, uuid):
+        self.addresses.pop(uuid, None)
+        self.send_functions.pop(uuid, None)
+
     def broadcast(self, frame, original_client_uuid):
+        data = self.protocol.serialize(frame)
         for uuid, send in self.send_functions.items():
             if uuid == original_client_uuid:
                 continue
-            send(frame)
+            send(data, frame)
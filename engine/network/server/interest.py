@@ -0,0 +1,102 @@
+from math import floor, ceil, hypot
+from typing import Callable
+
+from engine.engine import Engine
+from engine.models import BaseModel
+from engine.physics.spacial_index import HashedSpacialIndex
+
+
+class Focus(object):
+
+    def __init__(self, model: BaseModel, on_enter: Callable=None, on_leave: Callable=None):
+        self.model = model
+        self.on_enter = on_enter
+        self.on_leave = on_leave
+        self.near = set()
+        self.far = set()
+
+    def models(self, include_far=True) -> set:
+        if include_far:
+            return self.near | self.far
+        return self.near
+
+    def update(self, near: set, far: set):
+        before = self.near | self.far
+        self.near = near
+        self.far = far
+        after = near | far
+        if self.on_leave:
+            for model in before - after:
+                self.on_leave(model)
+        if self.on_enter:
+            for model in after - before:
+                self.on_enter(model)
+
+
+class InterestManager(object):
+
+    def __init__(self, engine: Engine, radius=400., far_radius=1000., margin=100., far_interval=4, cell_size=200.):
+        self.engine = engine
+        self.radius = radius
+        self.far_radius = far_radius
+        self.margin = margin
+        self.far_interval = far_interval
+        self.index = HashedSpacialIndex(cell_size=cell_size)
+        self._indexed = set()
+        self._foci = {}
+
+    def __contains__(self, key):
+        return key in self._foci
+
+    def get(self, key) -> Focus:
+        return self._foci.get(key)
+
+    def focus(self, key, model: BaseModel, on_enter: Callable=None, on_leave: Callable=None) -> Focus:
+        focus = Focus(model, on_enter=on_enter, on_leave=on_leave)
+        self._foci[key] = focus
+        self.reindex()
+        self.refresh_focus(focus)
+        return focus
+
+    def unfocus(self, key):
+        self._foci.pop(key, None)
+
+    def refresh(self):
+        if not self._foci:
+            return
+        self.reindex()
+        for focus in self._foci.values():
+            self.refresh_focus(focus)
+
+    def reindex(self):
+        models = set(self.engine.models.values())
+        for model in self._indexed - models:
+            self.index.clear_model_from_2d_space_index(model)
+        for model in models:
+            if model in self._indexed:
+                self.index.reindex_spacial_position(model)
+            else:
+                self.index.init_model_into_2d_space_index(model)
+        self._indexed = models
+
+    def candidates(self, x, z, radius) -> set:
+        cell_size = self.index.cell_size
+        return self.index.models_in_range(int(floor((x - radius) / cell_size)), int(ceil((x + radius) / cell_size)),
+                                          int(floor((z - radius) / cell_size)), int(ceil((z + radius) / cell_size)))
+
+    def models_around(self, x, z, radius) -> set:
+        return {model for model in self.candidates(x, z, radius) if hypot(model.x - x, model.z - z) <= radius}
+
+    def refresh_focus(self, focus: Focus):
+        x, z = focus.model.x, focus.model.z
+        candidates = self.candidates(x, z, self.far_radius + self.margin)
+        near = set()
+        far = set()
+        interested = focus.near | focus.far
+        for model in candidates:
+            distance = hypot(model.x - x, model.z - z)
+            if distance <= self.radius:
+                near.add(model)
+            elif distance <= self.far_radius or (distance <= self.far_radius + self.margin and model in interested):
+                far.add(model)
+        focus.update(near, far)
@@ -0,0 +1,295 @@
+import multiprocessing
+import time
+from math import floor
+
+from engine.controllers.factories import ControllerFactory
+from engine.engine import Engine
+from engine.headless import HeadlessRunner
+from engine.models import BaseModel
+from engine.network.asyncio_transport import AsyncioScheduling
+from engine.network.input_codec import RemoteInput
+from engine.network.server.update_protocol import UpdateServerProtocol
+from engine.network.spawn_schema import SpawnSchema
+from engine.physics.rigid_bodies import RigidBodyStore
+from engine.server import ServerEngine
+
+
+class ShardGrid(object):
+
+    def __init__(self, columns=2, rows=1, region_size=2000., margin=50.):
+        self.columns = columns
+        self.rows = rows
+        self.region_size = region_size
+        self.margin = margin
+
+    def __len__(self):
+        return self.columns * self.rows
+
+    def cell(self, x, z):
+        column = min(self.columns - 1, max(0, int(floor(x / self.region_size + self.columns / 2))))
+        row = min(self.rows - 1, max(0, int(floor(z / self.region_size + self.rows / 2))))
+        return column, row
+
+    def region_of(self, x, z) -> int:
+        column, row = self.cell(x, z)
+        return row * self.columns + column
+
+    def bounds(self, region):
+        row, column = divmod(region, self.columns)
+        left = (column - self.columns / 2) * self.region_size
+        bottom = (row - self.rows / 2) * self.region_size
+        return left, left + self.region_size, bottom, bottom + self.region_size
+
+    def outside(self, region, x, z) -> bool:
+        row, column = divmod(region, self.columns)
+        left, right, bottom, top = self.bounds(region)
+        margin = self.margin
+        return (column > 0 and x < left - margin) or (column < self.columns - 1 and x > right + margin) or \
+               (row > 0 and z < bottom - margin) or (row < self.rows - 1 and z > top + margin)
+
+
+class Shard(object):
+
+    publish_interval = 3
+
+    def __init__(self, region, grid: ShardGrid, engine: Engine=None, dt=1 / 60):
+        self.region = region
+        self.grid = grid
+        self.engine = Engine(None, rigid_bodies=RigidBodyStore()) if engine is None else engine
+        self.schema = SpawnSchema(self.engine.smf, self.engine.amf)
+        self.runner = HeadlessRunner(self.engine, dt=dt)
+        self.controller_factory = ControllerFactory(spawn_projectiles=False)
+        self.inputs = {}
+        self.outbox = []
+        self.engine.observe_new_models(self.announce_spawn)
+        self.engine.observe_dead_models(self.announce_decay)
+
+    def announce_spawn(self, model: BaseModel):
+        self.outbox.append(("spawn", self.schema.describe(model)))
+
+    def announce_decay(self, model: BaseModel):
+        self.outbox.append(("decay", model.uuid))
+
+    def handle(self, message):
+        kind = message[0]
+        if kind == "adopt":
+            _, description, controlled = message
+            model = self.schema.build(description)
+            self.engine.spawn(model)
+            if controlled:
+                self.control(model)
+        elif kind == "input":
+            _, uuid, sequence, buttons, axis = message
+            remote_input = self.inputs.get(uuid)
+            if remote_input is not None:
+                remote_input.apply(sequence, buttons, axis)
+        elif kind == "control":
+            model = self.engine.models.get(message[1])
+            if model is not None:
+                self.control(model)
+        elif kind == "release":
+            self.inputs.pop(message[1], None)
+            self.engine.remove_controller(message[1])
+        elif kind == "decay":
+            self.inputs.pop(message[1], None)
+            if message[1] in self.engine.models:
+                self.engine.decay(message[1])
+
+    def control(self, model: BaseModel):
+        remote_input = RemoteInput()
+        self.inputs[model.uuid] = remote_input
+        self.engine.set_controller(model.uuid, self.controller_factory.manufacture(model, input_handler=remote_input))
+
+    def tick(self) -> list:
+        self.runner.step()
+        for model in list(self.engine.models.values()):
+            if self.grid.outside(self.region, model.x, model.z):
+                self.hand_off(model)
+        if self.runner.ticks % self.publish_interval == 0:
+            self.outbox.append(("state", [model.data_dict for model in self.engine.models.values()]))
+        outbox, self.outbox = self.outbox, []
+        return outbox
+
+    def hand_off(self, model: BaseModel):
+        controlled = self.inputs.pop(model.uuid, None) is not None
+        self.outbox.append(("handoff", self.schema.describe(model), controlled))
+        self.engine.decay(model.uuid)
+
+
+def run_shard(region, grid: ShardGrid, connection, dt=1 / 60):
+    shard = Shard(region, grid, dt=dt)
+    runner = shard.runner
+    deadline = time.monotonic()
+    while True:
+        while connection.poll():
+            for message in connection.recv():
+                if message[0] in ("stats", "stop"):
+                    connection.send([(message[0], runner.ticks, runner.overruns, time.process_time(),
+                                      runner.recorder.summary())])
+                    if message[0] == "stop":
+                        return
+                else:
+                    shard.handle(message)
+        outbox = shard.tick()
+        if outbox:
+            connection.send(outbox)
+        deadline += dt
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        else:
+            runner.overruns += 1
+            deadline = time.monotonic()
+
+
+class ShardCoordinator(object):
+
+    def __init__(self, grid: ShardGrid, dt=1 / 60):
+        self.grid = grid
+        self.dt = dt
+        self.owners = {}
+        self.controlled = set()
+        self.connections = []
+        self.processes = []
+        self.stats = {}
+        self.stopped = set()
+
+    def start(self):
+        for region in range(len(self.grid)):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=run_shard, args=(region, self.grid, child, self.dt), daemon=True)
+            process.start()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def send(self, region, message):
+        self.connections[region].send([message])
+
+    def adopt(self, description: dict, controlled=False):
+        x, _, z = description['position']
+        region = self.grid.region_of(x, z)
+        self.owners[description['uuid']] = region
+        self.send(region, ("adopt", description, controlled))
+
+    def decay(self, uuid):
+        self.controlled.discard(uuid)
+        region = self.owners.pop(uuid, None)
+        if region is not None:
+            self.send(region, ("decay", uuid))
+
+    def control(self, uuid):
+        self.controlled.add(uuid)
+        region = self.owners.get(uuid)
+        if region is not None:
+            self.send(region, ("control", uuid))
+
+    def release(self, uuid):
+        self.controlled.discard(uuid)
+        region = self.owners.get(uuid)
+        if region is not None:
+            self.send(region, ("release", uuid))
+
+    def route_input(self, uuid, sequence, buttons, axis):
+        region = self.owners.get(uuid)
+        if region is not None:
+            self.send(region, ("input", uuid, sequence, buttons, axis))
+
+    def poll(self) -> list:
+        events = []
+        for region, connection in enumerate(self.connections):
+            while connection.poll():
+                try:
+                    messages = connection.recv()
+                except EOFError:
+                    break
+                for message in messages:
+                    self.receive(region, message, events)
+        return events
+
+    def receive(self, region, message, events: list):
+        kind = message[0]
+        if kind == "handoff":
+            _, description, controlled = message
+            if description['uuid'] in self.owners:
+                self.adopt(description, controlled=controlled or description['uuid'] in self.controlled)
+        elif kind == "spawn":
+            self.owners[message[1]['uuid']] = region
+            events.append(message)
+        elif kind == "decay":
+            if self.owners.get(message[1]) == region:
+                del self.owners[message[1]]
+                self.controlled.discard(message[1])
+                events.append(message)
+        elif kind == "state":
+            events.append(("state", [frame for frame in message[1] if self.owners.get(frame['uuid']) == region]))
+        elif kind in ("stats", "stop"):
+            self.stats[region] = {"ticks": message[1], "overruns": message[2], "cpu_seconds": message[3],
+                                  "summary": message[4]}
+            if kind == "stop":
+                self.stopped.add(region)
+
+    def request_stats(self):
+        for region in range(len(self.connections)):
+            self.send(region, ("stats",))
+
+    def stop(self, timeout=5.):
+        for region in range(len(self.connections)):
+            self.send(region, ("stop",))
+        deadline = time.monotonic() + timeout
+        while len(self.stopped) < len(self.connections) and time.monotonic() < deadline:
+            self.poll()
+            time.sleep(0.01)
+        for process in self.processes:
+            process.join(timeout=max(0., deadline - time.monotonic()))
+        return self.stats
+
+
+class ShardedServerEngine(ServerEngine):
+
+    def __init__(self, event_loop, coordinator: ShardCoordinator, spacial_index=None, pair_cache=None):
+        self.coordinator = coordinator
+        super().__init__(event_loop, spacial_index=spacial_index, pair_cache=pair_cache)
+
+    def on_enter(self):
+        self.schema = SpawnSchema(self.smf, self.amf)
+        super(ShardedServerEngine, self).on_enter()
+
+    def spawn(self, model: BaseModel):
+        super(ShardedServerEngine, self).spawn(model)
+        if model.uuid not in self.coordinator.owners:
+            self.coordinator.adopt(self.schema.describe(model))
+
+    def decay(self, uuid):
+        super(ShardedServerEngine, self).decay(uuid)
+        self.coordinator.decay(uuid)
+
+    def set_controller(self, uuid, controller):
+        self.coordinator.control(uuid)
+
+    def remove_controller(self, uuid):
+        self.coordinator.release(uuid)
+
+    def update(self, dt):
+        for event in self.coordinator.poll():
+            kind = event[0]
+            if kind == "state":
+                self.update_model(event[1])
+            elif kind == "spawn":
+                if event[1]['uuid'] not in self.models:
+                    self.spawn_with_callback(self.schema.build(event[1]))
+            elif kind == "decay":
+                model = self.models.get(event[1])
+                if model is not None:
+                    self.decay_with_callback(model)
+
+
+class AsyncioShardedServerEngine(AsyncioScheduling, ShardedServerEngine):
+    pass
+
+
+class ShardedUpdateServerProtocol(UpdateServerProtocol):
+
+    def apply_input(self, address, sequence, buttons, axis):
+        uuid = self.controlled_models.get(address)
+        if uuid is not None:
+            self.engine.coordinator.route_input(uuid, sequence, buttons, axis)
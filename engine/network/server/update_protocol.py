@@ -1,34 +1,148 @@
-from engine.client import Engine
+import numpy as np
+
+from engine.controllers.factories import ControllerFactory
+from engine.engine import Engine
+from engine.models import BaseModel
+from engine.network.delta_codec import DeltaSnapshotCodec, DeltaSession
+from engine.network.input_codec import InputCommandCodec, RemoteInput
+from engine.network.server.interest import InterestManager, Focus
 from engine.network.update_protocol import UpdateProtocol
 
 
 class UpdateServerProtocol(UpdateProtocol):
 
+    update_interval = 1 / 20
+    interest_manager_class = InterestManager
+    input_class = RemoteInput
+
     def __init__(self, engine: Engine):
         super().__init__(engine)
         self.addresses = []
-        self.engine.schedule_interval(self.update, interval=1)
+        self.address_codecs = {}
+        self.sessions = {}
+        self.sequence = 0
+        self.interest = self.interest_manager_class(engine)
+        self.inputs = {}
+        self.controlled_models = {}
+        self.controller_factory = ControllerFactory(spawn_projectiles=False)
+        self.engine.schedule_interval(self.update, interval=self.update_interval)
+        self.engine.observe_dead_models(self.forget_model)
 
     def register_address(self, ip, port):
         self.addresses.append((ip, port))
 
     def unregister_address(self, ip, port):
         self.addresses.remove((ip, port))
+        self.address_codecs.pop((ip, port), None)
+        self.sessions.pop((ip, port), None)
+        self.interest.unfocus((ip, port))
+        self.release_input((ip, port))
+
+    def forget_model(self, model: BaseModel):
+        self.model_indices.forget(model.uuid)
+
+    def use_codec_for(self, address, name):
+        codec = self.codecs[name]
+        self.address_codecs[address] = codec
+        if isinstance(codec, DeltaSnapshotCodec):
+            self.sessions[address] = DeltaSession(codec)
+        else:
+            self.sessions.pop(address, None)
+
+    def bind_input(self, address, model: BaseModel) -> RemoteInput:
+        self.release_input(address)
+        remote_input = self.input_class()
+        self.inputs[address] = remote_input
+        self.controlled_models[address] = model.uuid
+        self.engine.set_controller(model.uuid, self.controller_factory.manufacture(model, input_handler=remote_input))
+        return remote_input
+
+    def release_input(self, address):
+        self.inputs.pop(address, None)
+        uuid = self.controlled_models.pop(address, None)
+        if uuid is not None:
+            self.engine.remove_controller(uuid)
 
     def datagramReceived(self, datagram, addr):
-        super(UpdateServerProtocol, self).datagramReceived(datagram, addr)
-        self.broadcast(datagram, ignore=addr)
+        if DeltaSnapshotCodec.is_ack(datagram):
+            session = self.sessions.get(addr)
+            if session is not None:
+                session.acknowledge(DeltaSnapshotCodec.read_ack(datagram))
+        elif InputCommandCodec.accepts(datagram):
+            self.apply_input(addr, *InputCommandCodec.decode(datagram))
 
-    def send(self, data):
-        ser = self.serialize(data)
-        self.broadcast(ser)
+    def apply_input(self, address, sequence, buttons, axis):
+        remote_input = self.inputs.get(address)
+        if remote_input is not None:
+            remote_input.apply(sequence, buttons, axis)
 
-    def broadcast(self, ser: bytes, ignore=None):
+    def send(self, data, ignore=None):
+        for frame in data:
+            self.model_indices.assign(frame['uuid'])
+        encoded = {}
         for address in self.addresses:
             if ignore and ignore == address:
                 continue
-            self.transport.write(ser, address)
+            codec = self.address_codecs.get(address, self.codec)
+            focus = self.interest.get(address)
+            if focus is None:
+                packets = encoded.get(codec.name)
+                if packets is None:
+                    packets = encoded[codec.name] = codec.encode_packets(data)
+            else:
+                visible = {model.uuid for model in focus.models()}
+                frames = [frame for frame in data if frame['uuid'] in visible]
+                if not frames:
+                    continue
+                packets = codec.encode_packets(frames)
+            self.write_packets(packets, address)
+
+    def write_packets(self, packets: list, address):
+        for packet in packets:
+            self.transport.write(packet, address)
+
+    def update(self, _):
+        self.interest.refresh()
+        self.sequence += 1
+        include_far = self.sequence % self.interest.far_interval == 0
+        frames = []
+        for model in self.models_to_update:
+            self.model_indices.assign(model.uuid)
+            frames.append(model.data_dict)
+        records = None
+        encoded = {}
+        for address in self.addresses:
+            focus = self.interest.get(address)
+            session = self.sessions.get(address)
+            if session is not None:
+                if records is None:
+                    records = session.codec.records(frames)
+                view = records if focus is None else self.interest_view(session, records, focus, include_far)
+                packets = session.encode_packets(self.sequence, view, encoded)
+            else:
+                codec = self.address_codecs.get(address, self.codec)
+                if focus is None:
+                    key = (codec.name, None)
+                    visible_frames = frames
+                else:
+                    key = (codec.name, address)
+                    visible = {model.uuid for model in focus.models(include_far)}
+                    visible_frames = [frame for frame in frames if frame['uuid'] in visible]
+                packets = encoded.get(key)
+                if packets is None:
+                    packets = encoded[key] = codec.encode_packets(visible_frames, self.sequence)
+            self.write_packets(packets, address)
+
+    def model_index_array(self, models) -> np.ndarray:
+        index = self.model_indices.index
+        return np.array([index(model.uuid) for model in models], dtype=np.uint32)
 
-    @property
-    def models_to_update(self):
-        return super(UpdateServerProtocol, self).models_to_update()
+    def interest_view(self, session: DeltaSession, records: np.ndarray, focus: Focus, include_far) -> np.ndarray:
+        view = records[np.isin(records['index'], self.model_index_array(focus.models(include_far)))]
+        previous = session.latest_view
+        if include_far or previous is None or not focus.far:
+            return view
+        held = previous[np.isin(previous['index'], self.model_index_array(focus.far))]
+        view = np.concatenate((view, held))
+        view.sort(order="index")
+        return view
@@ -0,0 +1,131 @@
+import pickle
+import struct
+from uuid import UUID
+
+import numpy as np
+
+
+class ModelIndexTable(object):
+
+    def __init__(self):
+        self._indices = {}
+        self._uuids = {}
+        self._next_index = 0
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __contains__(self, uuid: UUID):
+        return uuid in self._indices
+
+    def assign(self, uuid: UUID) -> int:
+        index = self._indices.get(uuid)
+        if index is None:
+            index = self._next_index
+            self._next_index += 1
+            self.register(index, uuid)
+        return index
+
+    def register(self, index: int, uuid: UUID):
+        self._indices[uuid] = index
+        self._uuids[index] = uuid
+        self._next_index = max(self._next_index, index + 1)
+
+    def index(self, uuid: UUID):
+        return self._indices.get(uuid)
+
+    def uuid(self, index: int):
+        return self._uuids.get(index)
+
+    def forget(self, uuid: UUID):
+        index = self._indices.pop(uuid, None)
+        if index is not None:
+            del self._uuids[index]
+
+
+class PickleSnapshotCodec(object):
+
+    name = "pickle"
+
+    def __init__(self, model_indices: ModelIndexTable):
+        self.model_indices = model_indices
+
+    @staticmethod
+    def accepts(data: bytes) -> bool:
+        return data[:1] == b'\x80'
+
+    def encode(self, frames: list, sequence=0) -> bytes:
+        return pickle.dumps(frames, protocol=-1)
+
+    def encode_packets(self, frames: list, sequence=0) -> list:
+        return [self.encode(frames)]
+
+    def decode(self, data: bytes) -> list:
+        return pickle.loads(data)
+
+
+class BinarySnapshotCodec(object):
+
+    name = "binary"
+    magic = b'MS'
+    version = 2
+    header = struct.Struct("<2sBIHHH")
+    max_packet_size = 1200
+    record = np.dtype([("index", "<u4"),
+                       ("position", "<f4", 3), ("rotation", "<f4"),
+                       ("movement", "<f4", 3), ("spin", "<f4"),
+                       ("acceleration", "<f4", 3), ("torque", "<f4")])
+
+    def __init__(self, model_indices: ModelIndexTable):
+        self.model_indices = model_indices
+        self.latest_sequence = 0
+
+    @classmethod
+    def accepts(cls, data: bytes) -> bool:
+        return data[:2] == cls.magic
+
+    def records(self, frames: list) -> np.ndarray:
+        index = self.model_indices.index
+        rows = []
+        for frame in frames:
+            model_index = index(frame['uuid'])
+            if model_index is None:
+                continue
+            rows.append((model_index, frame['position'], frame['rotation'], frame['movement'], frame['spin'],
+                         frame['acceleration'], frame['torque']))
+        return np.array(rows, dtype=self.record)
+
+    def frames(self, records: np.ndarray) -> list:
+        uuid = self.model_indices.uuid
+        frames = []
+        for model_index, position, rotation, movement, spin, acceleration, torque in zip(
+                records['index'].tolist(), records['position'].tolist(), records['rotation'].tolist(),
+                records['movement'].tolist(), records['spin'].tolist(), records['acceleration'].tolist(),
+                records['torque'].tolist()):
+            model_uuid = uuid(model_index)
+            if model_uuid is None:
+                continue
+            frames.append({"uuid": model_uuid, "position": position, "rotation": rotation, "movement": movement,
+                           "spin": spin, "acceleration": acceleration, "torque": torque})
+        return frames
+
+    def encode(self, frames: list, sequence=0) -> bytes:
+        return self._pack(sequence, 0, 1, self.records(frames))
+
+    def encode_packets(self, frames: list, sequence=0) -> list:
+        records = self.records(frames)
+        per_packet = max((self.max_packet_size - self.header.size) // self.record.itemsize, 1)
+        chunks = [records[start:start + per_packet] for start in range(0, len(records), per_packet)] or [records]
+        return [self._pack(sequence, part, len(chunks), chunk) for part, chunk in enumerate(chunks)]
+
+    def _pack(self, sequence, part, parts, records) -> bytes:
+        return self.header.pack(self.magic, self.version, sequence, part, parts, len(records)) + records.tobytes()
+
+    def decode(self, data: bytes) -> list:
+        magic, version, sequence, part, parts, count = self.header.unpack_from(data)
+        assert magic == self.magic and version == self.version
+        if sequence:
+            if sequence < self.latest_sequence:
+                return []
+            self.latest_sequence = sequence
+        return self.frames(np.frombuffer(data, dtype=self.record, count=count, offset=self.header.size))
@@ -0,0 +1,81 @@
+from uuid import UUID
+
+from engine.models import BaseModel, ShipModel, AsteroidModel, PlasmaModel, ShipPartModel
+from engine.models.factories import ShipModelFactory, AsteroidModelFactory, ProjectileModelFactory, \
+    ShipPartModelFactory
+from engine.physics.force import MutableOffsets, MutableDegrees
+
+
+def encode_value(value):
+    if isinstance(value, UUID):
+        return {"__uuid__": value.hex}
+    raise TypeError("{} is not serializable".format(type(value).__name__))
+
+
+def decode_object(d: dict):
+    if len(d) == 1 and "__uuid__" in d:
+        return UUID(hex=d["__uuid__"])
+    return d
+
+
+class SpawnSchema(object):
+
+    kinds = ("ship", "asteroid", "plasma", "part")
+
+    def __init__(self, ship_factory: ShipModelFactory=None, asteroid_factory: AsteroidModelFactory=None):
+        self.ship_factory = ship_factory or ShipModelFactory()
+        self.asteroid_factory = asteroid_factory or AsteroidModelFactory()
+        self._part_factory = None
+        self._projectile_factory = None
+
+    @property
+    def part_factory(self) -> ShipPartModelFactory:
+        if self._part_factory is None:
+            self._part_factory = ShipPartModelFactory()
+        return self._part_factory
+
+    @property
+    def projectile_factory(self) -> ProjectileModelFactory:
+        if self._projectile_factory is None:
+            self._projectile_factory = ProjectileModelFactory()
+        return self._projectile_factory
+
+    @staticmethod
+    def placement(part: ShipPartModel) -> dict:
+        return {"name": part.name, "position": list(part.position), "rotation": list(part.rotation),
+                "axis": part.axis, "button": part.button, "keyboard": part.keyboard}
+
+    def describe(self, model: BaseModel) -> dict:
+        description = model.data_dict
+        if isinstance(model, ShipModel):
+            description['kind'] = "ship"
+            description['parts'] = [self.placement(part) for part in model.parts]
+        elif isinstance(model, AsteroidModel):
+            description['kind'] = "asteroid"
+            description['radii'] = model.radii
+        elif isinstance(model, PlasmaModel):
+            description['kind'] = "plasma"
+        elif isinstance(model, ShipPartModel):
+            description['kind'] = "part"
+            description['name'] = model.name
+        else:
+            raise ValueError("Can't describe {}".format(model))
+        return description
+
+    def build(self, description: dict) -> BaseModel:
+        kind = description['kind']
+        if kind == "ship":
+            model = self.ship_factory.assemble({"name": "ship", "parts": description['parts']})
+        elif kind == "asteroid":
+            model = self.asteroid_factory.manufacture((0, 0, 0), radii=description['radii'])
+        elif kind == "plasma":
+            model = self.projectile_factory.manufacture("plasma", MutableOffsets(0, 0, 0), MutableDegrees(0, 0, 0),
+                                                        MutableOffsets(0, 0, 0), MutableDegrees(0, 0, 0),
+                                                        MutableOffsets(0, 0, 0), MutableDegrees(0, 0, 0))
+        elif kind == "part":
+            model = self.part_factory.manufacture(description['name'], center_of_mass=MutableOffsets(0, 0, 0))
+        else:
+            raise ValueError("Unknown kind of model {}".format(kind))
+        model.uuid = description['uuid']
+        model.set_data(description)
+        return model
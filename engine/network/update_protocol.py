@@ -1,14 +1,33 @@
-import pickle
-
 from twisted.internet.protocol import DatagramProtocol
 
 from engine.engine import Engine
+from engine.network.delta_codec import DeltaSnapshotCodec
+from engine.network.snapshot_codec import ModelIndexTable, BinarySnapshotCodec, PickleSnapshotCodec
 
 
 class UpdateProtocol(DatagramProtocol):
 
+    codec_classes = (DeltaSnapshotCodec, BinarySnapshotCodec, PickleSnapshotCodec)
+    default_codec = PickleSnapshotCodec.name
+
     def __init__(self, engine: Engine):
         self.engine = engine
+        self.model_indices = ModelIndexTable()
+        self.codecs = {codec_class.name: codec_class(self.model_indices) for codec_class in self.codec_classes}
+        self.codec = self.codecs[self.default_codec]
+
+    @property
+    def codec_names(self):
+        return [codec_class.name for codec_class in self.codec_classes]
+
+    def negotiate(self, offered_codecs) -> str:
+        for name in self.codec_names:
+            if name in offered_codecs:
+                return name
+        return self.default_codec
+
+    def use_codec(self, name):
+        self.codec = self.codecs[name]
 
     def update(self, _):
         data = []
@@ -24,13 +43,11 @@ class UpdateProtocol(DatagramProtocol):
         frame = self.deserialize(datagram)
         self.engine.update_model(frame)
 
-    @staticmethod
-    def serialize(d: dict):
-        ser = pickle.dumps(d, protocol=-1)
-        return ser
-
-    @staticmethod
-    def deserialize(m: bytes):
-        return pickle.loads(m)
-
+    def serialize(self, frames: list) -> bytes:
+        return self.codec.encode(frames)
 
+    def deserialize(self, m: bytes) -> list:
+        for codec in self.codecs.values():
+            if codec.accepts(m):
+                return codec.decode(m)
+        return []
@@ -0,0 +1,285 @@
+from typing import List, Set, Tuple
+
+from engine.models import BaseModel
+
+null_node = -1
+
+
+def union(a, b):
+    return min(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3])
+
+
+def overlaps(a, b):
+    return a[0] <= b[1] and b[0] <= a[1] and a[2] <= b[3] and b[2] <= a[3]
+
+
+def contains(outer, inner):
+    return outer[0] <= inner[0] and inner[1] <= outer[1] and outer[2] <= inner[2] and inner[3] <= outer[3]
+
+
+class AABBTree(object):
+
+    def __init__(self, margin=2.0, displacement_multiplier=4.0):
+        self.margin = margin
+        self.displacement_multiplier = displacement_multiplier
+        self._aabb = []
+        self._parent = []
+        self._child1 = []
+        self._child2 = []
+        self._height = []
+        self._models = []
+        self._free_nodes = []
+        self._root = null_node
+        self._leaf_by_model = {}
+        self._tight_aabb = {}
+
+    def __len__(self):
+        return len(self._leaf_by_model)
+
+    @property
+    def height(self):
+        if self._root == null_node:
+            return 0
+        return self._height[self._root]
+
+    def init_model_into_2d_space_index(self, model: BaseModel):
+        if model in self._leaf_by_model:
+            self.reindex_spacial_position(model)
+            return
+        tight = self._model_aabb(model)
+        leaf = self._allocate_node()
+        self._aabb[leaf] = self._fatten(tight)
+        self._models[leaf] = model
+        self._leaf_by_model[model] = leaf
+        self._tight_aabb[leaf] = tight
+        self._insert_leaf(leaf)
+
+    def clear_model_from_2d_space_index(self, model: BaseModel):
+        try:
+            leaf = self._leaf_by_model.pop(model)
+        except KeyError:
+            return
+        self._remove_leaf(leaf)
+        del self._tight_aabb[leaf]
+        self._free_node(leaf)
+
+    def reindex_spacial_position(self, model: BaseModel):
+        try:
+            leaf = self._leaf_by_model[model]
+        except KeyError:
+            return
+        tight = self._model_aabb(model)
+        previous = self._tight_aabb[leaf]
+        self._tight_aabb[leaf] = tight
+        if contains(self._aabb[leaf], tight):
+            return
+        self._remove_leaf(leaf)
+        dx = (tight[0] + tight[1] - previous[0] - previous[1]) / 2
+        dy = (tight[2] + tight[3] - previous[2] - previous[3]) / 2
+        self._aabb[leaf] = self._fatten(tight, dx, dy)
+        self._insert_leaf(leaf)
+
+    def other_models(self, model: BaseModel) -> set:
+        leaf = self._leaf_by_model[model]
+        return {self._models[other] for other in self.query(self._tight_aabb[leaf]) if other != leaf}
+
+    def all_models(self, aabb) -> set:
+        return {self._models[leaf] for leaf in self.query(aabb)}
+
+    def all_pairs_deduplicated(self, models) -> Set[Tuple[BaseModel, BaseModel]]:
+        leaves = set()
+        for model in models:
+            if model in self._leaf_by_model:
+                self.reindex_spacial_position(model)
+                leaves.add(self._leaf_by_model[model])
+        pairs = set()
+        for leaf in leaves:
+            model = self._models[leaf]
+            for other in self.query(self._tight_aabb[leaf]):
+                if other == leaf or (other in leaves and other < leaf):
+                    continue
+                pairs.add((model, self._models[other]))
+        return pairs
+
+    def query(self, aabb) -> List[int]:
+        found = []
+        if self._root == null_node:
+            return found
+        left, right, bottom, top = aabb
+        node_aabb = self._aabb
+        child1 = self._child1
+        child2 = self._child2
+        tight_aabb = self._tight_aabb
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            l, r, b, t = node_aabb[node]
+            if l > right or r < left or b > top or t < bottom:
+                continue
+            if child1[node] == null_node:
+                l, r, b, t = tight_aabb[node]
+                if l <= right and left <= r and b <= top and bottom <= t:
+                    found.append(node)
+            else:
+                stack.append(child1[node])
+                stack.append(child2[node])
+        return found
+
+    @staticmethod
+    def _model_aabb(model: BaseModel):
+        bbox = model.bounding_box
+        return bbox.moving_left, bbox.moving_right, bbox.moving_bottom, bbox.moving_top
+
+    def _fatten(self, aabb, dx=0, dy=0):
+        left, right, bottom, top = aabb
+        left, right, bottom, top = left - self.margin, right + self.margin, bottom - self.margin, top + self.margin
+        dx *= self.displacement_multiplier
+        dy *= self.displacement_multiplier
+        if dx < 0:
+            left += dx
+        else:
+            right += dx
+        if dy < 0:
+            bottom += dy
+        else:
+            top += dy
+        return left, right, bottom, top
+
+    def _allocate_node(self) -> int:
+        if self._free_nodes:
+            node = self._free_nodes.pop()
+            self._parent[node] = self._child1[node] = self._child2[node] = null_node
+            self._height[node] = 0
+            return node
+        self._aabb.append(None)
+        self._parent.append(null_node)
+        self._child1.append(null_node)
+        self._child2.append(null_node)
+        self._height.append(0)
+        self._models.append(None)
+        return len(self._aabb) - 1
+
+    def _free_node(self, node):
+        self._models[node] = None
+        self._aabb[node] = None
+        self._free_nodes.append(node)
+
+    def _insert_leaf(self, leaf):
+        if self._root == null_node:
+            self._root = leaf
+            self._parent[leaf] = null_node
+            return
+        leaf_aabb = self._aabb[leaf]
+        left, right, bottom, top = leaf_aabb
+        node_aabb = self._aabb
+        child1 = self._child1
+        child2 = self._child2
+        index = self._root
+        while child1[index] != null_node:
+            l, r, b, t = node_aabb[index]
+            combined = ((r if r > right else right) - (l if l < left else left)
+                        + (t if t > top else top) - (b if b < bottom else bottom))
+            cost = 2 * combined
+            inheritance_cost = 2 * (combined - (r - l + t - b))
+            child_costs = []
+            for child in (child1[index], child2[index]):
+                l, r, b, t = node_aabb[child]
+                enlarged = ((r if r > right else right) - (l if l < left else left)
+                            + (t if t > top else top) - (b if b < bottom else bottom))
+                if child1[child] != null_node:
+                    enlarged -= r - l + t - b
+                child_costs.append(enlarged + inheritance_cost)
+            cost1, cost2 = child_costs
+            if cost < cost1 and cost < cost2:
+                break
+            index = child1[index] if cost1 < cost2 else child2[index]
+
+        sibling = index
+        old_parent = self._parent[sibling]
+        new_parent = self._allocate_node()
+        self._parent[new_parent] = old_parent
+        self._aabb[new_parent] = union(leaf_aabb, self._aabb[sibling])
+        self._height[new_parent] = self._height[sibling] + 1
+        if old_parent == null_node:
+            self._root = new_parent
+        elif self._child1[old_parent] == sibling:
+            self._child1[old_parent] = new_parent
+        else:
+            self._child2[old_parent] = new_parent
+        self._child1[new_parent] = sibling
+        self._child2[new_parent] = leaf
+        self._parent[sibling] = new_parent
+        self._parent[leaf] = new_parent
+        self._refit_upwards(self._parent[leaf])
+
+    def _remove_leaf(self, leaf):
+        if leaf == self._root:
+            self._root = null_node
+            return
+        parent = self._parent[leaf]
+        grand_parent = self._parent[parent]
+        sibling = self._child2[parent] if self._child1[parent] == leaf else self._child1[parent]
+        if grand_parent == null_node:
+            self._root = sibling
+            self._parent[sibling] = null_node
+            self._free_node(parent)
+            return
+        if self._child1[grand_parent] == parent:
+            self._child1[grand_parent] = sibling
+        else:
+            self._child2[grand_parent] = sibling
+        self._parent[sibling] = grand_parent
+        self._free_node(parent)
+        self._refit_upwards(grand_parent)
+
+    def _refit_upwards(self, index):
+        while index != null_node:
+            index = self._balance(index)
+            child1 = self._child1[index]
+            child2 = self._child2[index]
+            height1 = self._height[child1]
+            height2 = self._height[child2]
+            self._height[index] = 1 + (height1 if height1 > height2 else height2)
+            l1, r1, b1, t1 = self._aabb[child1]
+            l2, r2, b2, t2 = self._aabb[child2]
+            self._aabb[index] = (l1 if l1 < l2 else l2, r1 if r1 > r2 else r2,
+                                 b1 if b1 < b2 else b2, t1 if t1 > t2 else t2)
+            index = self._parent[index]
+
+    def _balance(self, a):
+        if self._child1[a] == null_node or self._height[a] < 2:
+            return a
+        b = self._child1[a]
+        c = self._child2[a]
+        balance = self._height[c] - self._height[b]
+        if balance > 1:
+            return self._rotate_up(a, c, b)
+        if balance < -1:
+            return self._rotate_up(a, b, c)
+        return a
+
+    def _rotate_up(self, a, riser, stayer):
+        f = self._child1[riser]
+        g = self._child2[riser]
+        taller, shorter = (f, g) if self._height[f] > self._height[g] else (g, f)
+        if self._child1[a] == riser:
+            self._child1[a] = shorter
+        else:
+            self._child2[a] = shorter
+        self._child1[riser] = a
+        self._parent[riser] = self._parent[a]
+        self._parent[a] = riser
+        grand_parent = self._parent[riser]
+        if grand_parent == null_node:
+            self._root = riser
+        elif self._child1[grand_parent] == a:
+            self._child1[grand_parent] = riser
+        else:
+            self._child2[grand_parent] = riser
+        self._child2[riser] = taller
+        self._parent[shorter] = a
+        self._aabb[a] = union(self._aabb[stayer], self._aabb[shorter])
+        self._aabb[riser] = union(self._aabb[a], self._aabb[taller])
+        self._height[a] = 1 + max(self._height[stayer], self._height[shorter])
+        self._height[riser] = 1 + max(self._height[a], self._height[taller])
+        return riser
@@ -0,0 +1,125 @@
+from typing import Iterable, Set, Tuple
+
+import numpy as np
+
+from engine.models import BaseModel
+
+
+class SweepAndPrune(object):
+
+    def __init__(self, capacity=256):
+        self._left = np.zeros(capacity, dtype=np.float64)
+        self._right = np.zeros(capacity, dtype=np.float64)
+        self._bottom = np.zeros(capacity, dtype=np.float64)
+        self._top = np.zeros(capacity, dtype=np.float64)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._checked = np.zeros(capacity, dtype=bool)
+        self._models = [None] * capacity
+        self._slot_by_model = {}
+        self._free_slots = list(reversed(range(capacity)))
+        self._dirty = set()
+
+    @property
+    def capacity(self):
+        return len(self._models)
+
+    def slot_of(self, model: BaseModel) -> int:
+        return self._slot_by_model[model]
+
+    def model_at(self, slot: int) -> BaseModel:
+        return self._models[slot]
+
+    def init_model_into_2d_space_index(self, model: BaseModel):
+        if model in self._slot_by_model:
+            self.reindex_spacial_position(model)
+            return
+        if not self._free_slots:
+            self._grow()
+        slot = self._free_slots.pop()
+        self._slot_by_model[model] = slot
+        self._models[slot] = model
+        self._active[slot] = True
+        self._write_aabb(slot, model)
+
+    def clear_model_from_2d_space_index(self, model: BaseModel):
+        try:
+            slot = self._slot_by_model.pop(model)
+        except KeyError:
+            return
+        self._models[slot] = None
+        self._active[slot] = False
+        self._free_slots.append(slot)
+        self._dirty.discard(model)
+
+    def reindex_spacial_position(self, model: BaseModel):
+        if model in self._slot_by_model:
+            self._dirty.add(model)
+
+    def other_models(self, model: BaseModel) -> set:
+        self._refresh_dirty()
+        slot = self._slot_by_model[model]
+        overlapping = self._active & \
+            (self._left <= self._right[slot]) & (self._right >= self._left[slot]) & \
+            (self._bottom <= self._top[slot]) & (self._top >= self._bottom[slot])
+        overlapping[slot] = False
+        return {self._models[i] for i in np.flatnonzero(overlapping)}
+
+    def candidate_pairs(self, models: Iterable[BaseModel] = None) -> np.ndarray:
+        self._refresh_dirty()
+        if models is not None:
+            self._mark_checked(models)
+        slots = np.flatnonzero(self._active)
+        order = slots[np.argsort(self._left[slots], kind='stable')]
+        sorted_left = self._left[order]
+        ends = np.searchsorted(sorted_left, self._right[order], side='right')
+        starts = np.arange(1, len(order) + 1)
+        counts = np.maximum(ends - starts, 0)
+        n_pairs = int(counts.sum())
+        if n_pairs == 0:
+            return np.empty((0, 2), dtype=np.intp)
+        firsts = np.repeat(np.arange(len(order)), counts)
+        offsets = np.arange(n_pairs) - np.repeat(np.cumsum(counts) - counts, counts)
+        seconds = np.repeat(starts, counts) + offsets
+        a = order[firsts]
+        b = order[seconds]
+        keep = (self._bottom[a] <= self._top[b]) & (self._bottom[b] <= self._top[a])
+        if models is not None:
+            keep &= self._checked[a] | self._checked[b]
+        return np.stack((a[keep], b[keep]), axis=1)
+
+    def all_pairs_deduplicated(self, models) -> Set[Tuple[BaseModel, BaseModel]]:
+        pairs = self.candidate_pairs(models)
+        return {(self._models[a], self._models[b]) for a, b in pairs.tolist()}
+
+    def _mark_checked(self, models):
+        self._checked[:] = False
+        for model in models:
+            try:
+                slot = self._slot_by_model[model]
+            except KeyError:
+                continue
+            self._write_aabb(slot, model)
+            self._checked[slot] = True
+
+    def _refresh_dirty(self):
+        for model in self._dirty:
+            self._write_aabb(self._slot_by_model[model], model)
+        self._dirty.clear()
+
+    def _write_aabb(self, slot, model: BaseModel):
+        bbox = model.bounding_box
+        self._left[slot] = bbox.moving_left
+        self._right[slot] = bbox.moving_right
+        self._bottom[slot] = bbox.moving_bottom
+        self._top[slot] = bbox.moving_top
+
+    def _grow(self):
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+        for name in ('_left', '_right', '_bottom', '_top', '_active', '_checked'):
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+        self._models.extend([None] * old_capacity)
+        self._free_slots.extend(reversed(range(old_capacity, new_capacity)))
@@ -5,13 +5,24 @@ from math import sqrt, atan2, cos, sin, degrees, radians
 from engine.models.observable import Observable
 
 
+def add_degrees(a, b):
+    return (((a % 360) + (b % 360) + 180) % 360) - 180
+
+
 class Vector(object):
+    __slots__ = ("x", "y", "z")
 
     def __init__(self, x, y, z):
         self.x = x
         self.y = y
         self.z = z
-        self.distance = sqrt(sqrt(self.x ** 2 + self.y ** 2) ** 2 + self.z ** 2)
+
+    @property
+    def distance(self):
+        return sqrt(sqrt(self.x ** 2 + self.y ** 2) ** 2 + self.z ** 2)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
 
     def __add__(self, other):
         return self.__class__(*[x + y for x, y in zip(self, other)])
@@ -47,6 +58,9 @@ class Vector(object):
     def __copy__(self):
         return self.__class__(*self)
 
+    def __reduce__(self):
+        return self.__class__, tuple(self)
+
     def __neg__(self):
         return self.__class__(*[-x for x in self])
 
@@ -56,6 +70,7 @@ class Vector(object):
 
 
 class MutableVector(Vector, Observable):
+    __slots__ = ("_x", "_y", "_z", "_observers")
 
     def __init__(self, x, y, z):
         self._x = x
@@ -79,6 +94,10 @@ class MutableVector(Vector, Observable):
     def update(self):
         self._callback("move")
 
+    def iadd_scaled(self, other, scale):
+        x, y, z = other
+        return self.set(self._x + x * scale, self._y + y * scale, self._z + z * scale)
+
     def __iadd__(self, other):
         self.set(*[x + y for x, y in zip(self, other)])
         return self
@@ -91,10 +110,6 @@ class MutableVector(Vector, Observable):
         self.set(*[x + other for x in self])
         return self
 
-    @property
-    def distance(self):
-        return sqrt(sqrt(self.x ** 2 + self.y ** 2) ** 2 + self.z ** 2)
-
     @property
     def x(self):
         return self._x
@@ -109,6 +124,7 @@ class MutableVector(Vector, Observable):
 
 
 class Degrees(Vector):
+    __slots__ = ()
 
     def __sub__(self, other: Vector):
         return self.__class__(*[(((s % 360) - (o % 360) + 180) % 360) - 180 for s, o in zip(self, other)])
@@ -146,12 +162,19 @@ class Degrees(Vector):
 
 
 class MutableUnboundDegrees(MutableVector, Degrees):
+    __slots__ = ()
 
     def translate(self, *xyz):
         self.__iadd__(*xyz)
 
 
 class MutableDegrees(MutableUnboundDegrees):
+    __slots__ = ()
+
+    def iadd_scaled(self, other, scale):
+        x, y, z = other
+        return self.set(add_degrees(self._x, x * scale), add_degrees(self._y, y * scale),
+                        add_degrees(self._z, z * scale))
 
     def __isub__(self, other: Vector):
         self.set(*[(((s % 360) - (o % 360) + 180) % 360) - 180 for s, o in zip(self, other)])
@@ -164,10 +187,11 @@ class MutableDegrees(MutableUnboundDegrees):
 
 
 class Offsets(Vector):
+    __slots__ = ()
 
-    def __init__(self, x, y, z):
-        super().__init__(x, y, z)
-        self.direction = Degrees(0, degrees(atan2(-self.x, -self.z)), 0)
+    @property
+    def direction(self):
+        return Degrees(0, degrees(atan2(-self.x, -self.z)), 0)
 
     def rotated(self, theta) -> "Offsets":
         theta = radians(theta)
@@ -175,12 +199,16 @@ class Offsets(Vector):
         z = self.x * sin(theta) + self.z * cos(theta)
         return self.__class__(x, self.y, z)
 
+    def rotate_into(self, target: "MutableVector", theta):
+        theta = radians(theta)
+        cos_val = cos(theta)
+        sin_val = sin(theta)
+        x, y, z = self
+        return target.set(x * cos_val - z * sin_val, y, x * sin_val + z * cos_val)
 
-class MutableOffsets(MutableVector, Offsets):
 
-    def __init__(self, x, y, z):
-        super().__init__(x, y, z)
-        self.direction = MutableDegrees(0, degrees(atan2(-self.x, -self.z)), 0)
+class MutableOffsets(MutableVector, Offsets):
+    __slots__ = ()
 
     def rotate(self, theta):
         if theta == 0:
@@ -193,19 +221,27 @@ class MutableOffsets(MutableVector, Offsets):
     def translate(self, *xyz):
         self.__iadd__(*xyz)
 
-    def update(self):
-        self.direction.set(self.direction.x, degrees(atan2(-self._x, -self._z)), self.direction.z)
-        super().update()
-
 
 class Force(object):
+    __slots__ = ("position", "forces", "_force_multiplier")
 
     def __init__(self, position: Offsets, forces: Offsets):
         self.position = position
         self.forces = forces
-        self.yaw_momentum = cos(self.radians_force_is_lateral_to_position())
         self._force_multiplier = 1.0
 
+    @property
+    def yaw_momentum(self):
+        return cos(self.radians_force_is_lateral_to_position())
+
+    @property
+    def force_multiplier(self):
+        return self._force_multiplier
+
+    @force_multiplier.setter
+    def force_multiplier(self, value):
+        self._force_multiplier = value
+
     def __add__(self, other) -> "Force":
         return self.__class__(self.position + other.position, self.forces + other.forces)
 
@@ -246,6 +282,7 @@ class Force(object):
 
 
 class MutableForce(Force):
+    __slots__ = ()
 
     def __init__(self, position: MutableOffsets, forces: MutableOffsets):
         super().__init__(position, forces)
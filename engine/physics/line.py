@@ -29,6 +29,8 @@ class Point(object):
 
 
 class BaseLine(Observable):
+    __slots__ = ("original_x1", "original_y1", "original_x2", "original_y2", "x1", "y1", "x2", "y2",
+                 "x", "y", "rotation", "length", "right", "left", "top", "bottom", "_observers")
 
     def __init__(self, coords: List[Tuple[float, float]]):
         Observable.__init__(self)
@@ -133,6 +135,7 @@ class BaseLine(Observable):
 
 
 class Line(BaseLine):
+    __slots__ = ()
 
     precision = 9
 
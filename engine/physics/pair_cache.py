@@ -0,0 +1,108 @@
+from collections import defaultdict
+from math import hypot, radians
+
+from engine.models import BaseModel
+from engine.physics.separating_axis import hull_separation
+
+
+def max_travel(radius, pose, other_pose) -> float:
+    x, y, yaw = pose
+    other_x, other_y, other_yaw = other_pose
+    turn = abs((other_yaw - yaw + 180) % 360 - 180)
+    return hypot(other_x - x, other_y - y) + radius * radians(turn)
+
+
+class SeparatedSide(object):
+
+    def __init__(self, model: BaseModel):
+        self.bounding_box = model.bounding_box
+        self.local_hull = self.bounding_box.local_hull
+        self.pose = self.bounding_box.swept_hull.pose
+
+    def travel(self, model: BaseModel):
+        bounding_box = model.bounding_box
+        if bounding_box is not self.bounding_box or bounding_box.local_hull is not self.local_hull:
+            return None
+        swept_hull = bounding_box.swept_hull
+        radius = self.local_hull.radius
+        return max(max_travel(radius, self.pose, swept_hull.pose),
+                   max_travel(radius, self.pose, swept_hull.previous_pose))
+
+
+class SeparatedPair(object):
+
+    def __init__(self, m1: BaseModel, m2: BaseModel, margin):
+        self.margin = margin
+        self.side1 = SeparatedSide(m1)
+        self.side2 = SeparatedSide(m2)
+
+    def still_separated(self, m1: BaseModel, m2: BaseModel):
+        travel1 = self.side1.travel(m1)
+        if travel1 is None or travel1 >= self.margin:
+            return False
+        travel2 = self.side2.travel(m2)
+        return travel2 is not None and travel1 + travel2 < self.margin
+
+
+class CollisionPairCache(object):
+
+    def __init__(self):
+        self._entries = {}
+        self._keys_by_model = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(m1: BaseModel, m2: BaseModel):
+        return (m1, m2) if id(m1) < id(m2) else (m2, m1)
+
+    def is_separated(self, m1: BaseModel, m2: BaseModel):
+        key = self._key(m1, m2)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.still_separated(*key):
+                self.hits += 1
+                return True
+            self._forget(key)
+        self.misses += 1
+        return False
+
+    def record_separation(self, m1: BaseModel, m2: BaseModel):
+        key = self._key(m1, m2)
+        bbox1 = key[0].bounding_box
+        bbox2 = key[1].bounding_box
+        margin = hull_separation(bbox1.local_hull, bbox1.swept_hull.pose, bbox2.local_hull, bbox2.swept_hull.pose)
+        if margin <= 0:
+            return
+        self._entries[key] = SeparatedPair(*key, margin)
+        self._keys_by_model[key[0]].add(key)
+        self._keys_by_model[key[1]].add(key)
+
+    def evict(self, model: BaseModel):
+        for key in self._keys_by_model.pop(model, ()):
+            self._entries.pop(key, None)
+            other = key[1] if key[0] is model else key[0]
+            other_keys = self._keys_by_model.get(other)
+            if other_keys is not None:
+                other_keys.discard(key)
+                if not other_keys:
+                    del self._keys_by_model[other]
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_model.clear()
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+
+    def _forget(self, key):
+        del self._entries[key]
+        for model in key:
+            model_keys = self._keys_by_model[model]
+            model_keys.discard(key)
+            if not model_keys:
+                del self._keys_by_model[model]
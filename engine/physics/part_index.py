@@ -0,0 +1,187 @@
+from collections import defaultdict
+from math import floor, ceil, hypot
+from typing import FrozenSet, List, Optional, Tuple
+
+from engine.models.ship_part import ShipPartModel
+from engine.physics.polygon import Polygon
+
+
+def polygon_key(polygon: Polygon) -> tuple:
+    return tuple((line.x1, line.y1, line.x2, line.y2) for line in polygon.lines)
+
+
+def polygon_bounds(polygon: Polygon) -> tuple:
+    return key_bounds(polygon_key(polygon))
+
+
+def key_bounds(key: tuple) -> tuple:
+    xs = [x for x1, _, x2, _ in key for x in (x1, x2)]
+    ys = [y for _, y1, _, y2 in key for y in (y1, y2)]
+    return min(xs), max(xs), min(ys), max(ys)
+
+
+def overlaps(bounds, other_bounds) -> bool:
+    left, right, bottom, top = bounds
+    other_left, other_right, other_bottom, other_top = other_bounds
+    return left <= other_right and other_left <= right and bottom <= other_top and other_bottom <= top
+
+
+class PartIndex(object):
+
+    def __init__(self, cell_size=1.7):
+        self.cell_size = cell_size
+        self._cells = defaultdict(set)
+        self._cell_by_part = {}
+        self._position_by_part = {}
+        self._bounds_by_part = {}
+        self._validations = {}
+        self._validations_by_part = defaultdict(set)
+        self._validations_by_cell = defaultdict(set)
+        self._max_radius = 0.
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._cell_by_part)
+
+    def __contains__(self, part):
+        return part in self._cell_by_part
+
+    def _cell(self, x, z):
+        return floor(x / self.cell_size), floor(z / self.cell_size)
+
+    @staticmethod
+    def _bounds(part: ShipPartModel):
+        radius = part.bounding_box.local_hull.radius
+        return part.x - radius, part.x + radius, part.z - radius, part.z + radius
+
+    def add(self, part: ShipPartModel):
+        if part in self._cell_by_part:
+            return self.move(part)
+        cell = self._cell(part.x, part.z)
+        self._cells[cell].add(part)
+        self._cell_by_part[part] = cell
+        self._position_by_part[part] = (part.x, part.z)
+        self._bounds_by_part[part] = bounds = self._bounds(part)
+        self._max_radius = max(self._max_radius, (bounds[1] - bounds[0]) / 2)
+        self._invalidate_overlapping(bounds)
+
+    def remove(self, part: ShipPartModel):
+        cell = self._cell_by_part.pop(part, None)
+        if cell is None:
+            return
+        self._cells[cell].discard(part)
+        if not self._cells[cell]:
+            del self._cells[cell]
+        del self._position_by_part[part]
+        self._invalidate_part(part, self._bounds_by_part.pop(part))
+
+    def move(self, part: ShipPartModel):
+        if part not in self._cell_by_part:
+            return self.add(part)
+        if self._position_by_part[part] == (part.x, part.z):
+            return
+        old_cell = self._cell_by_part[part]
+        cell = self._cell(part.x, part.z)
+        if cell != old_cell:
+            self._cells[old_cell].discard(part)
+            if not self._cells[old_cell]:
+                del self._cells[old_cell]
+            self._cells[cell].add(part)
+            self._cell_by_part[part] = cell
+        self._position_by_part[part] = (part.x, part.z)
+        old_bounds = self._bounds_by_part[part]
+        self._bounds_by_part[part] = self._bounds(part)
+        self._invalidate_part(part, old_bounds, self._bounds_by_part[part])
+
+    def invalidate(self, part: ShipPartModel):
+        bounds = self._bounds_by_part.get(part)
+        if bounds is not None:
+            self._invalidate_part(part, bounds)
+
+    def neighbours(self, part: ShipPartModel, reach: float) -> List[ShipPartModel]:
+        cx, cz = self._cell(part.x, part.z)
+        n_cells = ceil(reach / self.cell_size)
+        neighbours = []
+        for ix in range(cx - n_cells, cx + n_cells + 1):
+            for iz in range(cz - n_cells, cz + n_cells + 1):
+                for other in self._cells.get((ix, iz), ()):
+                    if other is not part and hypot(other.x - part.x, other.z - part.z) <= reach:
+                        neighbours.append(other)
+        return neighbours
+
+    def overlapping(self, bounds) -> List[ShipPartModel]:
+        left, right, bottom, top = bounds
+        min_x, min_z = self._cell(left - self._max_radius, bottom - self._max_radius)
+        max_x, max_z = self._cell(right + self._max_radius, top + self._max_radius)
+        parts = []
+        for ix in range(min_x, max_x + 1):
+            for iz in range(min_z, max_z + 1):
+                for part in self._cells.get((ix, iz), ()):
+                    if overlaps(self._bounds_by_part[part], bounds):
+                        parts.append(part)
+        return parts
+
+    def pairs(self, parts) -> List[Tuple[ShipPartModel, ShipPartModel]]:
+        pairs = {}
+        for part in parts:
+            for other in self.neighbours(part, part.connection_reach):
+                pairs.setdefault(frozenset((part, other)), (part, other))
+        return list(pairs.values())
+
+    def validation(self, parts: FrozenSet[ShipPartModel], polygon: Polygon) -> Optional[bool]:
+        entry = self._validations.get((parts, polygon_key(polygon)))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def store_validation(self, parts: FrozenSet[ShipPartModel], polygon: Polygon, valid: bool):
+        key = polygon_key(polygon)
+        if not key:
+            return
+        validation_key = (parts, key)
+        bounds = key_bounds(key)
+        self._validations[validation_key] = (valid, bounds)
+        for part in parts:
+            self._validations_by_part[part].add(validation_key)
+        for cell in self._covered_cells(bounds):
+            self._validations_by_cell[cell].add(validation_key)
+
+    def _covered_cells(self, bounds):
+        left, right, bottom, top = bounds
+        min_x, min_z = self._cell(left, bottom)
+        max_x, max_z = self._cell(right, top)
+        return [(ix, iz) for ix in range(min_x, max_x + 1) for iz in range(min_z, max_z + 1)]
+
+    def _overlapping_validations(self, bounds) -> set:
+        keys = set()
+        for cell in self._covered_cells(bounds):
+            for key in self._validations_by_cell.get(cell, ()):
+                if overlaps(self._validations[key][1], bounds):
+                    keys.add(key)
+        return keys
+
+    def _evict(self, keys):
+        for key in keys:
+            _, bounds = self._validations.pop(key)
+            for part in key[0]:
+                part_keys = self._validations_by_part[part]
+                part_keys.discard(key)
+                if not part_keys:
+                    del self._validations_by_part[part]
+            for cell in self._covered_cells(bounds):
+                cell_keys = self._validations_by_cell[cell]
+                cell_keys.discard(key)
+                if not cell_keys:
+                    del self._validations_by_cell[cell]
+
+    def _invalidate_part(self, part, *bounds):
+        keys = set(self._validations_by_part.get(part, ()))
+        for b in bounds:
+            keys |= self._overlapping_validations(b)
+        self._evict(keys)
+
+    def _invalidate_overlapping(self, bounds):
+        self._evict(self._overlapping_validations(bounds))
@@ -0,0 +1,114 @@
+from math import radians, cos, sin
+from typing import List, Tuple
+
+from engine.physics.separating_axis import swept_hulls_intersect
+from engine.physics.swept_hull import LocalHull, SweptHull
+
+
+def pose_bounds(bounds, pose):
+    left, right, bottom, top = bounds
+    x, y, yaw_degrees = pose
+    theta = radians(yaw_degrees)
+    cos_val = cos(theta)
+    sin_val = sin(theta)
+    xs = [px * cos_val - py * sin_val + x for px, py in ((left, bottom), (left, top), (right, bottom), (right, top))]
+    ys = [px * sin_val + py * cos_val + y for px, py in ((left, bottom), (left, top), (right, bottom), (right, top))]
+    return min(xs), max(xs), min(ys), max(ys)
+
+
+class PartTree(object):
+
+    def __init__(self, parts: list, local_hulls: List[LocalHull]):
+        self.parts = parts
+        self._leaf_hulls = [SweptHull(local_hull) for local_hull in local_hulls]
+        self._bounds = []
+        self._children = []
+        self._leaf_index = []
+        self._poses = None
+        self._world_bounds = {}
+        leaf_bounds = [self._hull_bounds(local_hull) for local_hull in local_hulls]
+        if parts:
+            self._build(list(range(len(parts))), leaf_bounds)
+
+    def __len__(self):
+        return len(self.parts)
+
+    @staticmethod
+    def _hull_bounds(local_hull: LocalHull):
+        left, bottom = local_hull.points.min(axis=0).tolist()
+        right, top = local_hull.points.max(axis=0).tolist()
+        return left, right, bottom, top
+
+    def _build(self, indices, leaf_bounds) -> int:
+        node = len(self._bounds)
+        self._bounds.append((min(leaf_bounds[i][0] for i in indices), max(leaf_bounds[i][1] for i in indices),
+                             min(leaf_bounds[i][2] for i in indices), max(leaf_bounds[i][3] for i in indices)))
+        self._children.append(None)
+        if len(indices) == 1:
+            self._leaf_index.append(indices[0])
+            return node
+        self._leaf_index.append(None)
+        left, right, bottom, top = self._bounds[node]
+        if right - left > top - bottom:
+            indices.sort(key=lambda i: leaf_bounds[i][0] + leaf_bounds[i][1])
+        else:
+            indices.sort(key=lambda i: leaf_bounds[i][2] + leaf_bounds[i][3])
+        half = len(indices) // 2
+        first = self._build(indices[:half], leaf_bounds)
+        second = self._build(indices[half:], leaf_bounds)
+        self._children[node] = (first, second)
+        return node
+
+    def move(self, swept_hull: SweptHull):
+        poses = (swept_hull.previous_pose, swept_hull.pose)
+        if poses != self._poses:
+            self._poses = poses
+            self._world_bounds = {}
+
+    def world_bounds(self, node):
+        try:
+            return self._world_bounds[node]
+        except KeyError:
+            pass
+        previous_pose, pose = self._poses
+        left, right, bottom, top = pose_bounds(self._bounds[node], pose)
+        if previous_pose != pose:
+            p_left, p_right, p_bottom, p_top = pose_bounds(self._bounds[node], previous_pose)
+            left, right, bottom, top = min(left, p_left), max(right, p_right), min(bottom, p_bottom), max(top, p_top)
+        self._world_bounds[node] = left, right, bottom, top
+        return left, right, bottom, top
+
+    def leaf_hull(self, leaf) -> SweptHull:
+        hull = self._leaf_hulls[leaf]
+        previous_pose, pose = self._poses
+        if hull.pose != pose or hull.previous_pose != previous_pose:
+            hull.set_poses(previous_pose, pose)
+        return hull
+
+    def intersecting_parts(self, other: "PartTree") -> List[Tuple[object, object]]:
+        found = []
+        if not self.parts or not other.parts:
+            return found
+        stack = [(0, 0)]
+        while stack:
+            node, other_node = stack.pop()
+            left, right, bottom, top = self.world_bounds(node)
+            o_left, o_right, o_bottom, o_top = other.world_bounds(other_node)
+            if left > o_right or o_left > right or bottom > o_top or o_bottom > top:
+                continue
+            children = self._children[node]
+            other_children = other._children[other_node]
+            if children is None and other_children is None:
+                leaf = self._leaf_index[node]
+                other_leaf = other._leaf_index[other_node]
+                if swept_hulls_intersect(self.leaf_hull(leaf), other.leaf_hull(other_leaf)):
+                    found.append((self.parts[leaf], other.parts[other_leaf]))
+            elif other_children is None or (children is not None and
+                                            (right - left) * (top - bottom) >
+                                            (o_right - o_left) * (o_top - o_bottom)):
+                stack.append((children[0], other_node))
+                stack.append((children[1], other_node))
+            else:
+                stack.append((node, other_children[0]))
+                stack.append((node, other_children[1]))
+        return found
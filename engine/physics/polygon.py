@@ -1,11 +1,27 @@
-from functools import reduce
+from functools import reduce, lru_cache
 from itertools import product, chain, zip_longest, compress, filterfalse
-from math import radians, atan2, degrees, floor, ceil, hypot, pi, sin
+from math import radians, atan2, degrees, floor, ceil, pi, sin
 from typing import List, Iterator, Set, Tuple
 from uuid import uuid4
 
+import numpy as np
+
 from engine.models.observable import Observable
 from engine.physics.line import Line
+from engine.physics.part_tree import PartTree
+from engine.physics.segments import pack_lines, first_intersection
+from engine.physics.separating_axis import swept_hulls_intersect
+from engine.physics.swept_hull import LocalHull, SweptHull
+
+
+@lru_cache(maxsize=4096)
+def cached_convex_hull(points: frozenset) -> Tuple[tuple, ...]:
+    return tuple(BasePolygon.convex_hull(points))
+
+
+@lru_cache(maxsize=4096)
+def cached_local_hull(points: frozenset) -> LocalHull:
+    return LocalHull(cached_convex_hull(points))
 
 
 class BasePolygon(Observable):
@@ -20,10 +36,10 @@ class BasePolygon(Observable):
         self.x = 0
         self.y = 0
         self._left = self._right = self._top = self._bottom = None
-        self._moving_left = self._moving_right = self._moving_top = self._moving_bottom = None
-        self._moving_points = {(l.x1, l.y1) for l in self.lines} | {(l.x2, l.y2) for l in self.lines}
+        self._local_hull = None
+        self._swept_hull = SweptHull(self.local_hull)
         self._moving_polygon = None
-        self._quadrants = set()
+        self._quadrants = None
 
     def lines_pairwise(self) -> Iterator[Tuple[Line, Line]]:
         return zip(self._lines[:-1], self._lines[1:])
@@ -53,6 +69,7 @@ class BasePolygon(Observable):
     def update_coords(self, coords, x, y, yaw_degrees):
         for line_coords, line in zip_longest(zip(coords[:-1], coords[1:]), self.lines):
             line.set_points(*line_coords)
+        self.reset_local_hull()
         self.set_position_rotation(x, y, yaw_degrees)
         self.freeze()
         self.clear_movement()
@@ -93,7 +110,7 @@ class BasePolygon(Observable):
     def moving_polygon(self) -> "Polygon":
         if self._moving_polygon:
             return self._moving_polygon
-        point_string = self.convex_hull(self._moving_points)
+        point_string = [tuple(point) for point in self._swept_hull.vertices.tolist()]
         self._moving_polygon = Polygon.manufacture(coords=point_string)
         return self._moving_polygon
 
@@ -101,37 +118,55 @@ class BasePolygon(Observable):
     def moving_lines(self):
         return self.moving_polygon.lines
 
+    @property
+    def moving_segments(self) -> np.ndarray:
+        return self._swept_hull.segments
+
+    @property
+    def swept_hull(self) -> SweptHull:
+        return self._swept_hull
+
+    @property
+    def _moving_points(self) -> Set[tuple]:
+        return {tuple(point) for point in self._swept_hull.points.tolist()}
+
+    @property
+    def local_hull(self) -> LocalHull:
+        if self._local_hull is None:
+            self._local_hull = cached_local_hull(frozenset(self._hull_points(self.lines)))
+        return self._local_hull
+
+    @staticmethod
+    def _hull_points(lines: List[Line]) -> Iterator[tuple]:
+        return chain(((l.original_x1, l.original_y1) for l in lines), ((l.original_x2, l.original_y2) for l in lines))
+
+    def reset_local_hull(self):
+        self._local_hull = None
+        self._swept_hull.set_local_hull(self.local_hull)
+        self._moving_polygon = None
+
     @classmethod
     def convex_hull(cls, points) -> List[tuple]:
         points = list(set(points))
         if len(points) <= 3:
             return points
-        y_es = [p[1] for p in points]
-        smallest_y = min(y_es)
-        smallest_y_index = y_es.index(smallest_y)
-        starting_point = points[smallest_y_index]
-        point_string = []
-        last_angle = 0
-        min_angle_point = starting_point
-        while min_angle_point not in point_string:
-            point_string.append(min_angle_point)
-            last_point = point_string[-1]
-            eval_points = list(points)
-            eval_points.remove(last_point)
-            angles = cls.get_angles_for_points_from_point(last_point, eval_points)
-            delta_angles = [cls.delta_angle(a, last_angle) % 360 for a in angles]
-            min_angle = min(delta_angles)
-            if delta_angles.count(min_angle) == 1:
-                min_angle_point = eval_points[delta_angles.index(min_angle)]
-            else:
-                straight_points = [p for i, p in enumerate(eval_points) if delta_angles[i] == min_angle]
-                straight_points.sort(key=lambda p: -hypot(last_point[0] - p[0], last_point[1] - p[1]))
-                min_angle_point = straight_points[0]
-            last_angle += min_angle
-        hull = point_string[point_string.index(min_angle_point):]
+        points.sort()
+        lower = cls._half_hull(points)
+        upper = cls._half_hull(reversed(points))
+        hull = lower[:-1] + upper[:-1]
         hull.reverse()
         return hull
 
+    @staticmethod
+    def _half_hull(sorted_points) -> List[tuple]:
+        half = []
+        for p in sorted_points:
+            while len(half) >= 2 and (half[-1][0] - half[-2][0]) * (p[1] - half[-2][1]) - \
+                    (half[-1][1] - half[-2][1]) * (p[0] - half[-2][0]) <= 0:
+                half.pop()
+            half.append(p)
+        return half
+
     @classmethod
     def delta_angle(cls, angle, reference_angle):
         return (((angle % 360) - (reference_angle % 360) + 180) % 360) - 180
@@ -151,22 +186,15 @@ class BasePolygon(Observable):
         self.x = x
         self.y = y
         self.rotation = yaw_degrees
-        self._moving_points.clear()
+        theta = radians(yaw_degrees)
         for line in self.lines:
-            self._moving_points.add((line.x1, line.y1))
-            self._moving_points.add((line.x2, line.y2))
-            if line.set_position_rotation(x, y, radians(yaw_degrees)):
-                self._moving_points.add((line.x1, line.y1))
-                self._moving_points.add((line.x2, line.y2))
+            line.set_position_rotation(x, y, theta)
+        self._swept_hull.move(x, y, yaw_degrees)
         self._left = self._right = self._top = self._bottom = None
-        self._moving_left = self._moving_right = self._moving_top = self._moving_bottom = None
         self._moving_polygon = None
 
     def clear_movement(self):
-        self._moving_points.clear()
-        self._moving_points.update((l.x1, l.y1) for l in self.lines)
-        #self._moving_points.update((l.x2, l.y2) for l in self.lines)
-        self._moving_left = self._moving_right = self._moving_top = self._moving_bottom = None
+        self._swept_hull.clear_movement()
         self._moving_polygon = None
 
     def freeze(self):
@@ -175,6 +203,9 @@ class BasePolygon(Observable):
         self.x = 0
         self.y = 0
         self.rotation = 0
+        self._local_hull = None
+        self._swept_hull = SweptHull(self.local_hull)
+        self._moving_polygon = None
 
     @property
     def left(self):
@@ -198,23 +229,19 @@ class BasePolygon(Observable):
 
     @property
     def moving_left(self):
-        self._moving_left = self._moving_left or min(x for x, y in self._moving_points)
-        return self._moving_left
+        return self._swept_hull.bounds[0]
 
     @property
     def moving_right(self):
-        self._moving_right = self._moving_right or max(x for x, y in self._moving_points)
-        return self._moving_right
+        return self._swept_hull.bounds[1]
 
     @property
     def moving_top(self):
-        self._moving_top = self._moving_top or max(y for x, y in self._moving_points)
-        return self._moving_top
+        return self._swept_hull.bounds[3]
 
     @property
     def moving_bottom(self):
-        self._moving_bottom = self._moving_bottom or min(y for x, y in self._moving_points)
-        return self._moving_bottom
+        return self._swept_hull.bounds[2]
 
     @property
     def quadrants(self) -> set:
@@ -225,7 +252,7 @@ class BasePolygon(Observable):
         return self._quadrants
 
     def reset_quadrants(self):
-        self._quadrants = set()
+        self._quadrants = None
         self._callback("quadrants")
 
     def __repr__(self):
@@ -262,6 +289,8 @@ class Polygon(BasePolygon):
         return True
 
     def intersects(self, other):
+        if isinstance(other, Polygon):
+            return self.movement_box_intersects(other) and swept_hulls_intersect(self._swept_hull, other.swept_hull)
         intersects, _, _ = self.intersection_point(other)
         return intersects
 
@@ -269,17 +298,25 @@ class Polygon(BasePolygon):
         if not self.movement_box_intersects(other):
             return False, None, None
         if isinstance(other, Polygon):
-            for l1, l2 in product(self.moving_lines, other.moving_lines):
-                intersects, x, y = l1.intersection_point(l2)
-                if intersects:
-                    return True, x, y
+            if not swept_hulls_intersect(self._swept_hull, other.swept_hull):
+                return False, None, None
+            intersects, x, y = first_intersection(self.moving_segments, other.moving_segments)
+            if intersects:
+                return intersects, x, y
+            return (True,) + self._contained_centroid(other)
         elif isinstance(other, Line):
-            for l1 in self.moving_lines:
-                intersects, x, y = l1.intersection_point(other)
-                if intersects:
-                    return True, x, y
+            return first_intersection(self.moving_segments, pack_lines([other]))
         return False, None, None
 
+    def _contained_centroid(self, other: "Polygon"):
+        own_left, own_right, own_bottom, own_top = self._swept_hull.bounds
+        other_left, other_right, other_bottom, other_top = other.swept_hull.bounds
+        inner = self._swept_hull
+        if (other_right - other_left) * (other_top - other_bottom) < (own_right - own_left) * (own_top - own_bottom):
+            inner = other.swept_hull
+        x, y = inner.vertices.mean(axis=0).tolist()
+        return x, y
+
     def point_inside(self, x, y):
         outside_point = (self.moving_polygon.left - 1, self.moving_polygon.bottom - 1)
         break_line = Line([(x, y), outside_point])
@@ -368,8 +405,12 @@ class ClosedPolygon(Polygon):
                              (clockwise and "clockwise?" or "counter-clockwise?"))
 
 
+def line_start_points(lines: List[Line]) -> Iterator[tuple]:
+    return ((l.original_x1, l.original_y1) for l in lines)
+
+
 class OpenPolygon(Polygon):
-    pass
+    _hull_points = staticmethod(line_start_points)
 
 
 class PolygonPart(Polygon):
@@ -424,12 +465,24 @@ class Triangle(ConvexHull):
 class MultiPolygon(ConvexHull):
 
     def __init__(self, polygons: Set[PolygonPart], part_id=None):
-        points = set(chain(*[{(l.x1, l.y1) for l in p.lines} | {(l.x2, l.y2) for l in p.lines} for p in polygons]))
-        hull = self.convex_hull(points)
+        points = frozenset(chain(*[{(l.x1, l.y1) for l in p.lines} | {(l.x2, l.y2) for l in p.lines} for p in polygons]))
+        hull = cached_convex_hull(points)
         lines = self.coords_to_lines(hull)
         super().__init__(lines, part_id=part_id)
         self._polygons = polygons
         self._part_id_index = {p.part_id: p for p in self._polygons}
+        self._part_tree = self._build_part_tree()
+
+    def _build_part_tree(self) -> PartTree:
+        parts = list(self._polygons)
+        local_hulls = [cached_local_hull(frozenset(map(tuple, part.local_hull.transformed(*part.swept_hull.pose).tolist())))
+                       for part in parts]
+        return PartTree(parts, local_hulls)
+
+    @property
+    def part_tree(self) -> PartTree:
+        self._part_tree.move(self._swept_hull)
+        return self._part_tree
 
     def clear_movement(self):
         super(MultiPolygon, self).clear_movement()
@@ -437,7 +490,15 @@ class MultiPolygon(ConvexHull):
             p.clear_movement()
 
     def remove_polygons(self, uuids):
-        self._remove_polygons({self._part_id_index[uuid] for uuid in uuids})
+        self._remove_polygons({self._part_id_index[uuid] for uuid in uuids if uuid in self._part_id_index})
+
+    def add_polygons(self, polygons: Set[PolygonPart]):
+        polygons = set(polygons) - self._polygons
+        if not polygons:
+            return
+        self._polygons |= polygons
+        self._part_id_index.update((p.part_id, p) for p in polygons)
+        self.rebuild_hull()
 
     def _remove_polygons(self, polygons):
         if not polygons & self._polygons:
@@ -448,12 +509,15 @@ class MultiPolygon(ConvexHull):
     def rebuild_hull(self):
         x, y, rotation = self.x, self.y, self.rotation
         self.set_position_rotation(0, 0, 0)
-        points = set(chain(*[{(l.x1, l.y1) for l in p.lines} | {(l.x2, l.y2) for l in p.lines} for p in self._polygons]))
-        hull = self.convex_hull(points)
+        points = frozenset(chain(*[{(l.x1, l.y1) for l in p.lines} | {(l.x2, l.y2) for l in p.lines} for p in self._polygons]))
+        hull = cached_convex_hull(points)
         lines = self.coords_to_lines(hull)
         #self.freeze()
         self._lines = lines
+        self.reset_local_hull()
+        self._part_tree = self._build_part_tree()
         self.set_position_rotation(x, y, rotation)
+        self.clear_movement()
         self.evaluate_directionality()
         self.centroid = self._centroid()
 
@@ -470,12 +534,32 @@ class MultiPolygon(ConvexHull):
         if len(self) == 0 or len(other) == 0 or not self.intersects(other):
             return own_intersections, other_intersections
 
-        for p1, p2 in product(self, other):
-            if p1.intersects(p2):
+        if isinstance(other, MultiPolygon):
+            for p1, p2 in self.part_tree.intersecting_parts(other.part_tree):
+                own_intersections.add(p1)
+                other_intersections.add(p2)
+            return own_intersections, other_intersections
+
+        own_parts = list(self)
+        other_parts = list(other)
+        own_bounds = self.parts_bounds(own_parts)
+        other_bounds = self.parts_bounds(other_parts)
+        overlapping = ((own_bounds[:, None, 0] <= other_bounds[None, :, 1]) &
+                       (other_bounds[None, :, 0] <= own_bounds[:, None, 1]) &
+                       (own_bounds[:, None, 2] <= other_bounds[None, :, 3]) &
+                       (other_bounds[None, :, 2] <= own_bounds[:, None, 3]))
+        for i, j in zip(*np.nonzero(overlapping)):
+            p1 = own_parts[i]
+            p2 = other_parts[j]
+            if swept_hulls_intersect(p1.swept_hull, p2.swept_hull):
                 own_intersections.add(p1)
                 other_intersections.add(p2)
         return own_intersections, other_intersections
 
+    @staticmethod
+    def parts_bounds(parts) -> np.ndarray:
+        return np.array([part.swept_hull.bounds for part in parts], dtype=np.float64).reshape(-1, 4)
+
     @classmethod
     def manufacture(cls, coords, x=0, y=0, rotation=0, part_id=None):
         lines = cls.coords_to_lines(coords)
@@ -492,6 +576,7 @@ class MultiPolygon(ConvexHull):
 
 
 class ClippingPolygon(Polygon):
+    _hull_points = staticmethod(line_start_points)
 
     def __init__(self, lines: List[Line], part_id):
         self._active_lines = [True] * len(lines)
@@ -504,8 +589,7 @@ class ClippingPolygon(Polygon):
     def set_active_lines(self, *states):
         self._active_lines = states
         self._left = self._right = self._top = self._bottom = None
-        self._moving_left = self._moving_right = self._moving_top = self._moving_bottom = None
-        self._moving_polygon = None
+        self.reset_local_hull()
 
     def __copy__(self):
         return self.__class__([line.copy() for line in self._lines], part_id=self.part_id)
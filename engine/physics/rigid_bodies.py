@@ -0,0 +1,181 @@
+import numpy as np
+
+from engine.models.base_model import BaseModel
+from engine.models.observable import Observable
+from engine.physics.force import MutableOffsets, MutableDegrees, MutableUnboundDegrees, MutableVector
+
+
+class StoredVector(object):
+    __slots__ = ()
+    detached_class = None
+
+    def __new__(cls, *args):
+        if len(args) == 3:
+            return cls.detached_class(*args)
+        return object.__new__(cls)
+
+    def __init__(self, row: np.ndarray):
+        Observable.__init__(self)
+        self._row = row
+
+    @property
+    def _x(self):
+        return self._row.item(0)
+
+    @_x.setter
+    def _x(self, value):
+        self._row[0] = value
+
+    @property
+    def _y(self):
+        return self._row.item(1)
+
+    @_y.setter
+    def _y(self, value):
+        self._row[1] = value
+
+    @property
+    def _z(self):
+        return self._row.item(2)
+
+    @_z.setter
+    def _z(self, value):
+        self._row[2] = value
+
+    def detached(self) -> MutableVector:
+        vector = self.detached_class(*self._row.tolist())
+        vector._observers = self._observers
+        return vector
+
+
+class StoredOffsets(StoredVector, MutableOffsets):
+    __slots__ = ("_row",)
+    detached_class = MutableOffsets
+
+
+class StoredDegrees(StoredVector, MutableDegrees):
+    __slots__ = ("_row",)
+    detached_class = MutableDegrees
+
+
+class StoredUnboundDegrees(StoredVector, MutableUnboundDegrees):
+    __slots__ = ("_row",)
+    detached_class = MutableUnboundDegrees
+
+
+def add_degrees(a: np.ndarray, b: np.ndarray, wrapped: np.ndarray) -> np.ndarray:
+    return np.where(wrapped[:, None], ((a % 360) + (b % 360) + 180) % 360 - 180, a + b)
+
+
+class RigidBodyStore(object):
+    fields = ("position", "rotation", "movement", "spin", "acceleration", "torque")
+    stored_classes = {MutableOffsets: StoredOffsets, MutableDegrees: StoredDegrees,
+                      MutableUnboundDegrees: StoredUnboundDegrees}
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.arrays = {field: np.zeros((capacity, 3)) for field in self.fields}
+        self.wrapped = {field: np.zeros(capacity, dtype=bool) for field in ("rotation", "spin")}
+        self.models = [None] * capacity
+        self.size = 0
+        self._free = []
+        self._slots = {}
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, model):
+        return model in self._slots
+
+    def accepts(self, model) -> bool:
+        if type(model).run is not BaseModel.run:
+            return False
+        return all(type(getattr(model, "_" + field)) in self.stored_classes for field in self.fields)
+
+    def add(self, model: BaseModel):
+        if model in self._slots:
+            return self._slots[model]
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            slot = self.size
+            self.size += 1
+        self._slots[model] = slot
+        self.models[slot] = model
+        for field in self.fields:
+            vector = getattr(model, "_" + field)
+            row = self.arrays[field][slot]
+            row[:] = vector.xyz
+            if field in self.wrapped:
+                self.wrapped[field][slot] = isinstance(vector, MutableDegrees)
+            stored = self.stored_classes[type(vector)](row)
+            stored._observers = vector._observers
+            setattr(model, "_" + field, stored)
+        return slot
+
+    def remove(self, model: BaseModel):
+        slot = self._slots.pop(model, None)
+        if slot is None:
+            return
+        for field in self.fields:
+            setattr(model, "_" + field, getattr(model, "_" + field).detached())
+            self.arrays[field][slot] = 0
+        self.models[slot] = None
+        self._free.append(slot)
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for field, array in list(self.arrays.items()):
+            grown = np.zeros((capacity, 3))
+            grown[:self.capacity] = array
+            self.arrays[field] = grown
+        for field, array in list(self.wrapped.items()):
+            grown = np.zeros(capacity, dtype=bool)
+            grown[:self.capacity] = array
+            self.wrapped[field] = grown
+        self.models += [None] * (capacity - self.capacity)
+        self.capacity = capacity
+        for model, slot in self._slots.items():
+            for field in self.fields:
+                getattr(model, "_" + field)._row = self.arrays[field][slot]
+
+    def integrate(self, dt):
+        n = self.size
+        position, rotation, movement, spin, acceleration, torque = (self.arrays[field][:n] for field in self.fields)
+        wrapped_rotation, wrapped_spin = self.wrapped["rotation"][:n], self.wrapped["spin"][:n]
+        old_movement, old_spin = movement.copy(), spin.copy()
+        half_of_acceleration = acceleration * dt / 2
+        half_of_torque = torque * dt / 2
+        movement += half_of_acceleration
+        spin[:] = add_degrees(spin, half_of_torque, wrapped_spin)
+        translation = movement * dt
+        position += translation
+        turn = spin * dt
+        rotation[:] = add_degrees(rotation, turn, wrapped_rotation)
+        movement += half_of_acceleration
+        spin[:] = add_degrees(spin, half_of_torque, wrapped_spin)
+
+        translated = translation.any(axis=1)
+        turned = turn.any(axis=1)
+        accelerated = (movement != old_movement).any(axis=1)
+        spun = (spin != old_spin).any(axis=1)
+        changed = np.flatnonzero(translated | turned | accelerated | spun).tolist()
+        translated, turned, accelerated, spun = translated.tolist(), turned.tolist(), accelerated.tolist(), spun.tolist()
+        models = self.models
+        for slot in changed:
+            model = models[slot]
+            if accelerated[slot]:
+                model._movement.update()
+            if spun[slot]:
+                model._spin.update()
+            if translated[slot]:
+                model._position.update()
+            if turned[slot]:
+                model._rotation.update()
+            if translated[slot] or turned[slot]:
+                model.update()
+        for model in self._slots:
+            if model.bounding_box_update_needed:
+                model.update_bounding_box()
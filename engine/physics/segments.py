@@ -0,0 +1,46 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from engine.physics.line import Line
+
+X1, Y1, X2, Y2 = range(4)
+
+
+def pack_lines(lines: List[Line]) -> np.ndarray:
+    return np.array([(l.x1, l.y1, l.x2, l.y2) for l in lines], dtype=np.float64).reshape(-1, 4)
+
+
+def pack_closed_coords(coords: List[tuple]) -> np.ndarray:
+    points = np.array(coords, dtype=np.float64).reshape(-1, 2)
+    return np.concatenate((np.roll(points, 1, axis=0), points), axis=1)
+
+
+def intersections(segments: np.ndarray, others: np.ndarray, precision=Line.precision):
+    tolerance = 0.5 * 10 ** -precision
+    x1, y1, x2, y2 = segments[:, X1, None], segments[:, Y1, None], segments[:, X2, None], segments[:, Y2, None]
+    ox1, oy1, ox2, oy2 = others[:, X1], others[:, Y1], others[:, X2], others[:, Y2]
+    dx, dy = x1 - x2, y1 - y2
+    odx, ody = ox1 - ox2, oy1 - oy2
+    rx, ry = x1 - ox1, y1 - oy1
+    common_denominator = dx * ody - odx * dy
+    not_parallel = np.abs(common_denominator) >= tolerance
+    common_denominator = np.where(not_parallel, common_denominator, 1.0)
+    k_x = (ody * rx - odx * ry) / common_denominator
+    k_y = (dy * rx - dx * ry) / common_denominator
+    hits = not_parallel & \
+        (k_x >= -tolerance) & (k_x <= 1 + tolerance) & \
+        (k_y >= -tolerance) & (k_y <= 1 + tolerance)
+    xs = np.where(hits, x1 - k_x * dx, np.nan)
+    ys = np.where(hits, y1 - k_x * dy, np.nan)
+    return hits, xs, ys
+
+
+def first_intersection(segments: np.ndarray, others: np.ndarray) -> Tuple[bool, float, float]:
+    if len(segments) == 0 or len(others) == 0:
+        return False, None, None
+    hits, xs, ys = intersections(segments, others)
+    flat_index = hits.argmax()
+    if not hits.flat[flat_index]:
+        return False, None, None
+    return True, float(xs.flat[flat_index]), float(ys.flat[flat_index])
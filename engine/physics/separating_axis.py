@@ -0,0 +1,63 @@
+from math import inf
+
+import numpy as np
+
+from engine.physics.line import Line
+from engine.physics.swept_hull import LocalHull, SweptHull
+
+contact_tolerance = 0.5 * 10 ** -Line.precision
+
+
+def point_segment_distance(point: np.ndarray, start: np.ndarray, end: np.ndarray) -> float:
+    direction = end - start
+    length_squared = float(direction @ direction)
+    t = 0. if length_squared == 0 else min(max(float((point - start) @ direction) / length_squared, 0.), 1.)
+    return float(np.hypot(*(start + t * direction - point)))
+
+
+def segments_cross(start, end, other_start, other_end) -> bool:
+    def side(a, b, c):
+        return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    return side(start, end, other_start) * side(start, end, other_end) < 0 and \
+        side(other_start, other_end, start) * side(other_start, other_end, end) < 0
+
+
+def degenerate_separation(points: np.ndarray, other_points: np.ndarray) -> float:
+    start, end = points[0], points[-1]
+    other_start, other_end = other_points[0], other_points[-1]
+    if segments_cross(start, end, other_start, other_end):
+        return 0.
+    return min(point_segment_distance(start, other_start, other_end),
+               point_segment_distance(end, other_start, other_end),
+               point_segment_distance(other_start, start, end),
+               point_segment_distance(other_end, start, end))
+
+
+def separation(points: np.ndarray, unit_normals: np.ndarray,
+               other_points: np.ndarray, other_unit_normals: np.ndarray) -> float:
+    if len(points) == 0 or len(other_points) == 0:
+        return -inf
+    if len(points) < 3 and len(other_points) < 3:
+        return degenerate_separation(points, other_points)
+    gap = -inf
+    if len(unit_normals):
+        own_gaps = (other_points @ unit_normals.T).min(axis=0) - (points @ unit_normals.T).max(axis=0)
+        gap = own_gaps.max()
+    if len(other_unit_normals):
+        other_gaps = (points @ other_unit_normals.T).min(axis=0) - (other_points @ other_unit_normals.T).max(axis=0)
+        gap = max(gap, other_gaps.max())
+    return float(gap)
+
+
+def hull_separation(local_hull: LocalHull, pose, other_local_hull: LocalHull, other_pose) -> float:
+    return separation(local_hull.transformed(*pose), local_hull.rotated_unit_normals(pose[2]),
+                      other_local_hull.transformed(*other_pose), other_local_hull.rotated_unit_normals(other_pose[2]))
+
+
+def swept_separation(swept_hull: SweptHull, other_swept_hull: SweptHull) -> float:
+    return separation(swept_hull.vertices, swept_hull.unit_normals,
+                      other_swept_hull.vertices, other_swept_hull.unit_normals)
+
+
+def swept_hulls_intersect(swept_hull: SweptHull, other_swept_hull: SweptHull) -> bool:
+    return swept_separation(swept_hull, other_swept_hull) <= contact_tolerance
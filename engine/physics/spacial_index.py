@@ -1,5 +1,6 @@
 from collections import defaultdict
 from itertools import product, chain
+from math import floor, ceil
 
 from engine.models import BaseModel
 
@@ -66,3 +67,153 @@ class SpacialIndex(object):
     def _add_model_to_2d_space_index(self, model: BaseModel, index: tuple):
         self._2d_space_index[index].add(model)
         self._model_quadrant_index[model].add(index)
+
+
+def pack_cell(ix: int, iy: int) -> int:
+    return (ix & 0xffffffff) << 32 | (iy & 0xffffffff)
+
+
+class HashedSpacialIndex(SpacialIndex):
+
+    def __init__(self, cell_size=None, min_cell_size=1.0):
+        super().__init__()
+        self.auto_cell_size = cell_size is None
+        self.min_cell_size = min_cell_size
+        self.cell_size = cell_size or 30.0
+        self._2d_space_index = {}
+        self._cell_ranges = {}
+        self._order = {}
+        self._extents = {}
+        self._next_order = 0
+        self._next_adaptation = 1
+
+    def __len__(self):
+        return len(self._cell_ranges)
+
+    def other_models(self, model: BaseModel) -> set:
+        s = self.models_in_range(*self._cell_ranges[model])
+        s.discard(model)
+        return s
+
+    def all_models(self, quadrants):
+        s = set()
+        for q in quadrants:
+            if isinstance(q, tuple):
+                q = pack_cell(*q)
+            s |= self._2d_space_index.get(q, set())
+        return s
+
+    def models_in_range(self, x0, x1, y0, y1) -> set:
+        s = set()
+        cells = self._2d_space_index
+        for ix in range(x0, x1):
+            x_key = (ix & 0xffffffff) << 32
+            for iy in range(y0, y1):
+                try:
+                    s |= cells[x_key | (iy & 0xffffffff)]
+                except KeyError:
+                    pass
+        return s
+
+    def all_pairs_deduplicated(self, models):
+        checked = set()
+        for model in models:
+            if model in self._cell_ranges:
+                self.reindex_spacial_position(model)
+                checked.add(model)
+        pairs = set()
+        order = self._order
+        for model in checked:
+            for other in self.other_models(model):
+                if other in checked and order[other] < order[model]:
+                    continue
+                pairs.add((model, other))
+        return pairs
+
+    def cell_range(self, model: BaseModel):
+        bbox = model.bounding_box
+        cell_size = self.cell_size
+        return (int(floor(bbox.moving_left / cell_size)), int(ceil(bbox.moving_right / cell_size)),
+                int(floor(bbox.moving_bottom / cell_size)), int(ceil(bbox.moving_top / cell_size)))
+
+    def init_model_into_2d_space_index(self, model: BaseModel):
+        if model in self._cell_ranges:
+            self.reindex_spacial_position(model)
+            return
+        self._order[model] = self._next_order
+        self._next_order += 1
+        bbox = model.bounding_box
+        self._extents[model] = max(bbox.moving_right - bbox.moving_left, bbox.moving_top - bbox.moving_bottom)
+        cell_range = self.cell_range(model)
+        self._cell_ranges[model] = cell_range
+        self._add_to_cells(model, *cell_range)
+        if self.auto_cell_size and len(self._cell_ranges) >= self._next_adaptation:
+            self._next_adaptation *= 2
+            self.adapt_cell_size()
+
+    def clear_model_from_2d_space_index(self, model: BaseModel):
+        try:
+            cell_range = self._cell_ranges.pop(model)
+        except KeyError:
+            return
+        self._remove_from_cells(model, *cell_range)
+        del self._order[model]
+        del self._extents[model]
+
+    def reindex_spacial_position(self, model: BaseModel):
+        try:
+            x0, x1, y0, y1 = self._cell_ranges[model]
+        except KeyError:
+            return
+        bbox = model.bounding_box
+        cell_size = self.cell_size
+        new_x0 = int(floor(bbox.moving_left / cell_size))
+        new_x1 = int(ceil(bbox.moving_right / cell_size))
+        new_y0 = int(floor(bbox.moving_bottom / cell_size))
+        new_y1 = int(ceil(bbox.moving_top / cell_size))
+        if new_x0 == x0 and new_x1 == x1 and new_y0 == y0 and new_y1 == y1:
+            return
+        self._remove_from_cells(model, x0, x1, y0, y1)
+        self._add_to_cells(model, new_x0, new_x1, new_y0, new_y1)
+        self._cell_ranges[model] = (new_x0, new_x1, new_y0, new_y1)
+
+    def adapt_cell_size(self):
+        extents = sorted(self._extents.values())
+        if not extents:
+            return
+        cell_size = max(extents[len(extents) // 2], self.min_cell_size)
+        if self.cell_size / 2 < cell_size < self.cell_size * 2:
+            return
+        self.rebuild(cell_size)
+
+    def rebuild(self, cell_size):
+        self.cell_size = cell_size
+        self._2d_space_index = {}
+        for model in self._cell_ranges:
+            cell_range = self.cell_range(model)
+            self._cell_ranges[model] = cell_range
+            self._add_to_cells(model, *cell_range)
+
+    def _add_to_cells(self, model: BaseModel, x0, x1, y0, y1):
+        cells = self._2d_space_index
+        for ix in range(x0, x1):
+            x_key = (ix & 0xffffffff) << 32
+            for iy in range(y0, y1):
+                key = x_key | (iy & 0xffffffff)
+                try:
+                    cells[key].add(model)
+                except KeyError:
+                    cells[key] = {model}
+
+    def _remove_from_cells(self, model: BaseModel, x0, x1, y0, y1):
+        cells = self._2d_space_index
+        for ix in range(x0, x1):
+            x_key = (ix & 0xffffffff) << 32
+            for iy in range(y0, y1):
+                key = x_key | (iy & 0xffffffff)
+                cell = cells.get(key)
+                if cell is None:
+                    continue
+                cell.discard(model)
+                if not cell:
+                    del cells[key]
@@ -0,0 +1,186 @@
+from math import radians, cos, sin, pi, inf
+
+import numpy as np
+
+tau = 2 * pi
+collinear_tolerance = 1e-9
+
+
+def edge_unit_normals(points: np.ndarray) -> np.ndarray:
+    edges = points - np.concatenate((points[-1:], points[:-1]))
+    normals = np.stack((-edges[:, 1], edges[:, 0]), axis=1)
+    lengths = np.hypot(normals[:, 0], normals[:, 1])
+    return normals[lengths > 0] / lengths[lengths > 0, None]
+
+
+class LocalHull(object):
+
+    def __init__(self, hull):
+        self.points = np.array(hull, dtype=np.float64).reshape(-1, 2)
+        if self.signed_area(self.points) > 0:
+            self.points = self.points[::-1].copy()
+        edges = self.points - np.roll(self.points, 1, axis=0)
+        self.normals = np.stack((-edges[:, 1], edges[:, 0]), axis=1)
+        self.normal_angles = np.arctan2(self.normals[:, 1], self.normals[:, 0])
+        self.unit_normals = edge_unit_normals(self.points)
+        self.radius = float(np.hypot(self.points[:, 0], self.points[:, 1]).max(initial=0))
+
+    def __len__(self):
+        return len(self.points)
+
+    @staticmethod
+    def signed_area(points: np.ndarray) -> float:
+        following = np.roll(points, -1, axis=0)
+        return float((points[:, 0] * following[:, 1] - following[:, 0] * points[:, 1]).sum()) / 2
+
+    def transformed(self, x, y, yaw_degrees) -> np.ndarray:
+        return self.points @ self.rotation(yaw_degrees) + (x, y)
+
+    def rotated_unit_normals(self, yaw_degrees) -> np.ndarray:
+        return self.unit_normals @ self.rotation(yaw_degrees)
+
+    @staticmethod
+    def rotation(yaw_degrees) -> np.ndarray:
+        theta = radians(yaw_degrees)
+        cos_val = cos(theta)
+        sin_val = sin(theta)
+        return np.array([[cos_val, sin_val], [-sin_val, cos_val]])
+
+
+class SweptHull(object):
+
+    def __init__(self, local_hull: LocalHull, x=0, y=0, yaw_degrees=0):
+        self.local_hull = local_hull
+        self._previous = self._current = (x, y, yaw_degrees)
+        self._clear_cache()
+
+    def _clear_cache(self):
+        self._points = None
+        self._vertices = None
+        self._segments = None
+        self._bounds = None
+        self._unit_normals = None
+
+    def set_local_hull(self, local_hull: LocalHull):
+        self.local_hull = local_hull
+        self._clear_cache()
+
+    def move(self, x, y, yaw_degrees):
+        self._previous = self._current
+        self._current = (x, y, yaw_degrees)
+        self._clear_cache()
+
+    def clear_movement(self):
+        self._previous = self._current
+        self._clear_cache()
+
+    def set_poses(self, previous, current):
+        self._previous = previous
+        self._current = current
+        self._clear_cache()
+
+    @property
+    def pose(self):
+        return self._current
+
+    @property
+    def previous_pose(self):
+        return self._previous
+
+    @property
+    def is_moving(self):
+        return self._previous != self._current
+
+    @property
+    def points(self) -> np.ndarray:
+        if self._points is None:
+            current = self.local_hull.transformed(*self._current)
+            if self.is_moving:
+                self._points = np.concatenate((self.local_hull.transformed(*self._previous), current))
+            else:
+                self._points = current
+        return self._points
+
+    @property
+    def bounds(self):
+        if self._bounds is None:
+            points = self.points
+            if len(points) == 0:
+                return inf, -inf, inf, -inf
+            left, bottom = points.min(axis=0).tolist()
+            right, top = points.max(axis=0).tolist()
+            self._bounds = left, right, bottom, top
+        return self._bounds
+
+    @property
+    def vertices(self) -> np.ndarray:
+        if self._vertices is None:
+            if not self.is_moving:
+                self._vertices = self.points
+            elif len(self.local_hull) < 3:
+                self._vertices = self._small_sweep()
+            else:
+                self._vertices = self._sweep()
+        return self._vertices
+
+    @property
+    def unit_normals(self) -> np.ndarray:
+        if self._unit_normals is None:
+            if self.is_moving:
+                self._unit_normals = edge_unit_normals(self.vertices)
+            else:
+                self._unit_normals = self.local_hull.rotated_unit_normals(self._current[2])
+        return self._unit_normals
+
+    @property
+    def segments(self) -> np.ndarray:
+        if self._segments is None:
+            vertices = self.vertices
+            self._segments = np.concatenate((np.concatenate((vertices[-1:], vertices[:-1])), vertices), axis=1)
+        return self._segments
+
+    def _sweep(self) -> np.ndarray:
+        # The swept hull is the hull of the previous and the current copy. Walking the outward
+        # normal directions of both copies in order, each arc between two normals has a fixed
+        # extreme vertex in each copy; the hull takes whichever is further out, and both when
+        # the lead changes inside the arc.
+        points = self.points
+        n_points = len(self.local_hull)
+        previous_yaw = radians(self._previous[2])
+        current_yaw = radians(self._current[2])
+        angles = np.concatenate((self.local_hull.normal_angles + previous_yaw,
+                                 self.local_hull.normal_angles + current_yaw)) % tau
+        angles.sort()
+        next_angles = np.append(angles[1:], angles[0] + tau)
+        mid_angles = (angles + next_angles) / 2
+        mid_directions = np.column_stack((np.cos(mid_angles), np.sin(mid_angles)))
+        previous_index = (mid_directions @ points[:n_points].T).argmax(axis=1)
+        current_index = (mid_directions @ points[n_points:].T).argmax(axis=1) + n_points
+        lead = points[previous_index] - points[current_index]
+        previous_leads_at_start = np.cos(angles) * lead[:, 0] + np.sin(angles) * lead[:, 1] >= 0
+        previous_leads_at_end = np.cos(next_angles) * lead[:, 0] + np.sin(next_angles) * lead[:, 1] >= 0
+        sequence = np.column_stack((np.where(previous_leads_at_start, previous_index, current_index),
+                                    np.where(previous_leads_at_end, previous_index, current_index))).ravel()
+        distinct = np.append(sequence[0] != sequence[-1], sequence[1:] != sequence[:-1])
+        if not distinct.any():
+            return points[sequence[:1]]
+        return self._drop_collinear(points[sequence[distinct][::-1]])
+
+    @staticmethod
+    def _drop_collinear(vertices: np.ndarray) -> np.ndarray:
+        previous = np.concatenate((vertices[-1:], vertices[:-1]))
+        vertices = vertices[(vertices != previous).any(axis=1)]
+        if len(vertices) < 3:
+            return vertices
+        previous = np.concatenate((vertices[-1:], vertices[:-1]))
+        following = np.concatenate((vertices[1:], vertices[:1]))
+        incoming = vertices - previous
+        outgoing = following - vertices
+        turn = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0]
+        return vertices[np.abs(turn) > collinear_tolerance]
+
+    def _small_sweep(self) -> np.ndarray:
+        points = np.unique(self.points, axis=0)
+        offsets = points - points.mean(axis=0)
+        order = np.argsort(np.arctan2(offsets[:, 1], offsets[:, 0]))
+        return points[order[::-1]]
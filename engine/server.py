@@ -1,10 +1,13 @@
 from engine.engine import Engine
+from engine.physics.rigid_bodies import RigidBodyStore
 
 
 class ServerEngine(Engine):
 
-    def __init__(self, event_loop):
-        super().__init__(event_loop)
+    rigid_body_store_class = RigidBodyStore
+
+    def __init__(self, event_loop, spacial_index=None, pair_cache=None, rigid_bodies=None):
+        super().__init__(event_loop, spacial_index=spacial_index, pair_cache=pair_cache, rigid_bodies=rigid_bodies)
         self.on_enter()
 
     def on_enter(self):
@@ -0,0 +1,21 @@
+from engine.engine import Engine
+
+
+class UnscheduledEngine(Engine):
+
+    def schedule_interval(self, func, interval):
+        pass
+
+
+class DatagramTransport(object):
+
+    def __init__(self):
+        self.written = []
+
+    def write(self, data, address):
+        self.written.append((data, address))
+
+
+def frame(uuid, x=1.5, spin=-3.0):
+    return {"uuid": uuid, "position": [x, 0, -2.25], "rotation": 90.0, "movement": [0.5, 0, 0], "spin": spin,
+            "acceleration": [0, 0, 1.0], "torque": 0.0}
@@ -0,0 +1,129 @@
+from random import Random
+
+from engine.models.factories import ShipModelFactory
+from engine.physics.aabb_tree import AABBTree, null_node, overlaps
+from engine.physics.polygon import Polygon
+
+smf = ShipModelFactory()
+
+
+class Box(object):
+
+    def __init__(self, x, y, size):
+        self.bounding_box = Polygon.manufacture([(0, 0), (0, size), (size, size), (size, 0)], x=x, y=y)
+
+    def move_to(self, x, y):
+        self.bounding_box.set_position_rotation(x, y, 0)
+        self.bounding_box.clear_movement()
+
+
+class TestAABBTreeCollisionPairGeneration(object):
+
+    def setup(self):
+        self.target = AABBTree()
+        self.ship = smf.manufacture('ship')
+        self.target.init_model_into_2d_space_index(self.ship)
+        self.ship2 = smf.manufacture('ship')
+        self.target.init_model_into_2d_space_index(self.ship2)
+        self.far_ship = smf.manufacture('ship', position=(500, 0, 500))
+        self.target.init_model_into_2d_space_index(self.far_ship)
+
+    def test_ship2_is_other_model_to_ship(self):
+        assert {self.ship2} == self.target.other_models(self.ship)
+
+    def test_ship_and_ship2_are_paired_once(self):
+        pairs = self.target.all_pairs_deduplicated({self.ship, self.ship2})
+        assert {(self.ship, self.ship2)} == pairs or {(self.ship2, self.ship)} == pairs
+
+    def test_far_ship_is_not_paired(self):
+        assert set() == self.target.all_pairs_deduplicated({self.far_ship})
+
+    def test_cleared_model_is_not_paired(self):
+        self.target.clear_model_from_2d_space_index(self.ship2)
+        assert set() == self.target.all_pairs_deduplicated({self.ship})
+
+    def test_moved_ship_is_paired(self):
+        self.far_ship.teleport_to(0, 0, 0)
+        self.target.reindex_spacial_position(self.far_ship)
+        assert {self.ship, self.ship2} == self.target.other_models(self.far_ship)
+
+
+class TestAABBTreeFatBounds(object):
+
+    def setup(self):
+        self.target = AABBTree(margin=2.0)
+        self.box = Box(0, 0, 1)
+        self.target.init_model_into_2d_space_index(self.box)
+        self.neighbour = Box(2.5, 0, 1)
+        self.target.init_model_into_2d_space_index(self.neighbour)
+
+    def test_fat_overlap_alone_is_not_a_pair(self):
+        assert set() == self.target.other_models(self.box)
+
+    def test_small_move_keeps_leaf_bounds(self):
+        leaf = self.target._leaf_by_model[self.box]
+        fat = self.target._aabb[leaf]
+        self.box.move_to(0.5, 0.5)
+        self.target.reindex_spacial_position(self.box)
+        assert fat == self.target._aabb[leaf]
+
+    def test_large_move_refits_leaf_bounds_ahead_of_the_motion(self):
+        leaf = self.target._leaf_by_model[self.box]
+        self.box.move_to(10, -10)
+        self.target.reindex_spacial_position(self.box)
+        assert (8, 53, -52, -7) == self.target._aabb[leaf]
+
+
+class TestAABBTreeMatchesBruteForce(object):
+
+    def setup(self):
+        self.rnd = Random(5)
+        self.target = AABBTree()
+        self.boxes = [Box(self.rnd.uniform(0, 100), self.rnd.uniform(0, 100), self.rnd.uniform(1, 8))
+                      for _ in range(200)]
+        for box in self.boxes:
+            self.target.init_model_into_2d_space_index(box)
+
+    @staticmethod
+    def aabb(box):
+        bbox = box.bounding_box
+        return bbox.moving_left, bbox.moving_right, bbox.moving_bottom, bbox.moving_top
+
+    def brute_force_others(self, box):
+        return {other for other in self.boxes if other is not box and overlaps(self.aabb(box), self.aabb(other))}
+
+    def assert_tree_is_consistent(self):
+        tree = self.target
+        assert tree._parent[tree._root] == null_node
+        stack = [tree._root]
+        while stack:
+            node = stack.pop()
+            child1, child2 = tree._child1[node], tree._child2[node]
+            if child1 == null_node:
+                continue
+            assert tree._parent[child1] == node and tree._parent[child2] == node
+            assert abs(tree._height[child1] - tree._height[child2]) <= 1
+            stack.extend((child1, child2))
+
+    def test_other_models_after_shuffling(self):
+        for _ in range(3):
+            for box in self.rnd.sample(self.boxes, 80):
+                box.move_to(self.rnd.uniform(0, 100), self.rnd.uniform(0, 100))
+                self.target.reindex_spacial_position(box)
+        removed = self.rnd.sample(self.boxes, 50)
+        for box in removed:
+            self.target.clear_model_from_2d_space_index(box)
+            self.boxes.remove(box)
+        self.assert_tree_is_consistent()
+        for box in self.boxes:
+            assert self.brute_force_others(box) == self.target.other_models(box)
+
+    def test_all_pairs_deduplicated_covers_every_pair_once(self):
+        checked = set(self.rnd.sample(self.boxes, 60))
+        pairs = self.target.all_pairs_deduplicated(checked)
+        expected = {frozenset((box, other)) for box in checked for other in self.brute_force_others(box)}
+        assert len(expected) == len(pairs)
+        assert expected == {frozenset(pair) for pair in pairs}
+
+    def test_tree_stays_shallow(self):
+        assert self.target.height <= 16
@@ -0,0 +1,115 @@
+import socket
+import time
+
+from twisted.internet.protocol import DatagramProtocol
+
+from engine.engine import Engine
+from engine.network.asyncio_transport import AsyncioNetwork, AsyncioServerEngine, RepeatingCall
+from engine.network.event_protocol import EventProtocol
+from engine.network.input_codec import InputCommandCodec
+from engine.network.server.factories import BroadcastServerFactory
+from engine.network.server.update_protocol import UpdateServerProtocol
+
+
+class QuietServerEngine(AsyncioServerEngine):
+
+    def on_enter(self):
+        pass
+
+
+class RecordingEventProtocol(EventProtocol):
+
+    def __init__(self, engine):
+        super(RecordingEventProtocol, self).__init__(engine)
+        self.received = []
+
+    def stringReceived(self, data):
+        frame = self.deserialize(data)
+        self.received.append(frame['command'])
+        super(RecordingEventProtocol, self).stringReceived(data)
+
+
+class ClientFactory(object):
+
+    def __init__(self):
+        self.protocol = None
+
+    def buildProtocol(self, addr):
+        self.protocol = RecordingEventProtocol(Engine(None))
+        return self.protocol
+
+
+class CountingDatagramProtocol(DatagramProtocol):
+
+    def __init__(self):
+        self.datagrams = []
+
+    def datagramReceived(self, datagram, addr):
+        self.datagrams.append(datagram)
+
+
+class TestAsyncioNetwork(object):
+
+    def setup(self):
+        self.target = AsyncioNetwork()
+
+    def teardown(self):
+        self.target.loop.close()
+
+    def drain_until(self, condition, timeout=5.):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.target.drain()
+            time.sleep(0.005)
+        return condition()
+
+    def test_one_drain_reads_every_pending_datagram(self):
+        protocol = CountingDatagramProtocol()
+        transport = self.target.listen_udp(0, protocol, interface="127.0.0.1")
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for i in range(50):
+            sender.sendto(bytes([i]), ("127.0.0.1", transport.getHost().port))
+        sender.close()
+        time.sleep(0.05)
+        self.target.drain()
+        assert 50 == len(protocol.datagrams)
+        transport.stopListening()
+
+    def test_repeating_call_keeps_a_fixed_rate(self):
+        calls = []
+        call = RepeatingCall(self.target.loop, lambda: calls.append(self.target.loop.time()), 0.01)
+        self.target.loop.call_later(0.105, self.target.stop)
+        self.target.run()
+        call.stop()
+        assert 10 <= len(calls) <= 12
+
+    def test_client_joins_a_server_over_tcp_and_udp(self):
+        engine = QuietServerEngine(self.target.loop)
+        update_protocol = UpdateServerProtocol(engine)
+        server_factory = BroadcastServerFactory(engine, update_protocol)
+        server = self.target.listen_tcp(0, server_factory, interface="127.0.0.1")
+        port = server.sockets[0].getsockname()[1]
+        udp = self.target.listen_udp(0, update_protocol, interface="127.0.0.1")
+
+        client_factory = ClientFactory()
+        connection = self.target.connect_tcp("127.0.0.1", port, client_factory)
+        client = client_factory.protocol
+        ship = client.engine.smf.manufacture("ship")
+        client.send({"command": "login", "username": "pilot"})
+        client.send({"command": "register_own_ship", "model": client.spawn_schema.describe(ship)})
+        assert self.drain_until(lambda: "enter" in client.received)
+        assert ship.uuid in engine.models
+
+        client_udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client_udp.bind(("127.0.0.1", 0))
+        address = client_udp.getsockname()
+        update_protocol.bind_input(address, engine.models[ship.uuid])
+        client_udp.sendto(InputCommandCodec.encode(1, {"A"}, {}), ("127.0.0.1", udp.getHost().port))
+        assert self.drain_until(lambda: {"A"} == update_protocol.inputs[address].buttons)
+        client_udp.close()
+
+        connection.close()
+        assert self.drain_until(lambda: not server_factory.send_functions)
+        udp.stopListening()
+        server.close()
+        self.target.loop.run_until_complete(server.wait_closed())
@@ -0,0 +1,56 @@
+from engine.models.factories import ShipModelFactory
+from engine.physics.broad_phase import SweepAndPrune
+
+smf = ShipModelFactory()
+
+
+class TestSweepAndPruneCollisionPairGeneration(object):
+
+    def setup(self):
+        self.target = SweepAndPrune()
+        self.ship = smf.manufacture('ship')
+        self.target.init_model_into_2d_space_index(self.ship)
+        self.ship2 = smf.manufacture('ship')
+        self.target.init_model_into_2d_space_index(self.ship2)
+        self.far_ship = smf.manufacture('ship', position=(500, 0, 500))
+        self.target.init_model_into_2d_space_index(self.far_ship)
+
+    def test_candidate_pairs_are_slot_indices(self):
+        pairs = self.target.candidate_pairs()
+        assert (1, 2) == pairs.shape
+        assert {self.target.slot_of(self.ship), self.target.slot_of(self.ship2)} == set(pairs[0])
+
+    def test_ship2_is_other_model_to_ship(self):
+        assert {self.ship2} == self.target.other_models(self.ship)
+
+    def test_ship_and_ship2_are_paired_once(self):
+        pairs = self.target.all_pairs_deduplicated({self.ship, self.ship2})
+        assert {(self.ship, self.ship2)} == pairs or {(self.ship2, self.ship)} == pairs
+
+    def test_unchecked_models_are_not_paired(self):
+        assert set() == self.target.all_pairs_deduplicated({self.far_ship})
+
+    def test_cleared_model_is_not_paired(self):
+        self.target.clear_model_from_2d_space_index(self.ship2)
+        assert set() == self.target.all_pairs_deduplicated({self.ship})
+
+
+class TestSweepAndPruneReindex(object):
+
+    def setup(self):
+        self.target = SweepAndPrune(capacity=1)
+        self.ship = smf.manufacture('ship')
+        self.ship2 = smf.manufacture('ship', position=(100, 0, 0))
+        self.target.init_model_into_2d_space_index(self.ship)
+        self.target.init_model_into_2d_space_index(self.ship2)
+
+    def test_capacity_grows(self):
+        assert 2 == self.target.capacity
+
+    def test_ships_apart_are_not_paired(self):
+        assert set() == self.target.all_pairs_deduplicated({self.ship, self.ship2})
+
+    def test_moved_ship_is_paired(self):
+        self.ship2.teleport_to(0, 0, 0)
+        self.target.reindex_spacial_position(self.ship2)
+        assert 1 == len(self.target.all_pairs_deduplicated({self.ship2}))
@@ -0,0 +1,62 @@
+from twisted.internet.address import IPv4Address
+from twisted.test.proto_helpers import StringTransport
+
+from engine.network.server.event_protocol import BroadcastProtocol
+from engine.network.server.factories import BroadcastServerFactory
+from engine.network.server.update_protocol import UpdateServerProtocol
+from engine.tests.fake_network import UnscheduledEngine
+
+
+class CountingBroadcastProtocol(BroadcastProtocol):
+
+    serialized = 0
+
+    @classmethod
+    def serialize(cls, d: dict) -> bytes:
+        CountingBroadcastProtocol.serialized += 1
+        return super(CountingBroadcastProtocol, cls).serialize(d)
+
+
+class CountingFactory(BroadcastServerFactory):
+
+    protocol = CountingBroadcastProtocol
+
+
+class TestBroadcastFanOut(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.target = CountingFactory(self.engine, UpdateServerProtocol(self.engine))
+        self.protocols = []
+        for i in range(4):
+            protocol = self.target.buildProtocol(IPv4Address('TCP', "10.0.0.{}".format(i), 5000 + i))
+            protocol.makeConnection(StringTransport())
+            self.protocols.append(protocol)
+        CountingBroadcastProtocol.serialized = 0
+        self.asteroid = self.engine.amf.manufacture((0, 0, 0))
+        self.frame = {"command": "spawn", "model": self.protocols[0].spawn_schema.describe(self.asteroid)}
+
+    def test_serializes_once(self):
+        self.target.broadcast(self.frame, self.protocols[0].uuid)
+        assert 1 == CountingBroadcastProtocol.serialized
+
+    def test_everyone_but_the_origin_gets_the_same_bytes(self):
+        self.target.broadcast(self.frame, self.protocols[0].uuid)
+        received = [protocol.transport.value() for protocol in self.protocols]
+        assert b'' == received[0]
+        assert received[1] == received[2] == received[3] != b''
+
+    def test_lost_connections_are_forgotten(self):
+        self.protocols[1].connectionLost()
+        self.target.broadcast(self.frame, self.protocols[0].uuid)
+        assert b'' == self.protocols[1].transport.value()
+        assert self.protocols[1].uuid not in self.target.send_functions
+
+    def test_frames_are_not_printed_by_default(self, capsys):
+        self.target.broadcast(self.frame, self.protocols[0].uuid)
+        assert "" == capsys.readouterr().out
+
+    def test_frames_can_be_logged(self, capsys):
+        self.protocols[1].log_frames = True
+        self.target.broadcast(self.frame, self.protocols[0].uuid)
+        assert "spawn" in capsys.readouterr().out
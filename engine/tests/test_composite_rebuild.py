@@ -0,0 +1,81 @@
+from engine.models.factories import ShipModelFactory, ShipPartModelFactory
+
+
+def hull(ship):
+    bbox = ship.bounding_box
+    return round(bbox.left, 9), round(bbox.right, 9), round(bbox.bottom, 9), round(bbox.top, 9)
+
+
+def rebuilt(ship):
+    ship.rebuild()
+    ship.rebuild_if_needed()
+    return ship
+
+
+class TestLazyRebuild(object):
+
+    def setup(self):
+        self.target = ShipModelFactory().manufacture("ship")
+        self.rebuilds = []
+        self.target.observe(lambda: self.rebuilds.append(None), "rebuild")
+        self.part = next(iter(self.target.parts))
+
+    def test_part_moves_only_mark_the_ship(self):
+        bbox = self.target._bounding_box
+        self.part.set_position(self.part.x + 50, 0, self.part.z)
+        self.part.set_position(self.part.x + 50, 0, self.part.z)
+        assert self.target._rebuild_needed
+        assert bbox is self.target._bounding_box
+        assert [] == self.rebuilds
+
+    def test_rebuild_happens_once_on_demand(self):
+        self.part.set_position(self.part.x + 50, 0, self.part.z)
+        self.part.set_position(self.part.x + 50, 0, self.part.z)
+        assert self.target.bounding_box.right >= self.part.x + 0.5
+        self.target.mass
+        assert 1 == len(self.rebuilds)
+        assert not self.target._rebuild_needed
+
+    def test_rebuild_happens_once_per_tick(self):
+        self.part.set_position(self.part.x + 50, 0, self.part.z)
+        self.target._rebuild_needed = True
+        self.target.run(1 / 60)
+        self.target.run(1 / 60)
+        assert 1 == len(self.rebuilds)
+
+
+class TestIncrementalParts(object):
+
+    def setup(self):
+        self.target = rebuilt(ShipModelFactory().manufacture("ship"))
+        self.rebuilds = []
+        self.target.observe(lambda: self.rebuilds.append(None), "rebuild")
+        self.part_factory = ShipPartModelFactory()
+
+    def state(self, ship):
+        return hull(ship), round(ship.mass, 9), round(ship.inertia, 6), tuple(round(c, 9) for c in ship.center_of_mass)
+
+    def add(self):
+        part = self.part_factory.manufacture("generator", position=(0, 0, 7))
+        self.target.add_part(part)
+        return part
+
+    def test_adding_matches_a_full_rebuild(self):
+        self.add()
+        assert not self.target._rebuild_needed
+        assert 1 == len(self.rebuilds)
+        incremental = self.state(self.target)
+        assert self.state(rebuilt(self.target)) == incremental
+
+    def test_removing_matches_a_full_rebuild(self):
+        part = max(self.target.parts, key=lambda part: part.position.distance)
+        self.target.remove_part(part)
+        assert not self.target._rebuild_needed
+        assert part.uuid not in {bbox.part_id for bbox in self.target.bounding_box}
+        incremental = self.state(self.target)
+        assert self.state(rebuilt(self.target)) == incremental
+
+    def test_adding_and_removing_restores_the_ship(self):
+        before = self.state(self.target)
+        self.target.remove_part(self.add())
+        assert before == self.state(self.target)
@@ -1,4 +1,4 @@
-from engine.physics.polygon import Polygon
+from engine.physics.polygon import Polygon, cached_convex_hull
 
 
 class TestConvexHullAngles(object):
@@ -30,3 +30,29 @@ class TestConvexHull(object):
     def test_hull(self):
         assert {(1, 1), (-1, 1), (-1, -1), (1, -1)} == set(self.hull)
 
+
+
+class TestConvexHullContract(object):
+
+    def setup(self):
+        points = [(0, 0), (1, 0), (2, 0), (2, 2), (1, 1), (0, 2)]
+        self.hull = Polygon.convex_hull(points)
+
+    def test_collinear_points_are_dropped(self):
+        assert {(0, 0), (2, 0), (2, 2), (0, 2)} == set(self.hull)
+
+    def test_hull_is_clockwise(self):
+        hull = Polygon.manufacture(self.hull)
+        assert all(line.on_left_side(1, 1) for line in hull.lines)
+
+
+class TestCachedConvexHull(object):
+
+    def setup(self):
+        self.points = frozenset([(0, 0), (1, 1), (-1, 1), (-1, -1), (1, -1)])
+
+    def test_cached_hull_matches_hull(self):
+        assert tuple(Polygon.convex_hull(self.points)) == cached_convex_hull(self.points)
+
+    def test_cached_hull_is_reused(self):
+        assert cached_convex_hull(self.points) is cached_convex_hull(frozenset(self.points))
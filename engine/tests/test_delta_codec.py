@@ -0,0 +1,194 @@
+from uuid import uuid4
+
+import pytest
+
+from engine.network.delta_codec import DeltaSnapshotCodec, DeltaSession, SnapshotRing
+from engine.network.server.update_protocol import UpdateServerProtocol
+from engine.network.snapshot_codec import ModelIndexTable
+from engine.tests.fake_network import UnscheduledEngine, DatagramTransport, frame
+
+
+class TestSnapshotRing(object):
+
+    def setup(self):
+        self.target = SnapshotRing(size=4)
+
+    def test_sequences_start_at_one(self):
+        assert 1 == self.target.push("a")
+        assert "a" == self.target.get(1)
+        assert self.target.get(0) is None
+
+    def test_old_snapshots_are_overwritten(self):
+        for snapshot in "abcde":
+            self.target.push(snapshot)
+        assert self.target.get(1) is None
+        assert "e" == self.target.get(5)
+
+
+class TestDeltaSnapshotCodec(object):
+
+    def setup(self):
+        self.uuids = [uuid4() for _ in range(10)]
+        self.codec = DeltaSnapshotCodec(ModelIndexTable())
+        self.server = DeltaSession(self.codec)
+        self.client = DeltaSnapshotCodec(ModelIndexTable())
+        for uuid in self.uuids:
+            self.client.model_indices.register(self.codec.model_indices.assign(uuid), uuid)
+        self.frames = [frame(uuid, x=i) for i, uuid in enumerate(self.uuids)]
+
+    def moved(self):
+        frames = list(self.frames)
+        frames[3] = frame(self.uuids[3], x=100, spin=3)
+        return frames
+
+    def send(self, sequence, frames, acked=None):
+        if acked is not None:
+            self.server.acknowledge(acked)
+        packet, = self.server.encode_packets(sequence, self.codec.records(frames))
+        return packet
+
+    def test_first_snapshot_is_complete(self):
+        assert self.frames == self.client.decode(self.send(1, self.frames))
+
+    def test_delta_only_carries_changed_models(self):
+        full = self.send(1, self.frames)
+        self.client.decode(full)
+        delta = self.send(2, self.moved(), acked=1)
+        assert [frame(self.uuids[3], x=100, spin=3)] == self.client.decode(delta)
+        assert len(delta) < len(full) / 5
+
+    def test_unchanged_fields_are_filled_from_the_baseline(self):
+        self.client.decode(self.send(1, self.frames))
+        frames = self.moved()
+        frames[3]['rotation'] = 45.0
+        self.client.decode(self.send(2, frames, acked=1))
+        assert [self.frames[3]] == self.client.decode(self.send(3, self.frames, acked=2))
+
+    def test_decoding_a_snapshot_queues_an_ack(self):
+        self.client.decode(self.send(1, self.frames))
+        assert 1 == DeltaSnapshotCodec.read_ack(self.client.take_ack())
+        assert self.client.take_ack() is None
+
+    def test_missing_baseline_applies_only_complete_records_and_does_not_ack(self):
+        self.send(1, self.frames)
+        new_uuid = uuid4()
+        self.client.model_indices.register(self.codec.model_indices.assign(new_uuid), new_uuid)
+        delta = self.send(2, self.moved() + [frame(new_uuid, x=7)], acked=1)
+        assert [frame(new_uuid, x=7)] == self.client.decode(delta)
+        assert self.client.take_ack() is None
+
+    def test_removed_models_leave_the_client_snapshot(self):
+        self.client.decode(self.send(1, self.frames))
+        self.client.decode(self.send(2, self.frames[1:], acked=1))
+        assert self.codec.model_indices.index(self.uuids[0]) not in self.client.snapshots.get(2)['index']
+
+    def test_stale_snapshots_are_ignored(self):
+        first = self.send(1, self.frames)
+        self.client.decode(self.send(2, self.moved()))
+        assert [] == self.client.decode(first)
+
+    def test_unacked_baseline_is_never_used(self):
+        self.send(1, self.frames)
+        assert len(self.send(1, self.frames)) == len(self.send(2, self.moved()))
+
+    def test_sessions_with_the_same_view_and_baseline_share_bytes(self):
+        other = DeltaSession(self.codec)
+        records = self.codec.records(self.frames)
+        encoded = {}
+        assert self.server.encode_packets(1, records, encoded) is other.encode_packets(1, records, encoded)
+
+    def test_unsequenced_updates_round_trip(self):
+        assert self.frames[:2] == self.client.decode(self.codec.encode(self.frames[:2]))
+        assert 0 == self.client.snapshots.latest
+
+
+class TestDeltaPackets(object):
+
+    def setup(self):
+        self.codec = DeltaSnapshotCodec(ModelIndexTable())
+        self.server = DeltaSession(self.codec)
+        self.client = DeltaSnapshotCodec(self.codec.model_indices)
+        self.frames = [frame(uuid4(), x=i) for i in range(400)]
+        for f in self.frames:
+            self.codec.model_indices.assign(f['uuid'])
+        self.packets = self.server.encode_packets(1, self.codec.records(self.frames))
+
+    def test_packets_fit_the_mtu(self):
+        assert 1 < len(self.packets)
+        assert all(len(packet) <= DeltaSnapshotCodec.max_packet_size for packet in self.packets)
+
+    def test_parts_apply_as_they_arrive_and_ack_when_complete(self):
+        applied = 0
+        for packet in self.packets:
+            assert self.client.take_ack() is None
+            applied += len(self.client.decode(packet))
+        assert 400 == applied
+        assert 1 == DeltaSnapshotCodec.read_ack(self.client.take_ack())
+        assert 400 == len(self.client.snapshots.get(1))
+
+    def test_lost_part_leaves_the_baseline_unacked(self):
+        for packet in self.packets[1:]:
+            self.client.decode(packet)
+        assert self.client.take_ack() is None
+        packets = self.server.encode_packets(2, self.codec.records(self.frames))
+        for packet in packets:
+            self.client.decode(packet)
+        assert 2 == DeltaSnapshotCodec.read_ack(self.client.take_ack())
+
+    def test_removals_can_span_packets(self):
+        for packet in self.packets:
+            self.client.decode(packet)
+        self.server.acknowledge(1)
+        packets = self.server.encode_packets(2, self.codec.records(self.frames[:5]))
+        assert 1 < len(packets)
+        assert all(len(packet) <= DeltaSnapshotCodec.max_packet_size for packet in packets)
+        for packet in packets:
+            self.client.decode(packet)
+        assert 5 == len(self.client.snapshots.get(2))
+
+
+class TestUpdateServerProtocolDeltas(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.engine.spawn_asteroids(30, area=2000)
+        self.target = UpdateServerProtocol(self.engine)
+        self.target.transport = DatagramTransport()
+        self.address = ("10.0.0.1", 8002)
+        self.target.register_address(*self.address)
+        self.target.use_codec_for(self.address, "delta")
+        self.client = DeltaSnapshotCodec(ModelIndexTable())
+
+    def receive(self):
+        size = 0
+        frames = []
+        for datagram, _ in self.target.transport.written:
+            size += len(datagram)
+            frames += self.client.decode(datagram)
+        self.target.transport.written = []
+        return size, frames
+
+    def test_acked_client_receives_deltas(self):
+        self.target.update(0)
+        for uuid in self.engine.models:
+            self.client.model_indices.register(self.target.model_indices.index(uuid), uuid)
+        full_size, _ = self.receive()
+        self.target.datagramReceived(self.client.take_ack(), self.address)
+        moving = next(iter(self.engine.models.values()))
+        moving.teleport_to(1, 0, 1)
+        self.target.update(0)
+        delta_size, frames = self.receive()
+        assert [moving.uuid] == [f['uuid'] for f in frames]
+        assert 1 == pytest.approx(frames[0]['position'][0])
+        assert delta_size * 10 < full_size
+
+    def test_unacked_client_keeps_receiving_full_snapshots(self):
+        self.target.update(0)
+        full_size, _ = self.receive()
+        self.target.update(0)
+        assert full_size == self.receive()[0]
+
+    def test_renegotiating_forgets_the_ack(self):
+        self.target.sessions[self.address].acknowledge(1)
+        self.target.use_codec_for(self.address, "delta")
+        assert 0 == self.target.sessions[self.address].acked
@@ -27,11 +27,9 @@ class TestDryDockSave(object):
     def test_nothing_observes_no_old_parts(self):
         for part in self.original_parts:
             for signal in ["working", "explode", "alive"]:
-                part._prune_removed_observers(signal)
-                assert not part._observers[signal]
+                assert not part._observers.get(signal)
 
     def test_ship_observes_new_parts(self):
         for part in self.parts_after_save:
             for signal in ["alive"]:
-                part._introduce_new_observers(signal)
-                assert part._observers[signal]
+                assert part._observers.get(signal)
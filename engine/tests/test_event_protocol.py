@@ -1,5 +1,10 @@
+from twisted.test.proto_helpers import StringTransport
+
+from engine.engine import Engine
 from engine.network.server.event_protocol import BroadcastProtocol
+from engine.network.server.update_protocol import UpdateServerProtocol
 from engine.network.client.event_protocol import ClientProtocol
+from engine.tests.fake_network import UnscheduledEngine
 from io import BytesIO
 
 
@@ -55,4 +60,54 @@ class _TestClientProtocol(object):
     def test_connect(self):
         self.server.connectionMade()
         self.target.seek(0)
-        assert b'spawn' in self.target.read()
\ No newline at end of file
+        assert b'spawn' in self.target.read()
+
+class HeadlessClientEngine(Engine):
+
+    callsign = "tester"
+
+    def __init__(self):
+        super().__init__(None)
+        self.my_model = self.smf.manufacture("ship")
+        self.spawn(self.my_model)
+
+    def schedule_interval(self, func, interval):
+        pass
+
+    def start_network(self):
+        pass
+
+
+def deliver(source, target):
+    data = source.transport.value()
+    source.transport.clear()
+    target.dataReceived(data)
+
+
+class TestEchoedDecay(object):
+
+    def setup(self):
+        self.server_engine = UnscheduledEngine(None)
+        self.server = BroadcastProtocol(self.server_engine, lambda *args: None,
+                                        update_protocol=UpdateServerProtocol(self.server_engine),
+                                        update_address=("10.0.0.1", 8002))
+        self.server.makeConnection(StringTransport())
+        self.client_engine = HeadlessClientEngine()
+        self.target = ClientProtocol(self.client_engine)
+        self.target.makeConnection(StringTransport())
+        deliver(self.target, self.server)
+        deliver(self.server, self.target)
+
+    def test_client_survives_the_echo_of_its_own_decay(self):
+        asteroid = self.client_engine.amf.manufacture((10, 0, 0))
+        self.client_engine.spawn_with_callback(asteroid)
+        deliver(self.target, self.server)
+        self.server.update_protocol.interest.refresh()
+        deliver(self.server, self.target)
+        self.client_engine.decay_with_callback(asteroid)
+        deliver(self.target, self.server)
+        self.server.update_protocol.interest.refresh()
+        assert b'' == self.server.transport.value()
+        self.server.send_decay_model(asteroid)
+        deliver(self.server, self.target)
+        assert asteroid.uuid not in self.client_engine.models
@@ -0,0 +1,75 @@
+import pytest
+
+from engine.engine import Engine
+from engine.headless import PhaseHistogram, TickRecorder, HeadlessRunner
+
+
+class TestPhaseHistogram(object):
+
+    def setup(self):
+        self.target = PhaseHistogram()
+        for millis in range(1, 101):
+            self.target.record(millis / 1000)
+
+    def test_count_and_mean(self):
+        assert 100 == self.target.count
+        assert 0.0505 == pytest.approx(self.target.mean)
+
+    def test_percentiles_are_within_bucket_growth(self):
+        assert 0.050 <= self.target.percentile(50) <= 0.050 * 1.05
+        assert 0.095 <= self.target.percentile(95) <= 0.095 * 1.05
+        assert 0.099 <= self.target.percentile(99) <= 0.1
+
+    def test_percentile_never_exceeds_max(self):
+        assert 0.1 == self.target.percentile(100)
+
+    def test_empty_histogram_reports_zero(self):
+        assert 0 == PhaseHistogram().percentile(99)
+
+
+class CountingEngine(Engine):
+
+    updates = 0
+
+    def update(self, dt):
+        self.updates += 1
+        super(CountingEngine, self).update(dt)
+
+
+class TestHeadlessRunner(object):
+
+    def setup(self):
+        self.engine = Engine(None)
+        self.engine.spawn_asteroids(5, area=500)
+        for model in self.engine.models.values():
+            model.set_movement(10, 0, 0)
+        self.target = HeadlessRunner(self.engine, dt=0.5)
+
+    def test_every_phase_is_recorded_per_tick(self):
+        self.target.run(3)
+        summary = self.target.recorder.summary()
+        assert list(TickRecorder.phases) == list(summary)
+        assert all(3 == row['count'] for row in summary.values())
+
+    def test_steps_use_the_fixed_dt(self):
+        model = next(iter(self.engine.models.values()))
+        x = model.position[0]
+        self.target.run(4)
+        assert x + 20 == pytest.approx(model.position[0])
+
+    def test_report_lists_every_phase(self):
+        self.target.run(1)
+        report = self.target.recorder.report()
+        assert all(phase in report for phase in TickRecorder.phases)
+
+    def test_paced_run_holds_the_tick_rate(self):
+        self.target.dt = 0.01
+        self.target.run(3, paced=True)
+        assert 3 == self.target.ticks
+
+    def test_engine_update_overrides_are_run(self):
+        engine = CountingEngine(None)
+        runner = HeadlessRunner(engine)
+        runner.run(2)
+        assert 2 == engine.updates
+        assert 2 == runner.recorder.summary()['collisions']['count']
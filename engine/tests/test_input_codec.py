@@ -0,0 +1,113 @@
+from engine.models.factories import ProjectileModelFactory
+from engine.network.input_codec import InputCommandCodec, RemoteInput
+from engine.network.server.event_protocol import BroadcastProtocol
+from engine.network.server.update_protocol import UpdateServerProtocol
+from engine.network.snapshot_codec import PickleSnapshotCodec
+from engine.physics.force import MutableOffsets, MutableDegrees
+from engine.tests.fake_network import UnscheduledEngine
+
+
+class TestInputCommandCodec(object):
+
+    def test_round_trip(self):
+        data = InputCommandCodec.encode(7, {"W", "SPACE", 1}, {"x": 0.5, "-rz": 1.0})
+        sequence, buttons, axis = InputCommandCodec.decode(data)
+        assert 7 == sequence
+        assert {"W", "SPACE", 1} == buttons
+        assert abs(axis["x"] - 0.5) < 0.01
+        assert 1.0 == axis["-rz"]
+        assert 0 == axis["y"]
+
+    def test_is_small(self):
+        assert len(InputCommandCodec.encode(1, {"W", "A"}, RemoteInput().axis)) < 32
+
+    def test_accepts(self):
+        assert InputCommandCodec.accepts(InputCommandCodec.encode(1, set(), {}))
+        assert not InputCommandCodec.accepts(b'MS\x02')
+
+
+class TestRemoteInput(object):
+
+    def setup(self):
+        self.target = RemoteInput()
+
+    def test_stale_commands_are_dropped(self):
+        self.target.apply(2, {"W"}, {})
+        assert not self.target.apply(1, {"A"}, {})
+        assert {"W"} == self.target.buttons
+
+    def test_consumed_button_stays_consumed_while_held(self):
+        self.target.apply(1, {"SPACE"}, {})
+        self.target.buttons.discard("SPACE")
+        self.target.apply(2, {"SPACE"}, {})
+        assert set() == self.target.buttons
+        self.target.apply(3, set(), {})
+        self.target.apply(4, {"SPACE"}, {})
+        assert {"SPACE"} == self.target.buttons
+
+
+class TestAuthoritativeInput(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.target = UpdateServerProtocol(self.engine)
+        self.address = ("10.0.0.1", 8002)
+        self.ship = self.engine.smf.manufacture("ship")
+        self.engine.spawn(self.ship)
+        self.target.bind_input(self.address, self.ship)
+
+    def run(self, ticks=30):
+        for _ in range(ticks):
+            self.engine.update(1 / 60)
+
+    def test_thrust_moves_the_ship(self):
+        self.target.datagramReceived(InputCommandCodec.encode(1, {"A", "D"}, {}), self.address)
+        self.run()
+        assert (0, 0, 0) != tuple(self.ship.position)
+
+    def test_other_addresses_are_ignored(self):
+        self.target.datagramReceived(InputCommandCodec.encode(1, {"A", "D"}, {}), ("10.0.0.2", 8002))
+        self.run()
+        assert (0, 0, 0) == tuple(self.ship.position)
+
+    def test_client_state_is_not_applied(self):
+        frame = self.ship.data_dict
+        frame['position'] = (500, 0, 500)
+        self.target.datagramReceived(PickleSnapshotCodec(self.target.model_indices).encode([frame]), self.address)
+        self.target.datagramReceived(self.target.codecs["binary"].encode([frame]), self.address)
+        assert (0, 0, 0) == tuple(self.ship.position)
+
+    def test_releasing_removes_the_controller(self):
+        self.target.release_input(self.address)
+        self.target.datagramReceived(InputCommandCodec.encode(1, {"A", "D"}, {}), self.address)
+        self.run()
+        assert (0, 0, 0) == tuple(self.ship.position)
+
+
+class TestServerExpiredDecay(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.target = BroadcastProtocol(self.engine, lambda *args: None)
+        plasma = ProjectileModelFactory().manufacture(
+            "plasma", MutableOffsets(0, 0, 0), MutableDegrees(0, 0, 0), MutableOffsets(0, 0, 100),
+            MutableDegrees(0, 0, 0), MutableOffsets(0, 0, 0), MutableDegrees(0, 0, 0))
+        self.plasma = self.target.spawn_model({"command": "spawn", "model": self.target.spawn_schema.describe(plasma)})
+
+    def test_late_client_decay_is_ignored(self):
+        for _ in range(300):
+            self.engine.update(1 / 60)
+        assert self.plasma.uuid not in self.engine.models
+        frame = {"command": "decay", "model_uuid": self.plasma.uuid}
+        self.target.stringReceived(self.target.serialize(frame))
+        assert self.plasma.uuid not in self.engine.models
+
+    def test_client_decay_still_removes_live_models(self):
+        self.target.stringReceived(self.target.serialize({"command": "decay", "model_uuid": self.plasma.uuid}))
+        assert self.plasma.uuid not in self.engine.models
+
+    def test_decays_of_models_spawned_elsewhere_are_ignored(self):
+        asteroid = self.engine.amf.manufacture((0, 0, 0))
+        self.engine.spawn(asteroid)
+        self.target.stringReceived(self.target.serialize({"command": "decay", "model_uuid": asteroid.uuid}))
+        assert asteroid.uuid in self.engine.models
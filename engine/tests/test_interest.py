@@ -0,0 +1,193 @@
+from engine.network.delta_codec import DeltaSnapshotCodec
+from engine.network.server.event_protocol import BroadcastProtocol
+from engine.network.server.interest import InterestManager
+from engine.network.server.update_protocol import UpdateServerProtocol
+from engine.tests.fake_network import UnscheduledEngine, DatagramTransport
+
+
+class TestInterestManager(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.ship = self.spawn(0, 0)
+        self.close = self.spawn(150, 0)
+        self.distant = self.spawn(0, 700)
+        self.beyond = self.spawn(-2000, 0)
+        self.entered = []
+        self.left = []
+        self.target = InterestManager(self.engine)
+        self.focus = self.target.focus("client", self.ship, on_enter=self.entered.append, on_leave=self.left.append)
+
+    def spawn(self, x, z):
+        model = self.engine.amf.manufacture((x, 0, z))
+        self.engine.spawn(model)
+        return model
+
+    def test_near_and_far_sets(self):
+        assert {self.ship, self.close} == self.focus.near
+        assert {self.distant} == self.focus.far
+
+    def test_focusing_enters_everything_of_interest(self):
+        assert {self.ship, self.close, self.distant} == set(self.entered)
+
+    def test_near_only_without_far(self):
+        assert self.focus.near == self.focus.models(include_far=False)
+
+    def test_model_moving_in_enters(self):
+        self.beyond.teleport_to(-900, 0, 0)
+        self.target.refresh()
+        assert [self.beyond] == self.entered[3:]
+
+    def test_model_moving_out_leaves_past_the_margin(self):
+        self.distant.teleport_to(0, 0, 1050)
+        self.target.refresh()
+        assert [] == self.left
+        self.distant.teleport_to(0, 0, 1200)
+        self.target.refresh()
+        assert [self.distant] == self.left
+
+    def test_decayed_model_leaves(self):
+        self.engine.decay(self.close.uuid)
+        self.target.refresh()
+        assert [self.close] == self.left
+
+    def test_unfocus(self):
+        self.target.unfocus("client")
+        assert "client" not in self.target
+
+
+class TestUpdateServerProtocolInterest(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.target = UpdateServerProtocol(self.engine)
+        self.target.transport = DatagramTransport()
+        self.ship = self.spawn(0, 0)
+        self.close = self.spawn(150, 0)
+        self.distant = self.spawn(0, 700)
+        self.beyond = self.spawn(-2000, 0)
+        self.address = ("10.0.0.1", 8002)
+        self.target.register_address(*self.address)
+        self.target.interest.focus(self.address, self.ship)
+
+    def spawn(self, x, z):
+        model = self.engine.amf.manufacture((x, 0, z))
+        self.engine.spawn(model)
+        return model
+
+    def received(self):
+        datagram, _ = self.target.transport.written.pop()
+        return {frame['uuid'] for frame in self.target.deserialize(datagram)}
+
+    def test_only_models_of_interest_are_sent(self):
+        self.target.sequence = self.target.interest.far_interval - 1
+        self.target.update(0)
+        assert {self.ship.uuid, self.close.uuid, self.distant.uuid} == self.received()
+
+    def test_distant_models_are_sent_less_often(self):
+        self.target.update(0)
+        assert {self.ship.uuid, self.close.uuid} == self.received()
+
+    def test_relayed_updates_are_filtered(self):
+        self.target.send([self.beyond.data_dict, self.close.data_dict])
+        assert {self.close.uuid} == self.received()
+
+    def test_delta_clients_hold_distant_models_between_refreshes(self):
+        self.target.use_codec_for(self.address, "delta")
+        self.target.sequence = self.target.interest.far_interval - 1
+        self.target.update(0)
+        self.target.sessions[self.address].acknowledge(self.target.sequence)
+        self.distant.teleport_to(0, 0, 650)
+        self.target.update(0)
+        view = self.target.sessions[self.address].latest_view
+        index = self.target.model_indices.index(self.distant.uuid)
+        assert 700 == view[view['index'] == index]['position'][0][2]
+        datagram, _ = self.target.transport.written.pop()
+        assert DeltaSnapshotCodec.header.size == len(datagram)
+
+    def test_decayed_models_are_forgotten(self):
+        self.target.update(0)
+        assert self.close.uuid in self.target.model_indices
+        self.close.set_alive(False)
+        self.engine.decay_models([self.close])
+        assert self.close.uuid not in self.target.model_indices
+        self.target.update(0)
+        assert {self.ship.uuid} == self.received()
+
+
+class TestBroadcastProtocolInterest(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.update_protocol = UpdateServerProtocol(self.engine)
+        self.address = ("10.0.0.1", 8002)
+        self.target = BroadcastProtocol(self.engine, lambda *args: None, update_protocol=self.update_protocol,
+                                        update_address=self.address)
+        self.sent = []
+        self.target.send = self.sent.append
+        self.close = self.spawn(150, 0)
+        self.beyond = self.spawn(-2000, 0)
+        self.ship = self.engine.amf.manufacture((0, 0, 0))
+
+    def spawn(self, x, z):
+        model = self.engine.amf.manufacture((x, 0, z))
+        self.engine.spawn(model)
+        return model
+
+    def spawn_from_client(self, x, z):
+        model = self.engine.amf.manufacture((x, 0, z))
+        return self.target.spawn_model({"command": "spawn", "model": self.target.spawn_schema.describe(model)})
+
+    def test_joining_spawns_only_models_of_interest(self):
+        self.target.register_own_ship({"command": "register_own_ship",
+                                       "model": self.target.spawn_schema.describe(self.ship)})
+        spawned = {frame['model']['uuid'] for frame in self.sent if frame['command'] == "spawn"}
+        assert {self.ship.uuid, self.close.uuid} == spawned
+
+    def test_leaving_interest_sends_a_decay(self):
+        self.target.register_own_ship({"command": "register_own_ship",
+                                       "model": self.target.spawn_schema.describe(self.ship)})
+        self.close.teleport_to(3000, 0, 0)
+        self.update_protocol.interest.refresh()
+        decays = [frame['model_uuid'] for frame in self.sent if frame['command'] == "decay"]
+        assert [self.close.uuid] == decays
+
+    def test_disconnecting_drops_the_focus(self):
+        self.target.register_own_ship({"command": "register_own_ship",
+                                       "model": self.target.spawn_schema.describe(self.ship)})
+        self.target.connectionLost()
+        assert self.address not in self.update_protocol.interest
+
+    def test_decays_from_the_client_are_not_echoed(self):
+        self.target.register_own_ship({"command": "register_own_ship",
+                                       "model": self.target.spawn_schema.describe(self.ship)})
+        plasma = self.spawn_from_client(20, 0)
+        self.update_protocol.interest.refresh()
+        self.target.decay_model({"command": "decay", "model_uuid": plasma.uuid})
+        self.update_protocol.interest.refresh()
+        assert plasma.uuid not in self.engine.models
+        assert [] == [frame for frame in self.sent if frame['command'] == "decay"]
+        assert not self.target.decayed_by_client
+
+    def test_decays_of_models_the_client_did_not_spawn_are_ignored(self):
+        self.target.register_own_ship({"command": "register_own_ship",
+                                       "model": self.target.spawn_schema.describe(self.ship)})
+        self.target.decay_model({"command": "decay", "model_uuid": self.close.uuid})
+        assert self.close.uuid in self.engine.models
+        assert self.close.uuid in self.update_protocol.model_indices
+
+    def test_decays_from_the_client_forget_the_model_index(self):
+        self.target.register_own_ship({"command": "register_own_ship",
+                                       "model": self.target.spawn_schema.describe(self.ship)})
+        plasma = self.spawn_from_client(20, 0)
+        assert plasma.uuid in self.update_protocol.model_indices
+        self.target.decay_model({"command": "decay", "model_uuid": plasma.uuid})
+        assert plasma.uuid not in self.update_protocol.model_indices
+
+    def test_decays_from_the_server_are_sent(self):
+        self.target.register_own_ship({"command": "register_own_ship",
+                                       "model": self.target.spawn_schema.describe(self.ship)})
+        self.engine.decay(self.close.uuid)
+        self.update_protocol.interest.refresh()
+        decays = [frame['model_uuid'] for frame in self.sent if frame['command'] == "decay"]
+        assert [self.close.uuid] == decays
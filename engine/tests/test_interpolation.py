@@ -0,0 +1,113 @@
+from uuid import uuid4
+
+import pytest
+
+from engine.engine import Engine
+from engine.network.client.interpolation import SnapshotBuffer, Reconciler, interpolate_frame
+
+
+def frame(uuid, x=0., rotation=0., mx=0.):
+    return {"uuid": uuid, "position": [x, 0, 0], "rotation": rotation, "movement": [mx, 0, 0], "spin": 0.,
+            "acceleration": [0, 0, 0], "torque": 0.}
+
+
+class TestInterpolateFrame(object):
+
+    def test_halfway(self):
+        uuid = uuid4()
+        halfway = interpolate_frame(frame(uuid, x=0, mx=2), frame(uuid, x=10, mx=4), 0.5)
+        assert [5, 0, 0] == halfway['position']
+        assert [3, 0, 0] == halfway['movement']
+
+    def test_rotation_takes_the_short_way_around(self):
+        uuid = uuid4()
+        halfway = interpolate_frame(frame(uuid, rotation=350), frame(uuid, rotation=10), 0.5)
+        assert 0 == pytest.approx(halfway['rotation'] % 360)
+
+
+class TestSnapshotBuffer(object):
+
+    def setup(self):
+        self.uuid = uuid4()
+        self.target = SnapshotBuffer(delay_snapshots=2., interval=0.1)
+        for i in range(4):
+            self.target.push(i * 0.1, [frame(self.uuid, x=i * 10)])
+
+    def test_renders_in_the_past_between_snapshots(self):
+        rendered, = self.target.frames(0.35)
+        assert 15 == pytest.approx(rendered['position'][0])
+
+    def test_holds_the_oldest_before_the_buffer(self):
+        rendered, = self.target.frames(0.1)
+        assert 0 == rendered['position'][0]
+
+    def test_leaves_models_alone_past_the_newest_snapshot(self):
+        assert [] == self.target.frames(0.6)
+
+    def test_interval_follows_the_arrival_rate(self):
+        for i in range(4, 40):
+            self.target.push(i * 0.2, [frame(self.uuid, x=i * 10)])
+        assert 0.2 == pytest.approx(self.target.interval, abs=0.01)
+
+    def test_packets_of_one_snapshot_do_not_shrink_the_interval(self):
+        self.target.push(0.3001, [frame(uuid4())])
+        assert 0.1 == pytest.approx(self.target.interval)
+
+    def test_silent_models_are_dropped(self):
+        self.target.frames(5)
+        assert self.uuid not in self.target
+
+    def test_forget(self):
+        self.target.forget(self.uuid)
+        assert [] == self.target.frames(0.35)
+
+
+class TestReconciler(object):
+
+    def setup(self):
+        self.engine = Engine(None)
+        self.model = self.engine.amf.manufacture((0, 0, 0))
+        self.model.set_movement(10, 0, 0)
+        self.target = Reconciler(snap_distance=25., correction_time=0.25)
+        for i in range(10):
+            self.target.record(i * 0.1, self.model)
+            self.model.run(0.1)
+
+    def authoritative(self, t, x_offset=0., mx=10.):
+        return frame(self.model.uuid, x=t * 10 + x_offset, mx=mx)
+
+    def test_agreeing_server_changes_nothing(self):
+        x = self.model.x
+        self.target.reconcile(0.5, self.authoritative(0.5), self.model)
+        self.target.correct(self.model, 0.1)
+        assert x == pytest.approx(self.model.x)
+
+    def test_small_errors_are_blended_in(self):
+        x = self.model.x
+        self.target.reconcile(0.5, self.authoritative(0.5, x_offset=4), self.model)
+        self.target.correct(self.model, 0.125)
+        assert x + 2 == pytest.approx(self.model.x)
+        self.target.correct(self.model, 0.25)
+        assert x + 4 == pytest.approx(self.model.x)
+
+    def test_large_errors_snap(self):
+        x = self.model.x
+        self.target.reconcile(0.5, self.authoritative(0.5, x_offset=100), self.model)
+        assert x + 100 == pytest.approx(self.model.x)
+
+    def test_velocity_is_corrected_at_once(self):
+        self.target.reconcile(0.5, self.authoritative(0.5, mx=12), self.model)
+        assert 12 == pytest.approx(self.model.movement.x)
+
+    def test_later_updates_do_not_double_count(self):
+        x = self.model.x
+        self.target.reconcile(0.5, self.authoritative(0.5, x_offset=4), self.model)
+        self.target.correct(self.model, 0.25)
+        self.target.reconcile(0.6, self.authoritative(0.6, x_offset=4), self.model)
+        self.target.correct(self.model, 0.25)
+        assert x + 4 == pytest.approx(self.model.x)
+
+    def test_first_update_is_applied_directly(self):
+        target = Reconciler()
+        target.reconcile(0, self.authoritative(0, x_offset=7), self.model)
+        assert 7 == pytest.approx(self.model.x)
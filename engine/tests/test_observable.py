@@ -0,0 +1,158 @@
+import pytest
+
+from engine.engine import Engine
+from engine.models.observable import Observable, EventBatch, RemoveCallbackException
+from engine.physics.force import MutableOffsets
+
+
+class Subject(Observable):
+    pass
+
+
+class Nudge(object):
+
+    def __init__(self, model):
+        self.model = model
+
+    def update(self, dt):
+        self.model.set_movement(self.model.movement.x + 1, 0, 0)
+
+
+class Recorder(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def plain(self):
+        self.calls.append("plain")
+
+    def with_caller(self, caller):
+        self.calls.append(caller)
+
+    def with_kwargs(self, added):
+        self.calls.append(added)
+
+    def once(self):
+        self.calls.append("once")
+        raise RemoveCallbackException()
+
+
+class TestObservable(object):
+
+    def setup(self):
+        self.target = Subject()
+        self.recorder = Recorder()
+
+    def test_callers_are_passed_to_callbacks_asking_for_them(self):
+        self.target.observe(self.recorder.with_caller, "move")
+        self.target._callback("move")
+        assert [self.target] == self.recorder.calls
+
+    def test_keyword_arguments_are_forwarded(self):
+        self.target.observe(self.recorder.with_kwargs, "add_part")
+        self.target._callback("add_part", added=3)
+        assert [3] == self.recorder.calls
+
+    def test_observing_twice_calls_once(self):
+        self.target.observe(self.recorder.plain, "move")
+        self.target.observe(self.recorder.plain, "move")
+        self.target._callback("move")
+        assert ["plain"] == self.recorder.calls
+
+    def test_unobserve(self):
+        self.target.observe(self.recorder.plain, "move")
+        self.target.unobserve(self.recorder.plain, "move")
+        self.target._callback("move")
+        assert [] == self.recorder.calls
+
+    def test_remove_callback_exception_unobserves(self):
+        self.target.observe(self.recorder.once, "move")
+        self.target._callback("move")
+        self.target._callback("move")
+        assert ["once"] == self.recorder.calls
+
+    def test_observers_added_during_a_callback_wait_for_the_next_one(self):
+        self.target.observe(lambda: self.target.observe(self.recorder.plain, "move"), "move")
+        self.target._callback("move")
+        assert [] == self.recorder.calls
+        self.target._callback("move")
+        assert ["plain"] == self.recorder.calls
+
+    def test_remove_all_observers(self):
+        self.target.observe(self.recorder.plain, "move")
+        self.target.observe(self.recorder.plain, "alive")
+        self.target.remove_all_observers()
+        self.target._callback("move")
+        self.target._callback("alive")
+        assert [] == self.recorder.calls
+
+
+class TestEventBatch(object):
+
+    def setup(self):
+        self.vector = MutableOffsets(0, 0, 0)
+        self.recorder = Recorder()
+        self.vector.observe(self.recorder.with_caller, "move")
+
+    def test_moves_are_coalesced_until_the_batch_ends(self):
+        with EventBatch():
+            self.vector.set(1, 0, 0)
+            self.vector.set(2, 0, 0)
+            assert [] == self.recorder.calls
+        assert [self.vector] == self.recorder.calls
+
+    def test_other_actions_are_delivered_immediately(self):
+        self.vector.observe(self.recorder.plain, "alive")
+        with EventBatch():
+            self.vector._callback("alive")
+            assert ["plain"] == self.recorder.calls
+
+    def test_callbacks_see_the_final_state(self):
+        positions = []
+        self.vector.observe(lambda: positions.append(self.vector.x), "move")
+        with EventBatch():
+            self.vector.set(1, 0, 0)
+            self.vector.set(2, 0, 0)
+        assert [2] == positions
+
+    def test_a_failing_observer_does_not_drop_the_other_events(self):
+        other = MutableOffsets(0, 0, 0)
+        other.observe(self.recorder.with_caller, "move")
+
+        def fail():
+            raise ValueError()
+
+        self.vector.observe(fail, "move")
+        with pytest.raises(ValueError):
+            with EventBatch():
+                self.vector.set(1, 0, 0)
+                other.set(1, 0, 0)
+        assert [self.vector, other] == self.recorder.calls
+
+
+class TestEngineBatching(object):
+
+    def setup(self):
+        self.engine = Engine(None)
+        self.asteroid = self.engine.amf.manufacture((0, 0, 0))
+        self.asteroid.set_movement(10, 0, 0)
+        self.asteroid.set_spin(0, 10, 0)
+        self.engine.spawn(self.asteroid)
+        self.engine.set_controller(self.asteroid.uuid, Nudge(self.asteroid))
+        self.moves = []
+        self.asteroid.observe(lambda: self.moves.append(self.asteroid.x), "move")
+
+    def test_one_move_per_model_and_tick(self):
+        self.engine.update(1 / 60)
+        assert [self.asteroid.x] == self.moves
+
+    def test_moved_models_are_checked_for_collisions(self):
+        checked = []
+        self.engine._spacial_index.all_pairs_deduplicated = lambda models: checked.extend(models) or []
+        self.engine.update(1 / 60)
+        assert [self.asteroid] == checked
+
+    def test_batching_can_be_turned_off(self):
+        self.engine.batched_actions = ()
+        self.engine.update(1 / 60)
+        assert 2 == len(self.moves)
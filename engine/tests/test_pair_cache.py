@@ -0,0 +1,73 @@
+import pytest
+
+from engine.models.factories import AsteroidModelFactory
+from engine.physics.pair_cache import CollisionPairCache, max_travel
+from engine.physics.separating_axis import hull_separation
+from engine.physics.swept_hull import LocalHull
+
+square = [(-1, -1), (-1, 1), (1, 1), (1, -1)]
+amf = AsteroidModelFactory()
+
+
+def asteroid(x):
+    return amf.manufacture((x, 0, 0), radii=[25] * 20)
+
+
+class TestHullSeparation(object):
+
+    def setup(self):
+        self.hull = LocalHull(square)
+
+    def test_side_by_side_squares_are_apart_by_the_gap(self):
+        assert 3 == pytest.approx(hull_separation(self.hull, (0, 0, 0), self.hull, (5, 0, 0)))
+
+    def test_overlapping_squares_have_negative_separation(self):
+        assert 0 > hull_separation(self.hull, (0, 0, 0), self.hull, (1, 1, 45))
+
+    def test_rotated_square_reaches_further(self):
+        assert 3 - (2 ** .5 - 1) == pytest.approx(hull_separation(self.hull, (0, 0, 0), self.hull, (5, 0, 45)))
+
+
+class TestMaxTravel(object):
+
+    def test_translation(self):
+        assert 5 == max_travel(1, (0, 0, 0), (3, 4, 0))
+
+    def test_turn_wraps_around(self):
+        assert max_travel(1, (0, 0, 350), (0, 0, 10)) == pytest.approx(max_travel(1, (0, 0, 0), (0, 0, 20)))
+
+
+class TestCollisionPairCache(object):
+
+    def setup(self):
+        self.target = CollisionPairCache()
+        self.asteroid = asteroid(0)
+        self.other = asteroid(200)
+        self.target.record_separation(self.asteroid, self.other)
+
+    def test_unrecorded_pair_is_a_miss(self):
+        third = asteroid(-200)
+        assert not self.target.is_separated(self.asteroid, third)
+        assert (0, 1) == (self.target.hits, self.target.misses)
+
+    def test_recorded_pair_is_a_hit_either_way_round(self):
+        assert self.target.is_separated(self.other, self.asteroid)
+        assert (1, 0) == (self.target.hits, self.target.misses)
+
+    def test_small_moves_keep_the_pair_separated(self):
+        self.asteroid.teleport_to(5, 0, 0)
+        assert self.target.is_separated(self.asteroid, self.other)
+
+    def test_closing_in_is_a_miss_and_forgets_the_pair(self):
+        self.asteroid.teleport_to(190, 0, 0)
+        assert not self.target.is_separated(self.asteroid, self.other)
+        assert 0 == len(self.target)
+
+    def test_overlapping_pair_is_not_recorded(self):
+        self.target.record_separation(self.asteroid, asteroid(0))
+        assert 1 == len(self.target)
+
+    def test_decayed_model_is_evicted(self):
+        self.target.evict(self.other)
+        assert 0 == len(self.target)
+        assert not self.target.is_separated(self.asteroid, self.other)
@@ -0,0 +1,137 @@
+from itertools import combinations
+from random import Random
+
+from engine.models.factories import ShipModelFactory, ShipPartModelFactory
+from engine.physics.part_index import PartIndex, overlaps
+from engine.physics.polygon import Polygon
+from engine.physics.line import Line
+
+
+def scattered_parts(n=40, seed=5):
+    rnd = Random(seed)
+    factory = ShipPartModelFactory()
+    names = ["generator", "fuel tank", "engine", "shield"]
+    return [factory.manufacture(rnd.choice(names), position=(rnd.uniform(-8, 8), 0, rnd.uniform(-8, 8)))
+            for _ in range(n)]
+
+
+def line_polygon(start, end):
+    return Polygon([Line([start, end])])
+
+
+class TestPartIndex(object):
+
+    def setup(self):
+        self.parts = scattered_parts()
+        self.target = PartIndex()
+        for part in self.parts:
+            self.target.add(part)
+
+    def test_neighbours_match_brute_force(self):
+        for part in self.parts:
+            expected = {other for other in self.parts
+                        if other is not part and (other.position - part.position).distance <= 3.5}
+            assert expected == set(self.target.neighbours(part, 3.5))
+
+    def test_pairs_hold_every_connectable_pair(self):
+        expected = {frozenset(pair) for pair in combinations(self.parts, 2) if pair[0].can_connect_to(pair[1])}
+        pairs = {frozenset(pair) for pair in self.target.pairs(self.parts)}
+        assert expected <= pairs
+        assert len(pairs) < len(self.parts) * (len(self.parts) - 1) / 2
+
+    def test_moves_and_removals_are_followed(self):
+        part, other = self.parts[:2]
+        part.set_position(100, 0, 100)
+        self.target.move(part)
+        assert part not in self.target.neighbours(other, 100)
+        assert other not in self.target.neighbours(part, 5)
+        self.target.remove(other)
+        assert other not in self.target
+        assert other not in self.target.neighbours(self.parts[2], 100)
+
+
+class TestValidationCache(object):
+
+    def setup(self):
+        factory = ShipPartModelFactory()
+        self.part1 = factory.manufacture("generator", position=(0, 0, 0))
+        self.part2 = factory.manufacture("generator", position=(4, 0, 0))
+        self.bystander = factory.manufacture("generator", position=(10, 0, 10))
+        self.target = PartIndex()
+        for part in (self.part1, self.part2, self.bystander):
+            self.target.add(part)
+        self.pair = frozenset((self.part1, self.part2))
+        self.target.store_validation(self.pair, line_polygon((0, 0), (4, 0)), True)
+
+    def test_results_are_cached_per_pair_and_polygon(self):
+        assert self.target.validation(self.pair, line_polygon((0, 0), (4, 0)))
+        assert self.target.validation(self.pair, line_polygon((0, 0), (4, 1))) is None
+        assert 1 == self.target.hits
+
+    def test_moving_one_of_the_parts_forgets_the_result(self):
+        self.part1.set_position(0, 0, 0.5)
+        self.target.move(self.part1)
+        assert self.target.validation(self.pair, line_polygon((0, 0), (4, 0))) is None
+
+    def test_parts_moving_far_away_keep_the_result(self):
+        self.bystander.set_position(-10, 0, 10)
+        self.target.move(self.bystander)
+        assert self.target.validation(self.pair, line_polygon((0, 0), (4, 0)))
+
+    def test_parts_moving_across_forget_the_result(self):
+        self.bystander.set_position(2, 0, 0)
+        self.target.move(self.bystander)
+        assert self.target.validation(self.pair, line_polygon((0, 0), (4, 0))) is None
+
+    def test_moves_forget_the_same_results_as_a_full_scan(self):
+        parts = scattered_parts()
+        target = PartIndex()
+        for part in parts:
+            target.add(part)
+        for part1, part2 in target.pairs(parts):
+            target.store_validation(frozenset((part1, part2)), line_polygon((part1.x, part1.z), (part2.x, part2.z)), True)
+        rnd = Random(7)
+        for part in rnd.sample(parts, 10):
+            old_bounds = target._bounds_by_part[part]
+            part.set_position(rnd.uniform(-8, 8), 0, rnd.uniform(-8, 8))
+            new_bounds = target._bounds(part)
+            expected = {key for key, (_, bounds) in target._validations.items()
+                        if part not in key[0] and not overlaps(bounds, old_bounds) and not overlaps(bounds, new_bounds)}
+            target.move(part)
+            assert expected == set(target._validations)
+        assert set(target._validations) == set().union(*target._validations_by_part.values())
+        assert set(target._validations) == set().union(*target._validations_by_cell.values())
+
+
+class TestShipConnections(object):
+
+    def setup(self):
+        self.target = ShipModelFactory().manufacture("ship")
+
+    def connections(self):
+        return {tuple(sorted(part.uuid for part in connection._ship_parts)) for connection in self.target._connections}
+
+    def test_rebuilding_reuses_validations(self):
+        self.target.rebuild_connections()
+        before = self.connections()
+        misses = self.target._part_index.misses
+        self.target.rebuild_connections()
+        assert before == self.connections()
+        assert misses == self.target._part_index.misses
+
+    def test_parts_moving_near_a_connection_revalidate_it(self):
+        part_factory = ShipPartModelFactory()
+        part1 = part_factory.manufacture("generator", position=(0, 0, 30))
+        part2 = part_factory.manufacture("fuel tank", position=(1.6, 0, 30))
+        bystander = part_factory.manufacture("generator", position=(0.8, 0, 40))
+        for part in (part1, part2, bystander):
+            self.target.add_part(part)
+        self.target.rebuild_connections()
+        assert part2 in part1.connected_parts
+        misses = self.target._part_index.misses
+        bystander.set_position(0.8, 0, 45)
+        self.target.rebuild_connections()
+        assert misses == self.target._part_index.misses
+        bystander.set_position(0.8, 0, 30.5)
+        self.target.rebuild_connections()
+        assert misses < self.target._part_index.misses
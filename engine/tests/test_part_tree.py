@@ -0,0 +1,61 @@
+from itertools import product
+from random import Random
+
+from engine.physics.polygon import MultiPolygon, PolygonPart
+from engine.physics.separating_axis import swept_hulls_intersect
+
+square = [(-.5, -.5), (.5, -.5), (.5, .5), (-.5, .5)]
+
+
+def grid_multipolygon(width, height):
+    parts = set()
+    for x, y in product(range(width), range(height)):
+        part = PolygonPart.manufacture(square, x=x, y=y)
+        part.freeze()
+        parts.add(part)
+    multipolygon = MultiPolygon(parts)
+    multipolygon.freeze()
+    return multipolygon
+
+
+class TestPartTree(object):
+
+    def setup(self):
+        self.rnd = Random(11)
+        self.target = grid_multipolygon(6, 4)
+        self.other = grid_multipolygon(3, 5)
+
+    def move_randomly(self, multipolygon):
+        multipolygon.set_position_rotation(self.rnd.uniform(-3, 6), self.rnd.uniform(-3, 6), self.rnd.uniform(0, 360))
+        multipolygon.set_position_rotation(multipolygon.x + self.rnd.uniform(-1, 1),
+                                           multipolygon.y + self.rnd.uniform(-1, 1),
+                                           multipolygon.rotation + self.rnd.uniform(-20, 20))
+
+    def brute_force(self):
+        return {(p1.part_id, p2.part_id) for p1, p2 in product(self.target, self.other)
+                if swept_hulls_intersect(p1.swept_hull, p2.swept_hull)}
+
+    def test_every_part_is_a_leaf(self):
+        assert 24 == len(self.target.part_tree)
+
+    def test_tree_matches_all_part_pairs(self):
+        n_hits = 0
+        for _ in range(30):
+            self.move_randomly(self.target)
+            self.move_randomly(self.other)
+            pairs = self.target.part_tree.intersecting_parts(self.other.part_tree)
+            expected = self.brute_force()
+            assert expected == {(p1.part_id, p2.part_id) for p1, p2 in pairs}
+            n_hits += len(expected)
+        assert n_hits > 0
+
+    def test_tree_is_kept_across_moves(self):
+        tree = self.target.part_tree
+        self.move_randomly(self.target)
+        assert tree is self.target.part_tree
+
+    def test_tree_is_rebuilt_when_parts_are_removed(self):
+        tree = self.target.part_tree
+        self.target.remove_polygons([next(iter(self.target)).part_id])
+        assert tree is not self.target.part_tree
+        assert 23 == len(self.target.part_tree)
@@ -1,6 +1,7 @@
 from math import pi
 
-from engine.physics.force import Offsets, Degrees, Force
+from engine.physics.force import Offsets, Degrees, Force, MutableOffsets, MutableDegrees
+from engine.physics.line import Line
 
 
 class TestPosition(object):
@@ -202,3 +203,45 @@ class TestRotatingAForce(object):
         assert round(target.forces.x, 3) == 0
         assert target.forces.y == 0
         assert target.forces.z == -1
+
+
+class TestInPlaceMath(object):
+
+    def setup(self):
+        self.target = MutableOffsets(1, 0, 0)
+
+    def test_iadd_scaled(self):
+        assert self.target.iadd_scaled(Offsets(2, 0, 4), 0.5)
+        assert (2, 0, 2) == tuple(self.target)
+
+    def test_iadd_scaled_reports_no_change(self):
+        assert not self.target.iadd_scaled(Offsets(2, 0, 4), 0)
+
+    def test_iadd_scaled_wraps_degrees(self):
+        target = MutableDegrees(0, 170, 0)
+        target.iadd_scaled(Degrees(0, 10, 0), 2)
+        assert (0, -170, 0) == tuple(target)
+
+    def test_rotate_into(self):
+        target = MutableOffsets(0, 0, 0)
+        Offsets(1, 0, 0).rotate_into(target, 90)
+        assert (0, 0, 1) == tuple(round(value, 6) for value in target)
+
+    def test_rotate_into_notifies_observers(self):
+        moves = []
+        self.target.observe(lambda: moves.append(None), "move")
+        Offsets(0, 0, 1).rotate_into(self.target, 0)
+        assert 1 == len(moves)
+
+
+class TestCompactLayout(object):
+
+    def test_vectors_and_lines_have_no_instance_dict(self):
+        for instance in (Offsets(1, 0, 0), MutableOffsets(1, 0, 0), MutableDegrees(0, 1, 0),
+                         Force(Offsets(1, 0, 0), Offsets(0, 0, 1)), Line([(0, 0), (1, 1)])):
+            assert not hasattr(instance, '__dict__')
+
+    def test_direction_follows_mutation(self):
+        target = MutableOffsets(1, 0, 0)
+        target.set(0, 0, 1)
+        assert [0, 180, 0] == target.direction
@@ -2,7 +2,7 @@ from itertools import product
 
 import pytest
 
-from engine.physics.polygon import Polygon, ClosedPolygon
+from engine.physics.polygon import Polygon, ClosedPolygon, ClippingPolygon
 
 
 class TestPolygonManufacture(object):
@@ -14,6 +14,20 @@ class TestPolygonManufacture(object):
         assert len(self.target.lines) == 4
 
 
+class TestOpenPolygonHull(object):
+
+    def setup(self):
+        self.arc = ClippingPolygon.manufacture_open([(-2, 0), (-1, 1), (1, 1), (2, 0)], part_id="arc")
+
+    def test_hull_is_seeded_from_line_start_points(self):
+        points = {tuple(point) for point in self.arc.local_hull.points.tolist()}
+        assert {(l.original_x1, l.original_y1) for l in self.arc.lines} == points
+
+    def test_square_below_the_chord_is_not_hit(self):
+        square = Polygon.manufacture([(-0.3, -0.2), (0.3, -0.2), (0.3, 0.4), (-0.3, 0.4)])
+        assert not self.arc.intersects(square)
+
+
 class TestPolygonIntersection(object):
 
     def setup(self):
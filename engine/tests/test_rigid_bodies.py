@@ -0,0 +1,116 @@
+from random import Random
+
+import numpy as np
+
+from engine.engine import Engine
+from engine.models.factories import ProjectileModelFactory
+from engine.physics.force import MutableOffsets, MutableDegrees
+from engine.physics.rigid_bodies import RigidBodyStore, StoredOffsets
+
+
+def asteroids(engine, n=20, seed=3):
+    rnd = Random(seed)
+    models = []
+    for _ in range(n):
+        model = engine.amf.manufacture((rnd.uniform(-500, 500), 0, rnd.uniform(-500, 500)),
+                                       radii=[20] * 20)
+        model.set_movement(rnd.uniform(-20, 20), 0, rnd.uniform(-20, 20))
+        model.set_spin(0, rnd.uniform(-150, 150), 0)
+        model.add_acceleration(rnd.uniform(-5, 5), 0, rnd.uniform(-5, 5))
+        model.set_torque(0, rnd.uniform(-90, 90), 0)
+        models.append(model)
+    return models
+
+
+def state(models):
+    return np.array([model.position.xyz + model.rotation.xyz + model.movement.xyz + model.spin.xyz
+                     for model in models])
+
+
+class TestStoredVectors(object):
+
+    def setup(self):
+        self.store = RigidBodyStore(capacity=2)
+        self.asteroid = Engine(None).amf.manufacture((3, 0, 4))
+
+    def test_properties_read_and_write_the_arrays(self):
+        self.store.add(self.asteroid)
+        assert isinstance(self.asteroid.position, StoredOffsets)
+        assert (3, 4) == (self.asteroid.x, self.asteroid.z)
+        self.asteroid.set_movement(1, 0, 2)
+        assert [1, 0, 2] == self.store.arrays["movement"][0].tolist()
+
+    def test_arithmetic_returns_detached_vectors(self):
+        self.store.add(self.asteroid)
+        moved = self.asteroid.position + MutableOffsets(1, 0, 1)
+        assert type(moved) is MutableOffsets
+        assert (4, 0, 5) == tuple(moved)
+
+    def test_removal_detaches_and_keeps_observers(self):
+        calls = []
+        self.asteroid.position.observe(lambda: calls.append(None), "move")
+        self.store.add(self.asteroid)
+        self.store.remove(self.asteroid)
+        assert type(self.asteroid.position) is MutableOffsets
+        self.asteroid.position.set(0, 0, 0)
+        assert 1 == len(calls)
+        assert 0 == len(self.store)
+
+    def test_growing_keeps_values(self):
+        engine = Engine(None)
+        models = [engine.amf.manufacture((i, 0, 0)) for i in range(5)]
+        for model in models:
+            self.store.add(model)
+        assert 8 == self.store.capacity
+        assert list(range(5)) == [model.x for model in models]
+        models[4].set_position(9, 0, 0)
+        assert 9 == self.store.arrays["position"][4, 0]
+
+    def test_ships_are_not_stored(self):
+        assert not self.store.accepts(Engine(None).smf.manufacture("ship"))
+        assert self.store.accepts(self.asteroid)
+
+
+class TestEngineIntegration(object):
+
+    def setup(self):
+        self.reference = Engine(None)
+        self.target = Engine(None, rigid_bodies=RigidBodyStore())
+        self.reference_models = asteroids(self.reference)
+        self.target_models = asteroids(self.target)
+        for reference, model in zip(self.reference_models, self.target_models):
+            self.reference.spawn(reference)
+            self.target.spawn(model)
+
+    def test_integration_matches_model_run(self):
+        for _ in range(30):
+            self.reference.update(1 / 60)
+            self.target.update(1 / 60)
+        assert np.allclose(state(self.reference_models), state(self.target_models))
+
+    def test_bounding_boxes_follow(self):
+        for _ in range(5):
+            self.target.update(1 / 60)
+        for model in self.target_models:
+            assert abs(model.bounding_box.x - model.x) < 1e-9
+            assert abs(model.bounding_box.y - model.z) < 1e-9
+
+    def test_moves_reach_the_engine(self):
+        self.target.update(1 / 60)
+        assert not self.target._collision_check_models
+        checked = []
+        self.target._spacial_index.all_pairs_deduplicated = lambda models: checked.extend(models) or []
+        self.target.update(1 / 60)
+        assert set(self.target_models) == set(checked)
+
+    def test_decayed_projectiles_are_released(self):
+        projectile = ProjectileModelFactory().manufacture(
+            "plasma", MutableOffsets(0, 0, 0), MutableDegrees(0, 0, 0), MutableOffsets(0, 0, 100),
+            MutableDegrees(0, 0, 0), MutableOffsets(0, 0, 0), MutableDegrees(0, 0, 0))
+        self.target.spawn(projectile)
+        assert projectile in self.target.rigid_bodies
+        self.target.update(1 / 60)
+        assert abs(projectile.z - 100 / 60) < 1e-9
+        self.target.decay(projectile.uuid)
+        assert projectile not in self.target.rigid_bodies
+        assert type(projectile.position) is MutableOffsets
@@ -0,0 +1,56 @@
+from random import Random
+
+import pytest
+
+from engine.physics.line import Line
+from engine.physics.polygon import Polygon
+from engine.physics.segments import pack_lines, pack_closed_coords, intersections, first_intersection
+
+rnd = Random(1)
+random_lines = [Line([(rnd.uniform(-5, 5), rnd.uniform(-5, 5)), (rnd.uniform(-5, 5), rnd.uniform(-5, 5))])
+                for _ in range(30)]
+
+
+class TestPackedSegments(object):
+
+    def setup(self):
+        self.coords = [(-5, 0), (-2, -3), (1, 0), (-2, 3)]
+        self.polygon = Polygon.manufacture(self.coords)
+
+    def test_closed_coords_are_packed_in_line_order(self):
+        assert pack_lines(self.polygon.lines).tolist() == pack_closed_coords(self.coords).tolist()
+
+    def test_packed_shape(self):
+        assert (4, 4) == pack_closed_coords(self.coords).shape
+
+
+class TestBatchedIntersections(object):
+
+    def setup(self):
+        packed = pack_lines(random_lines)
+        self.hits, self.xs, self.ys = intersections(packed, packed)
+
+    def test_hit_mask_matches_line_intersection(self):
+        for i, line in enumerate(random_lines):
+            for j, other in enumerate(random_lines):
+                assert line.intersection_point(other)[0] == self.hits[i, j]
+
+    def test_points_match_line_intersection(self):
+        for i, line in enumerate(random_lines):
+            for j, other in enumerate(random_lines):
+                intersects, x, y = line.intersection_point(other)
+                if intersects:
+                    assert x == pytest.approx(self.xs[i, j])
+                    assert y == pytest.approx(self.ys[i, j])
+
+
+def test_first_intersection_of_crossing_lines():
+    crossing = pack_lines([Line([(-1, -1), (1, 1)])])
+    other = pack_lines([Line([(-1, 1), (1, -1)])])
+    assert (True, 0, 0) == first_intersection(crossing, other)
+
+
+def test_first_intersection_of_parallel_lines():
+    line = pack_lines([Line([(0, 0), (1, 0)])])
+    other = pack_lines([Line([(0, 1), (1, 1)])])
+    assert (False, None, None) == first_intersection(line, other)
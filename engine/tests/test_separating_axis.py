@@ -0,0 +1,100 @@
+from random import Random
+
+from engine.physics.polygon import Polygon, MultiPolygon
+from engine.physics.segments import first_intersection
+from engine.physics.separating_axis import hull_separation
+from engine.physics.swept_hull import LocalHull
+
+square = [(-.5, -.5), (.5, -.5), (.5, .5), (-.5, .5)]
+
+
+class TestSeparatingAxisIntersection(object):
+
+    def setup(self):
+        self.target = Polygon.manufacture(square)
+
+    def test_edge_neighbours_touch(self):
+        assert self.target.intersects(Polygon.manufacture(square, x=1))
+
+    def test_diagonal_neighbours_touch(self):
+        assert self.target.intersects(Polygon.manufacture(square, x=1, y=1))
+
+    def test_gap_is_not_an_intersection(self):
+        assert not self.target.intersects(Polygon.manufacture(square, x=1.0001))
+
+    def test_rotated_square_reaches_over_the_gap(self):
+        assert self.target.intersects(Polygon.manufacture(square, x=1.2, rotation=45))
+
+
+class TestDegenerateHulls(object):
+
+    def setup(self):
+        self.point = LocalHull([(0, 0)])
+        self.segment = LocalHull([(-1, 0), (1, 0)])
+
+    def test_distant_points_are_apart(self):
+        assert 5 == hull_separation(self.point, (0, 0, 0), self.point, (3, 4, 0))
+
+    def test_coinciding_points_touch(self):
+        assert 0 == hull_separation(self.point, (2, 2, 0), self.point, (2, 2, 0))
+
+    def test_point_beyond_the_end_of_a_segment_is_apart(self):
+        assert 2 == hull_separation(self.segment, (0, 0, 0), self.point, (3, 0, 0))
+
+    def test_point_on_a_segment_touches(self):
+        assert 0 == hull_separation(self.segment, (0, 0, 0), self.point, (0.5, 0, 0))
+
+    def test_crossing_segments_touch(self):
+        assert 0 == hull_separation(self.segment, (0, 0, 0), self.segment, (0, 0, 90))
+
+    def test_parallel_segments_are_apart(self):
+        assert 1 == hull_separation(self.segment, (0, 0, 0), self.segment, (0, 1, 0))
+
+
+class TestContainment(object):
+
+    def setup(self):
+        self.outer = MultiPolygon.manufacture([(-5, -5), (5, -5), (5, 5), (-5, 5)])
+        self.inner = MultiPolygon.manufacture(square, x=1, y=2)
+
+    def test_contained_polygon_intersects(self):
+        assert self.outer.intersects(self.inner)
+        assert self.inner.intersects(self.outer)
+
+    def test_contact_point_is_the_contained_centroid(self):
+        assert (True, 1, 2) == self.outer.intersection_point(self.inner)
+        assert (True, 1, 2) == self.inner.intersection_point(self.outer)
+
+
+class TestSeparatingAxisAgreesWithSegments(object):
+
+    def setup(self):
+        self.rnd = Random(7)
+        self.shape = Polygon.convex_hull([(self.rnd.uniform(-2, 2), self.rnd.uniform(-2, 2)) for _ in range(10)])
+
+    def random_polygon(self, scale=1):
+        polygon = Polygon.manufacture([(x * scale, y * scale) for x, y in self.shape],
+                                      x=self.rnd.uniform(-3, 3), y=self.rnd.uniform(-3, 3),
+                                      rotation=self.rnd.uniform(0, 360))
+        polygon.set_position_rotation(polygon.x + self.rnd.uniform(-1, 1), polygon.y + self.rnd.uniform(-1, 1),
+                                      polygon.rotation + self.rnd.uniform(-90, 90))
+        return polygon
+
+    def test_crossing_edges_are_intersections(self):
+        for _ in range(200):
+            polygon = self.random_polygon()
+            other = self.random_polygon()
+            if first_intersection(polygon.moving_segments, other.moving_segments)[0]:
+                assert polygon.intersects(other)
+                assert other.intersects(polygon)
+
+    def test_intersection_without_crossing_edges_is_containment(self):
+        n_contained = 0
+        for _ in range(200):
+            outer = self.random_polygon(scale=2)
+            inner = self.random_polygon(scale=.2)
+            crossing = first_intersection(outer.moving_segments, inner.moving_segments)[0]
+            if outer.intersects(inner) and not crossing:
+                n_contained += 1
+                assert all(outer.moving_polygon.point_inside(x, y) for x, y in inner.swept_hull.vertices.tolist())
+        assert n_contained > 0
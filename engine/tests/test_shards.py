@@ -0,0 +1,191 @@
+import multiprocessing
+import time
+
+from engine.engine import Engine
+from engine.network.input_codec import InputCommandCodec
+from engine.network.server.shards import ShardGrid, Shard, ShardCoordinator, ShardedServerEngine, \
+    ShardedUpdateServerProtocol
+from engine.network.spawn_schema import SpawnSchema
+from engine.tests.fake_network import UnscheduledEngine
+
+
+class InProcessCoordinator(ShardCoordinator):
+
+    def start(self):
+        self.backlog = []
+        self.shards = []
+        self.ends = []
+        for region in range(len(self.grid)):
+            parent, child = multiprocessing.Pipe()
+            self.connections.append(parent)
+            self.ends.append(child)
+            self.shards.append(Shard(region, self.grid, dt=self.dt))
+
+    def pump(self, ticks=1):
+        for _ in range(ticks):
+            for shard, end in zip(self.shards, self.ends):
+                while end.poll():
+                    for message in end.recv():
+                        shard.handle(message)
+                outbox = shard.tick()
+                if outbox:
+                    end.send(outbox)
+            self.backlog += super(InProcessCoordinator, self).poll()
+
+    def poll(self):
+        events, self.backlog = self.backlog + super(InProcessCoordinator, self).poll(), []
+        return events
+
+
+class TestShardGrid(object):
+
+    def setup(self):
+        self.target = ShardGrid(columns=2, rows=2, region_size=1000., margin=50.)
+
+    def test_regions(self):
+        assert 4 == len(self.target)
+        assert 0 == self.target.region_of(-10, -10)
+        assert 1 == self.target.region_of(10, -10)
+        assert 3 == self.target.region_of(10, 10)
+
+    def test_outer_regions_extend_to_infinity(self):
+        assert 1 == self.target.region_of(1e6, -1e6)
+        assert not self.target.outside(1, 1e6, -1e6)
+
+    def test_handoff_waits_for_the_margin(self):
+        assert not self.target.outside(0, 40, -10)
+        assert self.target.outside(0, 60, -10)
+        assert self.target.outside(0, -10, 60)
+
+
+class TestShard(object):
+
+    def setup(self):
+        self.grid = ShardGrid(columns=2, rows=1, region_size=1000., margin=50.)
+        self.target = Shard(0, self.grid)
+        self.schema = SpawnSchema()
+        self.asteroid = self.target.engine.amf.manufacture((30, 0, 0))
+        self.asteroid.set_movement(600, 0, 0)
+
+    def adopt(self, model, controlled=False):
+        self.target.handle(("adopt", self.schema.describe(model), controlled))
+
+    def test_models_crossing_the_border_are_handed_off(self):
+        self.adopt(self.asteroid)
+        messages = []
+        for _ in range(10):
+            messages += self.target.tick()
+        handoffs = [message for message in messages if message[0] == "handoff"]
+        assert [self.asteroid.uuid] == [message[1]['uuid'] for message in handoffs]
+        assert self.asteroid.uuid not in self.target.engine.models
+
+    def test_state_is_published_every_few_ticks(self):
+        self.adopt(self.target.engine.amf.manufacture((-300, 0, 0)))
+        states = [message for _ in range(6) for message in self.target.tick() if message[0] == "state"]
+        assert 2 == len(states)
+
+    def test_controlled_ships_follow_input(self):
+        ship = self.target.engine.smf.manufacture("ship", position=(-300, 0, 0))
+        self.adopt(ship, controlled=True)
+        self.target.handle(("input", ship.uuid, 1, {"A", "D"}, {}))
+        for _ in range(30):
+            self.target.tick()
+        assert -300 != self.target.engine.models[ship.uuid].x
+
+
+class TestShardCoordinator(object):
+
+    def setup(self):
+        self.grid = ShardGrid(columns=2, rows=1, region_size=1000., margin=50.)
+        self.target = InProcessCoordinator(self.grid)
+        self.target.start()
+        self.schema = SpawnSchema()
+        self.asteroid = Engine(None).amf.manufacture((-20, 0, 0))
+        self.asteroid.set_movement(600, 0, 0)
+
+    def test_models_are_adopted_by_the_region_they_are_in(self):
+        self.target.adopt(self.schema.describe(self.asteroid))
+        self.target.pump()
+        assert self.asteroid.uuid in self.target.shards[0].engine.models
+
+    def test_handoff_moves_ownership(self):
+        self.target.adopt(self.schema.describe(self.asteroid))
+        self.target.pump(15)
+        assert 1 == self.target.owners[self.asteroid.uuid]
+        assert self.asteroid.uuid in self.target.shards[1].engine.models
+        assert self.asteroid.uuid not in self.target.shards[0].engine.models
+
+    def test_control_follows_the_model_across_the_border(self):
+        ship = Engine(None).smf.manufacture("ship", position=(-20, 0, 0))
+        ship.set_movement(600, 0, 0)
+        self.target.adopt(self.schema.describe(ship))
+        self.target.control(ship.uuid)
+        self.target.pump(15)
+        assert ship.uuid in self.target.shards[1].inputs
+
+    def test_decay(self):
+        self.target.adopt(self.schema.describe(self.asteroid))
+        self.target.pump()
+        self.target.decay(self.asteroid.uuid)
+        self.target.pump()
+        assert self.asteroid.uuid not in self.target.shards[0].engine.models
+
+
+class TestShardedServerEngine(object):
+
+    def setup(self):
+        self.coordinator = InProcessCoordinator(ShardGrid(columns=2, rows=1, region_size=1000., margin=50.))
+        self.coordinator.start()
+        self.target = ShardedServerEngine(None, self.coordinator)
+        self.coordinator.pump()
+        self.target.update(0)
+
+    def test_world_is_spread_over_the_shards(self):
+        owned = sum(len(shard.engine.models) for shard in self.coordinator.shards)
+        assert len(self.target.models) == owned
+
+    def test_mirror_follows_shard_state(self):
+        model = next(iter(self.target.models.values()))
+        x = model.x
+        shard = self.coordinator.shards[self.coordinator.owners[model.uuid]]
+        shard.engine.models[model.uuid].set_movement(30, 0, 0)
+        self.coordinator.pump(3)
+        self.target.update(0)
+        assert x < model.x
+
+    def test_shard_decays_reach_the_mirror(self):
+        model = next(iter(self.target.models.values()))
+        shard = self.coordinator.shards[self.coordinator.owners[model.uuid]]
+        shard.engine.models[model.uuid].set_alive(False)
+        self.coordinator.pump()
+        self.target.update(0)
+        assert model.uuid not in self.target.models
+
+    def test_input_is_routed_to_the_owning_shard(self):
+        protocol = ShardedUpdateServerProtocol(self.target)
+        ship = self.target.smf.manufacture("ship", position=(300, 0, 300))
+        self.target.spawn(ship)
+        protocol.bind_input(("10.0.0.1", 8002), ship)
+        protocol.datagramReceived(InputCommandCodec.encode(1, {"A"}, {}), ("10.0.0.1", 8002))
+        self.coordinator.pump()
+        assert {"A"} == self.coordinator.shards[1].inputs[ship.uuid].buttons
+
+
+class TestShardProcesses(object):
+
+    def test_handoff_between_processes(self):
+        coordinator = ShardCoordinator(ShardGrid(columns=2, rows=1, region_size=1000., margin=50.))
+        coordinator.start()
+        try:
+            asteroid = Engine(None).amf.manufacture((-20, 0, 0))
+            asteroid.set_movement(300, 0, 0)
+            coordinator.adopt(SpawnSchema().describe(asteroid))
+            deadline = time.monotonic() + 10
+            while coordinator.owners[asteroid.uuid] == 0 and time.monotonic() < deadline:
+                coordinator.poll()
+                time.sleep(0.01)
+            assert 1 == coordinator.owners[asteroid.uuid]
+        finally:
+            stats = coordinator.stop()
+        assert {0, 1} == set(stats)
+        assert all(stat['ticks'] > 0 for stat in stats.values())
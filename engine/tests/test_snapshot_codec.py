@@ -0,0 +1,157 @@
+from uuid import uuid4
+
+import pytest
+from twisted.test.proto_helpers import StringTransport
+
+from engine.network.server.event_protocol import BroadcastProtocol
+from engine.network.server.update_protocol import UpdateServerProtocol
+from engine.network.snapshot_codec import ModelIndexTable, BinarySnapshotCodec, PickleSnapshotCodec
+from engine.tests.fake_network import UnscheduledEngine, DatagramTransport, frame
+
+
+class TestModelIndexTable(object):
+
+    def setup(self):
+        self.target = ModelIndexTable()
+        self.uuid = uuid4()
+
+    def test_assign_is_stable(self):
+        assert self.target.assign(self.uuid) == self.target.assign(self.uuid)
+        assert 1 == len(self.target)
+
+    def test_registered_index_is_not_reassigned(self):
+        self.target.register(7, self.uuid)
+        assert 8 == self.target.assign(uuid4())
+
+    def test_forget(self):
+        index = self.target.assign(self.uuid)
+        self.target.forget(self.uuid)
+        assert self.target.uuid(index) is None
+        assert self.uuid not in self.target
+
+
+class TestBinarySnapshotCodec(object):
+
+    def setup(self):
+        self.indices = ModelIndexTable()
+        self.target = BinarySnapshotCodec(self.indices)
+        self.uuids = [uuid4() for _ in range(3)]
+        for uuid in self.uuids:
+            self.indices.assign(uuid)
+        self.frames = [frame(uuid, x=i) for i, uuid in enumerate(self.uuids)]
+
+    def test_round_trip(self):
+        assert self.frames == self.target.decode(self.target.encode(self.frames))
+
+    def test_fixed_record_size(self):
+        encoded = self.target.encode(self.frames)
+        assert BinarySnapshotCodec.header.size + 3 * BinarySnapshotCodec.record.itemsize == len(encoded)
+
+    def test_smaller_than_pickle(self):
+        pickled = PickleSnapshotCodec(self.indices).encode(self.frames)
+        assert len(self.target.encode(self.frames)) * 2 < len(pickled)
+
+    def test_unindexed_models_are_skipped(self):
+        decoded = self.target.decode(self.target.encode(self.frames + [frame(uuid4())]))
+        assert self.uuids == [f['uuid'] for f in decoded]
+
+    def test_unknown_indices_are_dropped_by_receiver(self):
+        receiver = BinarySnapshotCodec(ModelIndexTable())
+        receiver.model_indices.register(1, self.uuids[1])
+        assert [self.uuids[1]] == [f['uuid'] for f in receiver.decode(self.target.encode(self.frames))]
+
+    def test_accepts_only_its_own_datagrams(self):
+        assert BinarySnapshotCodec.accepts(self.target.encode(self.frames))
+        assert not BinarySnapshotCodec.accepts(PickleSnapshotCodec(self.indices).encode(self.frames))
+
+
+class TestBinaryPackets(object):
+
+    def setup(self):
+        self.indices = ModelIndexTable()
+        self.target = BinarySnapshotCodec(self.indices)
+        self.receiver = BinarySnapshotCodec(self.indices)
+        self.frames = [frame(uuid4(), x=i) for i in range(100)]
+        for f in self.frames:
+            self.indices.assign(f['uuid'])
+
+    def test_packets_fit_the_mtu(self):
+        packets = self.target.encode_packets(self.frames, sequence=1)
+        assert 1 < len(packets)
+        assert all(len(packet) <= BinarySnapshotCodec.max_packet_size for packet in packets)
+
+    def test_each_packet_decodes_on_its_own(self):
+        packets = self.target.encode_packets(self.frames, sequence=1)
+        decoded = [self.receiver.decode(packet) for packet in reversed(packets)]
+        assert all(decoded)
+        assert sorted(f['position'][0] for part in decoded for f in part) == list(range(100))
+
+    def test_packets_of_older_snapshots_are_dropped(self):
+        old = self.target.encode_packets(self.frames, sequence=1)
+        self.receiver.decode(self.target.encode_packets(self.frames, sequence=2)[0])
+        assert [] == self.receiver.decode(old[1])
+
+    def test_empty_update_is_one_packet(self):
+        assert 1 == len(self.target.encode_packets([], sequence=1))
+
+
+class TestUpdateServerProtocol(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.engine.spawn_asteroids(2)
+        self.target = UpdateServerProtocol(self.engine)
+        self.target.transport = DatagramTransport()
+        self.target.register_address("10.0.0.1", 8002)
+        self.target.register_address("10.0.0.2", 8002)
+
+    def test_prefers_binary(self):
+        assert "binary" == self.target.negotiate(["pickle", "binary"])
+
+    def test_falls_back_to_pickle(self):
+        assert "pickle" == self.target.negotiate([])
+
+    def test_each_address_gets_its_codec(self):
+        self.target.use_codec_for(("10.0.0.2", 8002), "binary")
+        self.target.update(0)
+        (legacy, _), (binary, _) = self.target.transport.written
+        assert PickleSnapshotCodec.accepts(legacy)
+        assert BinarySnapshotCodec.accepts(binary)
+        assert len(self.engine.models) == len(self.target.deserialize(binary))
+
+    def test_received_updates_are_neither_applied_nor_relayed(self):
+        model = next(iter(self.engine.models.values()))
+        self.target.model_indices.assign(model.uuid)
+        self.target.use_codec("binary")
+        datagram = self.target.serialize([frame(model.uuid, x=42)])
+        self.target.datagramReceived(datagram, ("10.0.0.1", 8002))
+        assert 42 != pytest.approx(model.position[0])
+        assert [] == self.target.transport.written
+
+
+class TestHandshakeNegotiation(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.update_protocol = UpdateServerProtocol(self.engine)
+        self.target = BroadcastProtocol(self.engine, lambda *args: None, update_protocol=self.update_protocol,
+                                        update_address=("10.0.0.1", 8002))
+        self.target.makeConnection(StringTransport())
+
+    def reply(self):
+        return self.target.deserialize(self.target.transport.value()[4:])
+
+    def test_client_offer_selects_binary(self):
+        self.target.handshake({"command": "handshake", "versions": {"protocol": self.target.version},
+                               "codecs": ["binary", "pickle"]})
+        assert "binary" == self.update_protocol.address_codecs[("10.0.0.1", 8002)].name
+        assert "binary" == self.reply()['codec']
+
+    def test_legacy_client_stays_on_pickle(self):
+        self.target.handshake({"command": "handshake", "versions": {"protocol": self.target.version}})
+        assert "pickle" == self.update_protocol.address_codecs[("10.0.0.1", 8002)].name
+
+    def test_spawn_frames_carry_the_model_index(self):
+        model = self.engine.amf.manufacture((0, 0, 0))
+        self.target.send_spawn_model(model)
+        assert self.update_protocol.model_indices.index(model.uuid) == self.reply()['index']
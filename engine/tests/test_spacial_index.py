@@ -1,5 +1,5 @@
 from engine.models.factories import ShipModelFactory
-from engine.physics.spacial_index import SpacialIndex
+from engine.physics.spacial_index import SpacialIndex, HashedSpacialIndex, pack_cell
 
 
 class TestSpacialIndexAtZero(object):
@@ -78,3 +78,61 @@ class TestSpacialIndexCollisionPairGeneration(object):
 
     def test_ship_and_ship2_are_paired_once(self):
         assert {(self.ship, self.ship2)} == self.pairs or {(self.ship2, self.ship)} == self.pairs
+
+
+class TestHashedSpacialIndexAtZero(object):
+
+    def setup(self):
+        self.target = HashedSpacialIndex(cell_size=30)
+        smf = ShipModelFactory()
+        self.ship = smf.manufacture('ship')
+        self.target.init_model_into_2d_space_index(self.ship)
+
+    def test_cells_match_the_ship_quadrants(self):
+        assert {pack_cell(*q) for q in self.ship.bounding_box.quadrants} == set(self.target._2d_space_index)
+
+    def test_tuple_and_packed_quadrants_hold_ship(self):
+        assert {self.ship} == self.target.all_models([(-1, -1)])
+        assert {self.ship} == self.target.all_models([pack_cell(-1, -1)])
+
+    def test_anything_outside_zero_and_minus_one_is_empty(self):
+        assert set() == self.target.all_models([(1, 0), (-2, -1), (0, 1), (-1, -2)])
+
+    def test_move_inside_the_same_cells_keeps_the_cell_range(self):
+        cell_range = self.target._cell_ranges[self.ship]
+        self.ship.teleport_to(1, 0, 1)
+        self.target.reindex_spacial_position(self.ship)
+        assert cell_range is self.target._cell_ranges[self.ship]
+
+    def test_move_to_other_cells_empties_the_old_ones(self):
+        self.ship.teleport_to(300, 0, 300)
+        self.target.reindex_spacial_position(self.ship)
+        assert set() == self.target.all_models([(0, 0)])
+        assert {self.ship} == self.target.all_models([(10, 10)])
+
+    def test_cleared_ship_leaves_no_cells(self):
+        self.target.clear_model_from_2d_space_index(self.ship)
+        assert {} == self.target._2d_space_index
+
+
+class TestHashedSpacialIndexCellSize(object):
+
+    def setup(self):
+        self.target = HashedSpacialIndex()
+        smf = ShipModelFactory()
+        self.ships = [smf.manufacture('ship', position=(i * 100, 0, 0)) for i in range(9)]
+        for ship in self.ships:
+            self.target.init_model_into_2d_space_index(ship)
+
+    def test_cell_size_follows_median_extent(self):
+        bbox = self.ships[0].bounding_box
+        assert max(bbox.right - bbox.left, bbox.top - bbox.bottom) == self.target.cell_size
+
+    def test_pairs_survive_adaptation(self):
+        self.ships[1].teleport_to(0, 0, 0)
+        pairs = self.target.all_pairs_deduplicated(set(self.ships))
+        assert {frozenset((self.ships[0], self.ships[1]))} == {frozenset(pair) for pair in pairs}
+
+    def test_negative_negative_cells_are_distinct_from_positive(self):
+        assert pack_cell(-1, -1) != pack_cell(1, 1)
+        assert pack_cell(-1, 0) != pack_cell(0, -1)
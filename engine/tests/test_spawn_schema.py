@@ -0,0 +1,102 @@
+import pickle
+
+import pytest
+from twisted.test.proto_helpers import StringTransport
+
+from engine.engine import Engine
+from engine.models.factories import ProjectileModelFactory
+from engine.network.event_protocol import EventProtocol
+from engine.network.server.event_protocol import BroadcastProtocol
+from engine.network.server.update_protocol import UpdateServerProtocol
+from engine.physics.force import MutableOffsets, MutableDegrees
+from engine.tests.fake_network import UnscheduledEngine
+
+
+class TestSpawnSchema(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.protocol = EventProtocol(self.engine)
+        self.target = self.protocol.spawn_schema
+
+    def round_trip(self, model):
+        frame = {"command": "spawn", "model": self.target.describe(model)}
+        return self.target.build(self.protocol.deserialize(self.protocol.serialize(frame))['model'])
+
+    def test_asteroid_keeps_its_shape(self):
+        asteroid = self.engine.amf.manufacture((10, 0, 20))
+        asteroid.set_movement(1, 0, 2)
+        rebuilt = self.round_trip(asteroid)
+        assert asteroid.uuid == rebuilt.uuid
+        assert asteroid.radii == rebuilt.radii
+        assert list(asteroid.position) == list(rebuilt.position)
+        assert list(asteroid.movement) == list(rebuilt.movement)
+        assert asteroid.bounding_box.left == pytest.approx(rebuilt.bounding_box.left)
+
+    def test_ship_keeps_its_parts_and_controls(self):
+        ship = self.engine.smf.manufacture("ship", position=(5, 0, 5))
+        rebuilt = self.round_trip(ship)
+        assert ship.uuid == rebuilt.uuid
+
+        def placements(model):
+            return sorted((p.name, tuple(p.position), p.keyboard) for p in model.parts)
+        assert placements(ship) == placements(rebuilt)
+        assert list(ship.position) == list(rebuilt.position)
+
+    def test_plasma(self):
+        plasma = ProjectileModelFactory().manufacture("plasma", MutableOffsets(1, 0, 1), MutableDegrees(0, 0, 0),
+                                                      MutableOffsets(0, 0, -125), MutableDegrees(0, 0, 0),
+                                                      MutableOffsets(0, 0, 0), MutableDegrees(0, 0, 0))
+        rebuilt = self.round_trip(plasma)
+        assert plasma.uuid == rebuilt.uuid
+        assert list(plasma.movement) == list(rebuilt.movement)
+
+    def test_loose_part(self):
+        part = self.target.part_factory.manufacture("fuel tank")
+        rebuilt = self.round_trip(part)
+        assert ("fuel tank", part.uuid) == (rebuilt.name, rebuilt.uuid)
+
+    def test_description_is_far_smaller_than_a_pickle(self):
+        asteroid = self.engine.amf.manufacture((0, 0, 0))
+        description = self.protocol.serialize({"command": "spawn", "model": self.target.describe(asteroid)})
+        assert len(description) * 10 < len(pickle.dumps({"command": "spawn", "model": asteroid}, protocol=-1))
+
+    def test_unknown_kind_is_rejected(self):
+        with pytest.raises(ValueError):
+            self.target.build({"kind": "os.system"})
+
+
+class TestEventSerialization(object):
+
+    def test_pickles_are_not_loaded(self):
+        with pytest.raises(ValueError):
+            EventProtocol.deserialize(pickle.dumps({"command": "ping", "ts": 0}))
+
+    def test_uuids_survive(self):
+        asteroid = Engine(None).amf.manufacture((0, 0, 0))
+        frame = {"command": "decay", "model_uuid": asteroid.uuid}
+        assert frame == EventProtocol.deserialize(EventProtocol.serialize(frame))
+
+
+class TestRegisterOwnShip(object):
+
+    def setup(self):
+        self.engine = UnscheduledEngine(None)
+        self.update_protocol = UpdateServerProtocol(self.engine)
+        self.target = BroadcastProtocol(self.engine, lambda *args: None, update_protocol=self.update_protocol,
+                                        update_address=("10.0.0.1", 8002))
+        self.target.makeConnection(StringTransport())
+        self.target.username = "pilot"
+        self.ship = self.engine.smf.manufacture("ship", position=(3, 0, 4))
+
+    def test_ship_is_built_from_its_description(self):
+        self.target.register_own_ship({"command": "register_own_ship",
+                                       "model": self.target.spawn_schema.describe(self.ship)})
+        assert self.ship.uuid == self.target.own_model.uuid
+        assert self.engine.models[self.ship.uuid] is self.target.own_model
+        assert b'"command":"enter"' in self.target.transport.value()
+
+    def test_joining_binds_the_ship_to_remote_input(self):
+        self.target.register_own_ship({"command": "register_own_ship",
+                                       "model": self.target.spawn_schema.describe(self.ship)})
+        assert ("10.0.0.1", 8002) in self.update_protocol.inputs
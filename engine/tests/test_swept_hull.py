@@ -0,0 +1,79 @@
+from random import Random
+
+import pytest
+
+from engine.physics.polygon import Polygon, MultiPolygon
+from engine.physics.swept_hull import LocalHull, SweptHull
+
+square = [(-1, -1), (-1, 1), (1, 1), (1, -1)]
+
+
+class TestSweptHullTranslation(object):
+
+    def setup(self):
+        self.target = SweptHull(LocalHull(square))
+        self.target.move(10, 0, 0)
+
+    def test_bounds_cover_start_and_end(self):
+        assert (-1, 11, -1, 1) == self.target.bounds
+
+    def test_swept_hull_is_a_rectangle(self):
+        assert {(-1, -1), (-1, 1), (11, 1), (11, -1)} == {tuple(p) for p in self.target.vertices.tolist()}
+
+    def test_clear_movement_leaves_current_shape(self):
+        self.target.clear_movement()
+        assert (9, 11, -1, 1) == self.target.bounds
+
+
+class TestSweptHullMatchesHullOfBothCopies(object):
+
+    def setup(self):
+        self.rnd = Random(3)
+
+    @staticmethod
+    def area(points):
+        return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1])) / 2
+
+    def test_random_moves(self):
+        local_hull = LocalHull(Polygon.convex_hull([(self.rnd.uniform(-3, 3), self.rnd.uniform(-3, 3))
+                                                    for _ in range(12)]))
+        for _ in range(50):
+            target = SweptHull(local_hull, self.rnd.uniform(-5, 5), self.rnd.uniform(-5, 5),
+                               self.rnd.uniform(-180, 180))
+            target.move(self.rnd.uniform(-5, 5), self.rnd.uniform(-5, 5), self.rnd.uniform(-180, 180))
+            swept = [tuple(p) for p in target.vertices.tolist()]
+            reference = Polygon.convex_hull([tuple(p) for p in target.points.tolist()])
+            assert self.area(swept) < 0
+            assert self.area(reference) == pytest.approx(self.area(swept))
+
+    def test_counter_clockwise_triangle(self):
+        target = SweptHull(LocalHull([(-1, -0.013), (0.735, -0.512), (-0.35, 0.741)]))
+        target.move(-1.85, 0.41, 0)
+        reference = Polygon.convex_hull([tuple(p) for p in target.points.tolist()])
+        assert self.area(reference) == pytest.approx(self.area([tuple(p) for p in target.vertices.tolist()]))
+
+    def test_random_triangles(self):
+        for _ in range(200):
+            triangle = Polygon.convex_hull([(self.rnd.uniform(-1, 1), self.rnd.uniform(-1, 1)) for _ in range(3)])
+            target = SweptHull(LocalHull(triangle), 0, 0, self.rnd.uniform(-180, 180))
+            target.move(self.rnd.uniform(-2, 2), self.rnd.uniform(-2, 2), self.rnd.uniform(-180, 180))
+            swept = [tuple(p) for p in target.vertices.tolist()]
+            reference = Polygon.convex_hull([tuple(p) for p in target.points.tolist()])
+            assert self.area(swept) < 0
+            assert self.area(reference) == pytest.approx(self.area(swept))
+
+
+class TestContinuousCollision(object):
+
+    def setup(self):
+        self.wall = MultiPolygon.manufacture([(-.1, -5), (-.1, 5), (.1, 5), (.1, -5)])
+        self.bolt = MultiPolygon.manufacture([(-.1, -.1), (.1, -.1), (.1, .1), (-.1, .1)], x=-2)
+
+    def test_bolt_stepping_over_wall_hits_it(self):
+        self.bolt.set_position_rotation(2, 0, 0)
+        assert self.bolt.intersects(self.wall)
+
+    def test_bolt_after_wall_misses_it(self):
+        self.bolt.set_position_rotation(2, 0, 0)
+        self.bolt.clear_movement()
+        assert not self.bolt.intersects(self.wall)
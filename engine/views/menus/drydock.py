@@ -483,6 +483,7 @@ class Drydock(ShipConfiguration):
         super().__init__(left, right, bottom, top, ship, view_factory)
         for item in self.items:
             item.legal_move_func = self._legal_placement
+            item.observe(self.ship.rebuild_if_needed)
 
     def debug(self):
         print("Debug mode")
@@ -526,6 +527,7 @@ class Drydock(ShipConfiguration):
 
     def add_item(self, item: DockableItem):
         item.legal_move_func = self._legal_placement
+        item.observe(self.ship.rebuild_if_needed)
         item._view.set_mesh_scale(1.0)
         self.items.add(item)
         self.ship.add_part(item.model)
@@ -0,0 +1,55 @@
+import time
+from random import Random
+from timeit import timeit
+
+from engine.engine import Engine
+from engine.headless import HeadlessRunner
+from engine.physics.force import MutableOffsets
+
+
+def dispatch(n_observers=3, repeats=200000):
+    vector = MutableOffsets(0, 0, 0)
+    hits = []
+    for _ in range(n_observers):
+        vector.observe(lambda: hits.append(None), "move")
+    return timeit(lambda: vector._callback("move"), number=repeats) / repeats
+
+
+def observe_unobserve(repeats=50000):
+    vector = MutableOffsets(0, 0, 0)
+    callback = vector.update
+
+    def statement():
+        vector.observe(callback, "move")
+        vector.unobserve(callback, "move")
+    return timeit(statement, number=repeats) / repeats
+
+
+def world(n_asteroids=300, area=1500, batched_actions=("move",), seed=1):
+    rnd = Random(seed)
+    engine = Engine(None)
+    engine.batched_actions = batched_actions
+    for _ in range(n_asteroids):
+        model = engine.amf.manufacture((rnd.uniform(-area, area), 0, rnd.uniform(-area, area)))
+        model.set_movement(rnd.uniform(-20, 20), 0, rnd.uniform(-20, 20))
+        model.set_spin(0, rnd.uniform(-30, 30), 0)
+        engine.spawn(model)
+    return engine
+
+
+def tick(batched_actions, ticks=120):
+    runner = HeadlessRunner(world(batched_actions=batched_actions))
+    start = time.process_time()
+    runner.run(ticks)
+    return (time.process_time() - start) / ticks
+
+
+def report(name, seconds):
+    print("{:<28} {:>10.3f} us".format(name, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    report("dispatch to 3 observers", dispatch())
+    report("observe + unobserve", observe_unobserve())
+    report("tick, immediate moves", tick(()))
+    report("tick, batched moves", tick(("move",)))
@@ -0,0 +1,114 @@
+import socket
+import time
+from math import ceil
+from random import Random
+
+from engine.engine import Engine
+from engine.network.delta_codec import DeltaSnapshotCodec, DeltaSession
+from engine.network.snapshot_codec import ModelIndexTable, BinarySnapshotCodec
+
+ip_fragment_payload = 1480
+
+
+class LossyLoopback(object):
+
+    def __init__(self, loss, seed=1):
+        self.loss = loss
+        self.rnd = Random(seed)
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+        self.receiver.bind(("127.0.0.1", 0))
+        self.receiver.setblocking(False)
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.address = self.receiver.getsockname()
+        self.sent = 0
+        self.dropped = 0
+
+    def send(self, datagram: bytes):
+        self.sent += 1
+        fragments = ceil(len(datagram) / ip_fragment_payload)
+        if any(self.rnd.random() < self.loss for _ in range(fragments)):
+            self.dropped += 1
+            return
+        self.sender.sendto(datagram, self.address)
+
+    def receive(self):
+        datagrams = []
+        while True:
+            try:
+                datagrams.append(self.receiver.recv(1 << 16))
+            except BlockingIOError:
+                return datagrams
+
+    def close(self):
+        self.sender.close()
+        self.receiver.close()
+
+
+def record_updates(n_asteroids=300, area=3000, updates=200, dt=1 / 20, seed=1):
+    rnd = Random(seed)
+    engine = Engine(None)
+    engine.spawn_asteroids(n_asteroids, area=area)
+    models = list(engine.models.values())
+    for model in models:
+        model.set_movement(rnd.uniform(-20, 20), 0, rnd.uniform(-20, 20))
+    history = []
+    for _ in range(updates):
+        for model in models:
+            model.run(dt)
+        history.append([model.data_dict for model in models])
+    return history
+
+
+def run(mode, loss, history):
+    link = LossyLoopback(loss)
+    indices = ModelIndexTable()
+    for frame in history[0]:
+        indices.assign(frame['uuid'])
+    if mode == "delta":
+        sender = DeltaSession(DeltaSnapshotCodec(indices))
+        receiver = DeltaSnapshotCodec(indices)
+    else:
+        sender = BinarySnapshotCodec(indices)
+        receiver = BinarySnapshotCodec(indices)
+    delivered = 0
+    complete = 0
+    start = time.perf_counter()
+    for sequence, frames in enumerate(history, start=1):
+        if mode == "whole":
+            packets = [sender.encode(frames, sequence)]
+        elif mode == "delta":
+            packets = sender.encode_packets(sequence, sender.codec.records(frames))
+        else:
+            packets = sender.encode_packets(frames, sequence)
+        for packet in packets:
+            link.send(packet)
+        received = 0
+        for datagram in link.receive():
+            received += len(receiver.decode(datagram))
+        if mode == "delta":
+            ack = receiver.take_ack()
+            if ack is not None and link.rnd.random() >= loss:
+                sender.acknowledge(DeltaSnapshotCodec.read_ack(ack))
+        delivered += received
+        complete += received == len(frames)
+    elapsed = time.perf_counter() - start
+    link.close()
+    return {"updates": len(history), "models": len(history[0]), "delivered": delivered, "complete": complete,
+            "packets": link.sent, "dropped": link.dropped, "seconds": elapsed}
+
+
+def report(mode, loss, result):
+    share = result['delivered'] / (result['updates'] * result['models'])
+    print("{:<8} loss {:>4.0%}  model updates delivered {:>6.1%}  complete snapshots {:>3}/{}  "
+          "packets {:>5} dropped {:>4}  {:>8.0f} model updates/s".format(
+              mode, loss, share, result['complete'], result['updates'], result['packets'], result['dropped'],
+              result['delivered'] / result['seconds']))
+
+
+if __name__ == '__main__':
+    history = record_updates()
+    for loss in (0.0, 0.01, 0.05, 0.1):
+        for mode in ("whole", "packets", "delta"):
+            report(mode, loss, run(mode, loss, history))
+        print()
@@ -0,0 +1,59 @@
+import time
+from random import Random
+
+from engine.engine import Engine
+from engine.physics.pair_cache import CollisionPairCache
+
+
+class NoPairCache(CollisionPairCache):
+
+    def is_separated(self, m1, m2):
+        self.misses += 1
+        return False
+
+    def record_separation(self, m1, m2):
+        pass
+
+
+class CollisionTimedEngine(Engine):
+
+    def __init__(self, event_loop, **kwargs):
+        super().__init__(event_loop, **kwargs)
+        self.collision_seconds = 0
+
+    def register_collisions(self):
+        start = time.perf_counter()
+        super().register_collisions()
+        self.collision_seconds += time.perf_counter() - start
+
+
+def setup(pair_cache, n_asteroids=500, area=900, seed=1):
+    rnd = Random(seed)
+    engine = CollisionTimedEngine(None, pair_cache=pair_cache)
+    while len(engine.models) < n_asteroids:
+        model = engine.amf.manufacture((rnd.uniform(-area, area), 0, rnd.uniform(-area, area)))
+        if any(model.bounding_box.bounding_box_intersects(other.bounding_box) for other in engine.models.values()):
+            continue
+        engine.spawn(model)
+        model.set_movement(rnd.uniform(-20, 20), 0, rnd.uniform(-20, 20))
+        model.set_spin(0, rnd.uniform(-30, 30), 0)
+    return engine
+
+
+def run(engine, ticks=120, dt=1 / 60):
+    for _ in range(ticks):
+        engine.update(dt)
+
+
+def report(name, engine):
+    cache = engine.pair_cache
+    print(name)
+    print("  register_collisions seconds:", engine.collision_seconds)
+    print("  hits:", cache.hits, "misses:", cache.misses)
+
+
+if __name__ == '__main__':
+    for name, pair_cache_class in (("Without pair cache", NoPairCache), ("With pair cache", CollisionPairCache)):
+        engine = setup(pair_cache_class())
+        run(engine)
+        report(name, engine)
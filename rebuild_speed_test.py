@@ -0,0 +1,35 @@
+from timeit import timeit
+
+from engine.models.factories import ShipModelFactory, ShipPartModelFactory
+
+
+def drag(moves=10, repeats=200):
+    ship = ShipModelFactory().manufacture("ship")
+    part = max(ship.parts, key=lambda part: part.position.distance)
+    x, _, z = part.position
+
+    def statement():
+        for i in range(moves):
+            part.set_position(x + 40 + i, 0, z)
+        ship.run(1 / 60)
+        part.set_position(x, 0, z)
+    return timeit(statement, number=repeats) / repeats
+
+
+def add_remove(repeats=500):
+    ship = ShipModelFactory().manufacture("ship")
+    part = ShipPartModelFactory().manufacture("generator", position=(0, 0, 40))
+
+    def statement():
+        ship.add_part(part)
+        ship.remove_part(part)
+    return timeit(statement, number=repeats) / repeats
+
+
+def report(name, seconds):
+    print("{:<28} {:>10.3f} us".format(name, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    report("10 part moves + tick", drag())
+    report("add_part + remove_part", add_remove())
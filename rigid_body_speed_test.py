@@ -0,0 +1,37 @@
+import time
+from random import Random
+
+from engine.engine import Engine
+from engine.headless import HeadlessRunner
+from engine.physics.rigid_bodies import RigidBodyStore
+
+
+def world(rigid_bodies=None, n_asteroids=300, n_still=0, area=1500, seed=1):
+    rnd = Random(seed)
+    engine = Engine(None, rigid_bodies=rigid_bodies)
+    for i in range(n_asteroids + n_still):
+        model = engine.amf.manufacture((rnd.uniform(-area, area), 0, rnd.uniform(-area, area)))
+        if i < n_asteroids:
+            model.set_movement(rnd.uniform(-20, 20), 0, rnd.uniform(-20, 20))
+            model.set_spin(0, rnd.uniform(-30, 30), 0)
+        engine.spawn(model)
+    return engine
+
+
+def models_phase(rigid_bodies, ticks=120, **kwargs):
+    runner = HeadlessRunner(world(rigid_bodies, **kwargs))
+    start = time.process_time()
+    runner.run(ticks)
+    return (time.process_time() - start) / ticks, runner.recorder.summary()['models']['mean']
+
+
+def report(name, seconds):
+    tick, models = seconds
+    print("{:<36} tick {:>8.2f} ms   models phase {:>8.2f} ms".format(name, tick * 1000, models * 1000))
+
+
+if __name__ == '__main__':
+    report("300 spinning, per-model run", models_phase(None))
+    report("300 spinning, rigid body store", models_phase(RigidBodyStore()))
+    report("2000 at rest, per-model run", models_phase(None, n_asteroids=0, n_still=2000))
+    report("2000 at rest, rigid body store", models_phase(RigidBodyStore(), n_asteroids=0, n_still=2000))
@@ -1,12 +1,19 @@
 #!/usr/bin/env python
 
+import argparse
+
+from pyglet.app import EventLoop
+
 from engine.client import ClientEngine
 from engine.input_handlers import GamePad
-from engine.network.client.client import NetworkClient
+from engine.network.client.client import NetworkClient, AsyncioNetworkClient
 from engine.pigtwisted import TwistedEventLoop
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the game client.")
+    parser.add_argument("--transport", choices=("twisted", "asyncio"), default="twisted")
+    args = parser.parse_args()
     try:
         gamepad = GamePad(0)
         print("Gamepad found!")
@@ -15,6 +22,10 @@ def main():
         print("No gamepad found!")
     #window = Window(input_handler=gamepad)
     #gamepad = gamepad or Keyboard(window)
+    if args.transport == "asyncio":
+        engine = ClientEngine(event_loop=EventLoop(), input_handler=gamepad)
+        AsyncioNetworkClient(engine)
+        return
     event_loop = TwistedEventLoop()
     engine = ClientEngine(event_loop=event_loop, input_handler=gamepad)#, window=window)
     NetworkClient(engine)
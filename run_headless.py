@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+
+import argparse
+from random import Random
+
+from engine import ServerEngine
+from engine.headless import HeadlessRunner
+
+
+def stir(engine, speed, seed):
+    rnd = Random(seed)
+    for model in engine.models.values():
+        model.set_movement(rnd.uniform(-speed, speed), 0, rnd.uniform(-speed, speed))
+        model.set_spin(0, rnd.uniform(-speed, speed), 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the server simulation without a window or network.")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--paced", action="store_true", help="sleep to hold the tick rate instead of free running")
+    parser.add_argument("--asteroids", type=int, default=0, help="extra asteroids on top of the server's own")
+    parser.add_argument("--area", type=int, default=2000)
+    parser.add_argument("--speed", type=float, default=0, help="random drift given to every asteroid")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = ServerEngine(None)
+    if args.asteroids:
+        engine.spawn_asteroids(args.asteroids, area=args.area)
+    if args.speed:
+        stir(engine, args.speed, args.seed)
+    runner = HeadlessRunner(engine, dt=args.dt)
+    runner.run(args.ticks, paced=args.paced)
+    print("{} ticks, {} models, {} overruns".format(runner.ticks, len(engine.models), runner.overruns))
+    print(runner.recorder.report())
+
+
+if __name__ == "__main__":
+    main()
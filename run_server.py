@@ -1,17 +1,54 @@
 #!/usr/bin/env python
 
+import argparse
+
 from twisted.internet import reactor
 
 from engine import ServerEngine
+from engine.network.asyncio_transport import AsyncioNetwork, AsyncioServerEngine
 from engine.network.server.factories import BroadcastServerFactory
+from engine.network.server.shards import ShardGrid, ShardCoordinator, ShardedServerEngine, \
+    AsyncioShardedServerEngine, ShardedUpdateServerProtocol
 from engine.network.server.update_protocol import UpdateServerProtocol
 
 
 def main():
-    engine = ServerEngine(reactor)
+    parser = argparse.ArgumentParser(description="Run the game server.")
+    parser.add_argument("--columns", type=int, default=1, help="shard the world into this many columns")
+    parser.add_argument("--rows", type=int, default=1, help="shard the world into this many rows")
+    parser.add_argument("--region-size", type=float, default=2000.)
+    parser.add_argument("--transport", choices=("twisted", "asyncio"), default="twisted")
+    args = parser.parse_args()
+
+    use_asyncio = args.transport == "asyncio"
+    network = AsyncioNetwork() if use_asyncio else None
+    event_loop = network.loop if use_asyncio else reactor
+    coordinator = None
+    if args.columns * args.rows > 1:
+        coordinator = ShardCoordinator(ShardGrid(args.columns, args.rows, region_size=args.region_size))
+        coordinator.start()
+        engine_class = AsyncioShardedServerEngine if use_asyncio else ShardedServerEngine
+        engine = engine_class(event_loop, coordinator)
+        update_protocol = ShardedUpdateServerProtocol(engine)
+    else:
+        engine = (AsyncioServerEngine if use_asyncio else ServerEngine)(event_loop)
+        update_protocol = UpdateServerProtocol(engine)
     engine.schedule(engine.update)
-    update_protocol = UpdateServerProtocol(engine)
     factory = BroadcastServerFactory(engine, update_protocol)
+
+    if use_asyncio:
+        network.listen_tcp(8000, factory)
+        network.listen_udp(8001, update_protocol)
+        try:
+            network.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if coordinator:
+                coordinator.stop()
+        return
+    if coordinator:
+        reactor.addSystemEventTrigger("before", "shutdown", coordinator.stop)
     reactor.listenTCP(8000, factory)
     reactor.listenUDP(8001, update_protocol)
     reactor.run() #  call_interval=1/60)
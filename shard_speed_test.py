@@ -0,0 +1,76 @@
+import time
+from random import Random
+
+from engine.engine import Engine
+from engine.headless import HeadlessRunner
+from engine.network.server.shards import ShardGrid, ShardCoordinator
+from engine.network.spawn_schema import SpawnSchema
+
+
+def asteroid_field(n_asteroids, area, seed=1):
+    rnd = Random(seed)
+    engine = Engine(None)
+    side = int(n_asteroids ** 0.5) + 1
+    spacing = 2 * area / side
+    models = []
+    for i in range(n_asteroids):
+        x = -area + (i % side + 0.5) * spacing + rnd.uniform(-spacing / 4, spacing / 4)
+        z = -area + (i // side + 0.5) * spacing + rnd.uniform(-spacing / 4, spacing / 4)
+        model = engine.amf.manufacture((x, 0, z))
+        model.set_movement(rnd.uniform(-20, 20), 0, rnd.uniform(-20, 20))
+        model.set_spin(0, rnd.uniform(-30, 30), 0)
+        models.append(model)
+    return models
+
+
+def run_single(models, ticks=120):
+    engine = Engine(None)
+    for model in models:
+        engine.spawn(model)
+    runner = HeadlessRunner(engine)
+    start = time.process_time()
+    runner.run(ticks)
+    return [(time.process_time() - start) / ticks]
+
+
+def collect_stats(coordinator):
+    coordinator.stats = {}
+    coordinator.request_stats()
+    while len(coordinator.stats) < len(coordinator.connections):
+        coordinator.poll()
+        time.sleep(0.01)
+    return dict(coordinator.stats)
+
+
+def run_sharded(models, columns, rows, area, seconds=10.):
+    schema = SpawnSchema()
+    coordinator = ShardCoordinator(ShardGrid(columns, rows, region_size=2 * area / max(columns, rows)))
+    coordinator.start()
+    for model in models:
+        coordinator.adopt(schema.describe(model))
+    seen = set()
+    while len(seen) < len(models):
+        for event in coordinator.poll():
+            if event[0] == "state":
+                seen.update(frame['uuid'] for frame in event[1])
+        time.sleep(0.01)
+    before = collect_stats(coordinator)
+    time.sleep(seconds)
+    after = collect_stats(coordinator)
+    coordinator.stop(timeout=30.)
+    return [(after[region]['cpu_seconds'] - before[region]['cpu_seconds']) /
+            max(1, after[region]['ticks'] - before[region]['ticks']) for region in sorted(after)]
+
+
+def report(name, cpu_per_tick):
+    print("{:<16} shards {:>2}  cpu per tick {}  -> {:>6.0f} Hz with a core per shard".format(
+        name, len(cpu_per_tick), " ".join("{:>7.2f} ms".format(seconds * 1000) for seconds in cpu_per_tick),
+        1 / max(cpu_per_tick)))
+
+
+if __name__ == '__main__':
+    area = 1000
+    models = asteroid_field(400, area)
+    report("single process", run_single(models))
+    for columns, rows in ((2, 1), (2, 2)):
+        report("sharded", run_sharded(models, columns, rows, area))
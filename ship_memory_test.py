@@ -0,0 +1,44 @@
+import gc
+import tracemalloc
+
+from engine.models.factories import ShipModelFactory
+from engine.physics.force import Offsets, MutableOffsets, MutableDegrees, Force
+from engine.physics.line import Line
+
+
+def bytes_per_instance(factory, n=10000):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (after - before - 8 * n) / n
+
+
+def bytes_per_ship(n=20):
+    factory = ShipModelFactory()
+    factory.manufacture("ship")
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    ships = [factory.manufacture("ship") for _ in range(n)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del ships
+    return (after - before) / n
+
+
+def report(name, n_bytes):
+    print("{:<20} {:>10.0f} bytes".format(name, n_bytes))
+
+
+if __name__ == '__main__':
+    report("Offsets", bytes_per_instance(lambda: Offsets(1., 0., 1.)))
+    report("MutableOffsets", bytes_per_instance(lambda: MutableOffsets(1., 0., 1.)))
+    report("MutableDegrees", bytes_per_instance(lambda: MutableDegrees(0., 1., 0.)))
+    report("Force", bytes_per_instance(lambda: Force(Offsets(1., 0., 1.), Offsets(0., 0., 1.))))
+    report("Line", bytes_per_instance(lambda: Line([(0., 0.), (1., 1.)])))
+    report("ShipModel", bytes_per_ship())
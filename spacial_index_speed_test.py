@@ -0,0 +1,73 @@
+import time
+from math import sqrt
+from random import Random
+
+from engine.physics.aabb_tree import AABBTree
+from engine.physics.broad_phase import SweepAndPrune
+from engine.physics.polygon import MultiPolygon
+from engine.physics.spacial_index import SpacialIndex, HashedSpacialIndex
+
+
+class BoxModel(object):
+
+    def __init__(self, x, y, size, vx, vy):
+        self.bounding_box = MultiPolygon.manufacture([(0, 0), (0, size), (size, size), (size, 0)], x=x, y=y)
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+
+
+def setup(n_models, large_share=0.0, seed=1):
+    rnd = Random(seed)
+    side = sqrt(n_models) * 150
+    models = []
+    for _ in range(n_models):
+        size = rnd.uniform(500, 2000) if rnd.random() < large_share else rnd.uniform(5, 50)
+        models.append(BoxModel(rnd.uniform(0, side), rnd.uniform(0, side), size, rnd.uniform(-5, 5),
+                               rnd.uniform(-5, 5)))
+    return models
+
+
+def move_some(models, rnd, share=0.1):
+    moved = rnd.sample(models, int(len(models) * share))
+    for model in moved:
+        model.x += model.vx
+        model.y += model.vy
+        model.bounding_box.set_position_rotation(model.x, model.y, 0)
+    return moved
+
+
+def benchmark(index_class, models, ticks=5, seed=2):
+    rnd = Random(seed)
+    index = index_class()
+    start = time.perf_counter()
+    for model in models:
+        index.init_model_into_2d_space_index(model)
+    build_time = time.perf_counter() - start
+    tick_times = []
+    n_pairs = 0
+    for _ in range(ticks):
+        moved = move_some(models, rnd)
+        start = time.perf_counter()
+        for model in moved:
+            index.reindex_spacial_position(model)
+        n_pairs += len(index.all_pairs_deduplicated(moved))
+        tick_times.append(time.perf_counter() - start)
+    return build_time, tick_times, n_pairs
+
+
+def report(name, build_time, tick_times, n_pairs):
+    print(f"  {name}")
+    print("    build:", build_time)
+    print("    tick AVG:", sum(tick_times) / len(tick_times))
+    print("    pairs:", n_pairs)
+
+
+if __name__ == '__main__':
+    for large_share in (0.0, 0.01):
+        for n_models in (1000, 10000, 50000):
+            print(f"{n_models} models, {large_share:.0%} of them 500-2000 units wide, 10% moving per tick")
+            for index_class in (SpacialIndex, HashedSpacialIndex, AABBTree, SweepAndPrune):
+                models = setup(n_models, large_share)
+                report(index_class.__name__, *benchmark(index_class, models))